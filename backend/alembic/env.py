@@ -9,7 +9,7 @@ from alembic import context
 from app.core.config import settings
 from app.models.base import Base
 # Import all models to ensure they are registered with Base.metadata
-from app.models import User, Calendar, List, ListItem, Vote, Event, calendar_user_association
+from app.models import User, Calendar, List, ListItem, Vote, Event, EventArchive, calendar_user_association
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
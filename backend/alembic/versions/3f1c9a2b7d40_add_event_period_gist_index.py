@@ -0,0 +1,41 @@
+"""Add GiST index on event period for interval overlap queries
+
+Revision ID: 3f1c9a2b7d40
+Revises: 8763bf7f0ac6
+Create Date: 2026-10-19 09:12:41.207318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a2b7d40'
+down_revision: Union[str, Sequence[str], None] = '8763bf7f0ac6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        # Other databases fall back to idx_event_calendar_time (see CRUDEvent.overlaps)
+        return
+    # btree_gist lets the scalar calendar_id column live in the same GiST index
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    op.create_index(
+        'idx_event_calendar_period',
+        'events',
+        ['calendar_id', sa.text("tstzrange(start_time, greatest(start_time, end_time), '[]')")],
+        unique=False,
+        postgresql_using='gist',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('idx_event_calendar_period', table_name='events', postgresql_using='gist')
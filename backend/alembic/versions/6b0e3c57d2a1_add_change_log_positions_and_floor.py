@@ -0,0 +1,43 @@
+"""Add change log positions and the sync floor
+
+Revision ID: 6b0e3c57d2a1
+Revises: a4d9e6b2c813
+Create Date: 2026-10-20 10:12:37.804211
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6b0e3c57d2a1'
+down_revision: Union[str, Sequence[str], None] = 'a4d9e6b2c813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('changes', sa.Column('txid', sa.BigInteger(), nullable=True))
+    if op.get_bind().dialect.name == 'postgresql':
+        # Entries logged before this revision sort before every new one
+        op.execute(sa.text("UPDATE changes SET txid = 0"))
+    op.create_index('ix_changes_txid', 'changes', ['txid'])
+    op.create_index('ix_changes_created_at', 'changes', ['created_at'])
+    op.create_table(
+        'change_floor',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('position', sa.BigInteger(), nullable=False),
+        sa.Column('pruned_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('change_floor')
+    op.drop_index('ix_changes_created_at', table_name='changes')
+    op.drop_index('ix_changes_txid', table_name='changes')
+    op.drop_column('changes', 'txid')
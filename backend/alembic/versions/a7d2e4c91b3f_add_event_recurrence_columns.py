@@ -0,0 +1,41 @@
+"""Add recurrence rule, exceptions and series end to events
+
+Revision ID: a7d2e4c91b3f
+Revises: 3f1c9a2b7d40
+Create Date: 2026-10-19 11:40:03.518266
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d2e4c91b3f'
+down_revision: Union[str, Sequence[str], None] = '3f1c9a2b7d40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('events', sa.Column('recurrence_rule', sa.String(), nullable=True))
+    op.add_column('events', sa.Column('recurrence_exceptions', sa.JSON(), nullable=True))
+    op.add_column('events', sa.Column('recurrence_end', sa.DateTime(timezone=True), nullable=True))
+    op.create_index(
+        'idx_event_calendar_recurring',
+        'events',
+        ['calendar_id'],
+        unique=False,
+        postgresql_where=sa.text('recurrence_rule IS NOT NULL'),
+        sqlite_where=sa.text('recurrence_rule IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_event_calendar_recurring', table_name='events')
+    op.drop_column('events', 'recurrence_end')
+    op.drop_column('events', 'recurrence_exceptions')
+    op.drop_column('events', 'recurrence_rule')
@@ -0,0 +1,42 @@
+"""Add no_double_booking flag and exclusion constraint
+
+Revision ID: c5e81f3a2d96
+Revises: a7d2e4c91b3f
+Create Date: 2026-10-19 14:05:27.834102
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e81f3a2d96'
+down_revision: Union[str, Sequence[str], None] = 'a7d2e4c91b3f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('calendars', sa.Column('no_double_booking', sa.Boolean(), server_default=sa.false(), nullable=False))
+    op.add_column('events', sa.Column('no_double_booking', sa.Boolean(), server_default=sa.false(), nullable=False))
+    if op.get_bind().dialect.name != 'postgresql':
+        # Only PostgreSQL can enforce this; elsewhere use detect_conflicts
+        return
+    # Relies on the btree_gist extension created in 3f1c9a2b7d40
+    op.execute(
+        "ALTER TABLE events ADD CONSTRAINT excl_event_no_double_booking "
+        "EXCLUDE USING gist (calendar_id WITH =, "
+        "tstzrange(start_time, greatest(start_time, end_time), '[)') WITH &&) "
+        "WHERE (no_double_booking AND recurrence_rule IS NULL)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_constraint('excl_event_no_double_booking', 'events', type_='exclude')
+    op.drop_column('events', 'no_double_booking')
+    op.drop_column('calendars', 'no_double_booking')
@@ -0,0 +1,32 @@
+"""Add version and updated_at to votes
+
+Revision ID: d84a1c6e2f39
+Revises: 6b0e3c57d2a1
+Create Date: 2026-10-20 15:42:09.613027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd84a1c6e2f39'
+down_revision: Union[str, Sequence[str], None] = '6b0e3c57d2a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('votes', sa.Column('version', sa.Integer(), server_default=sa.text('1'), nullable=False))
+    # No server default, as in f3b7d2a9c4e1: existing rows are stamped once here
+    op.add_column('votes', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+    op.execute(sa.text("UPDATE votes SET updated_at = CURRENT_TIMESTAMP"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('votes', 'updated_at')
+    op.drop_column('votes', 'version')
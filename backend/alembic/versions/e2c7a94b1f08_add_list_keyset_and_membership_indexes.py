@@ -0,0 +1,33 @@
+"""Add list keyset and membership indexes
+
+Revision ID: e2c7a94b1f08
+Revises: b91e6d3f0a57
+Create Date: 2026-10-19 18:42:11.306517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2c7a94b1f08'
+down_revision: Union[str, Sequence[str], None] = 'b91e6d3f0a57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # (calendar_id, id) also serves every lookup the calendar_id index did
+    op.create_index('idx_list_calendar_id', 'lists', ['calendar_id', 'id'], unique=False)
+    op.drop_index(op.f('ix_lists_calendar_id'), table_name='lists')
+    op.create_index('idx_calendar_user_user_id', 'calendar_user_association', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_calendar_user_user_id', table_name='calendar_user_association')
+    op.create_index(op.f('ix_lists_calendar_id'), 'lists', ['calendar_id'], unique=False)
+    op.drop_index('idx_list_calendar_id', table_name='lists')
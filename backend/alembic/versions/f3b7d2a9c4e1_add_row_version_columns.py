@@ -0,0 +1,37 @@
+"""Add version and updated_at to calendars, lists, list items and events
+
+Revision ID: f3b7d2a9c4e1
+Revises: e2c7a94b1f08
+Create Date: 2026-10-19 21:17:46.208315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b7d2a9c4e1'
+down_revision: Union[str, Sequence[str], None] = 'e2c7a94b1f08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('calendars', 'lists', 'list_items', 'events', 'events_archive')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.add_column(table, sa.Column('version', sa.Integer(), server_default=sa.text('1'), nullable=False))
+        # No server default (SQLite cannot add a column with a non-constant one): the
+        # models set it on insert, existing rows are stamped once here
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+        op.execute(sa.text(f"UPDATE {table} SET updated_at = CURRENT_TIMESTAMP"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(TABLES):
+        op.drop_column(table, 'updated_at')
+        op.drop_column(table, 'version')
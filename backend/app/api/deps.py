@@ -1,15 +1,19 @@
 # backend/app/api/deps.py
 
-from typing import Generator, Optional
+from typing import Callable, FrozenSet, Generator, Optional, Type
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
+from pydantic import BaseModel
 
 from app import crud, models, schemas
 from app.core import security
+from app.core.access import access_cache
 from app.core.config import settings
 from app.core.database import SessionLocal
+from app.core.serialization import fields_schema, parse_fields
+from app.core.tracing import traced
 
 # This defines the URL that clients will use to get the token.
 # We've already created this endpoint in `login.py`.
@@ -27,6 +31,7 @@ def get_db() -> Generator:
     finally:
         db.close()
 
+@traced("deps.get_current_user")
 def get_current_user(
     db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
 ) -> models.User:
@@ -60,6 +65,7 @@ def get_current_user(
         raise credentials_exception
     return user
 
+@traced("deps.get_current_active_user")
 def get_current_active_user(
     current_user: models.User = Depends(get_current_user),
 ) -> models.User:
@@ -73,98 +79,80 @@ def get_current_active_user(
     return current_user
 
 
+def get_accessible_calendar_ids(db: Session, user: models.User) -> FrozenSet[int]:
+    """
+    Ids of the calendars the user owns or is a member of, served from the
+    access cache and loaded with a single query on a miss.
+    """
+    return access_cache.calendar_ids(
+        user.id, lambda: crud.calendar.get_accessible_ids(db, user_id=user.id)
+    )
+
+
+@traced("deps.check_calendar_access")
 def check_calendar_access(
     db: Session, calendar_id: int, user: models.User
-) -> models.Calendar:
+) -> None:
     """
-    Check if user has access to the calendar.
-    Returns the calendar if user has access, raises HTTPException otherwise.
-    Uses optimized JOIN query instead of N+1 queries.
+    Check if user has access to the calendar, raises HTTPException otherwise.
+    Access is a lookup in the cached set of accessible calendar ids; the
+    database is only asked whether the calendar exists when the check fails,
+    to choose between 404 and 403.
     """
-    from sqlalchemy import or_
-    from app.models.calendar import calendar_user_association
-    
-    # Single query to check calendar existence and user access
-    calendar = (
-        db.query(models.Calendar)
-        .outerjoin(
-            calendar_user_association, 
-            models.Calendar.id == calendar_user_association.c.calendar_id
-        )
-        .filter(
-            models.Calendar.id == calendar_id,
-            or_(
-                models.Calendar.owner_id == user.id,  # User is owner
-                calendar_user_association.c.user_id == user.id  # User is member
-            )
+    if calendar_id in get_accessible_calendar_ids(db, user):
+        return
+
+    calendar_exists = db.query(models.Calendar.id).filter(
+        models.Calendar.id == calendar_id
+    ).first()
+    if not calendar_exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Calendar not found"
         )
-        .first()
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="Not enough permissions to access this calendar"
     )
-    
-    if not calendar:
-        # Check if calendar exists at all to provide better error message
-        calendar_exists = db.query(models.Calendar).filter(
-            models.Calendar.id == calendar_id
-        ).first()
-        
-        if not calendar_exists:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Calendar not found"
-            )
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not enough permissions to access this calendar"
-            )
-    
-    return calendar
 
 
+@traced("deps.check_list_access")
 def check_list_access(
     db: Session, list_id: int, user: models.User
-) -> models.List:
+) -> None:
     """
-    Check if user has access to the list through calendar access.
-    Returns the list if user has access, raises HTTPException otherwise.
-    Uses optimized JOIN query to check both list and calendar access in one query.
+    Check if user has access to the list through calendar access, raises
+    HTTPException otherwise. Uses the cached list -> calendar map and the cached
+    set of accessible calendar ids, so a warm check runs no query.
     """
-    from sqlalchemy import or_
-    from app.models.calendar import calendar_user_association
-    
-    # Single query to check list existence and user access through calendar
-    list_obj = (
-        db.query(models.List)
-        .join(models.Calendar, models.List.calendar_id == models.Calendar.id)
-        .outerjoin(
-            calendar_user_association,
-            models.Calendar.id == calendar_user_association.c.calendar_id
+    calendar_id = access_cache.list_calendar_id(
+        list_id,
+        lambda: db.query(models.List.calendar_id).filter(models.List.id == list_id).scalar()
+    )
+    if calendar_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="List not found"
         )
-        .filter(
-            models.List.id == list_id,
-            or_(
-                models.Calendar.owner_id == user.id,  # User owns calendar
-                calendar_user_association.c.user_id == user.id  # User is member
-            )
+    if calendar_id not in get_accessible_calendar_ids(db, user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to access this list"
         )
-        .first()
-    )
-    
-    if not list_obj:
-        # Check if list exists at all to provide better error message
-        list_exists = db.query(models.List).filter(
-            models.List.id == list_id
-        ).first()
-        
-        if not list_exists:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="List not found"
-            )
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not enough permissions to access this list"
-            )
-    
-    return list_obj
\ No newline at end of file
+
+
+def sparse_fields(schema: Type[BaseModel]) -> Callable[..., Type[BaseModel]]:
+    """
+    Dependency factory for the `fields` query parameter of a read endpoint
+    returning `schema`. The dependency yields the trimmed schema to serialize
+    with (`schema` itself when `fields` is absent); select its
+    `schema_columns` so the query reads only those columns.
+    """
+    def dependency(
+        fields: Optional[str] = Query(
+            None,
+            description=f"Comma-separated {schema.__name__} fields to return, e.g. `id,{next(iter(schema.model_fields))}`",
+        ),
+    ) -> Type[BaseModel]:
+        return fields_schema(schema, parse_fields(schema, fields))
+    return dependency
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import lists, login, users, calendars, list_items, votes, events
+from app.api.v1.endpoints import lists, login, users, calendars, list_items, votes, events, sync
 
 api_router = APIRouter()
 
@@ -24,3 +24,6 @@ api_router.include_router(votes.router, prefix="/votes", tags=["votes"])
 
 # Include the events router
 api_router.include_router(events.router, prefix="/events", tags=["events"])
+
+# Include the sync router
+api_router.include_router(sync.router, prefix="/sync", tags=["sync"])
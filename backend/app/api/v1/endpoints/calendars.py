@@ -1,40 +1,68 @@
 # backend/app/api/v1/endpoints/calendars.py
-from typing import Any, List as ListTyping
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List as ListTyping, Optional
+from datetime import datetime, timedelta, timezone
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app import models
+from app.core import export
+from app.core.conditional import Validators
+from app.core.response_cache import response_cache
+from app.core.serialization import ORJSONResponse
+from app.core.recurrence import as_utc
+from app.core.scheduling import find_free_slots, merge_intervals
+from app.crud import event as event_crud
+from app.crud import list_item as list_item_crud
 from app.crud.crud_calendar import calendar_crud
+from app.crud.crud_list import list_crud
 from app.schemas import calendar as calendar_schemas
+from app.schemas import list_item as list_item_schemas
 from app.api import deps
 
 from app.models.calendar import CalendarType
 
 router = APIRouter()
 
-@router.get("/", response_model=ListTyping[calendar_schemas.Calendar])
+@router.get("/", response_model=ListTyping[calendar_schemas.CalendarSummary])
 def read_calendars(
+    request: Request,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
     current_user: models.User = Depends(deps.get_current_active_user),
 ):
     """
-    Retrieve calendars owned by the current user.
+    Retrieve calendars owned by the current user, without their members
+    (use `GET /calendars/{calendar_id}` for those).
     """
+    cache_key = response_cache.key(request, scope=f"user:{current_user.id}")
+    cached = response_cache.get(request, cache_key)
+    if cached is not None:
+        return cached
     calendars = calendar_crud.get_multi_by_owner(
-        db, owner_id=current_user.id, skip=skip, limit=limit
+        db, owner_id=current_user.id, skip=skip, limit=limit, with_members=False
+    )
+    response = ORJSONResponse([
+        calendar_schemas.CalendarSummary.model_validate(calendar).model_dump(mode="json")
+        for calendar in calendars
+    ])
+    return response_cache.store(
+        cache_key, response,
+        tags=[f"user:{current_user.id}", *(f"calendar:{calendar.id}" for calendar in calendars)],
     )
-    return calendars
 
 @router.get("/{calendar_id}", response_model=calendar_schemas.Calendar)
 def read_calendar(
     calendar_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_user),
 ):
     """
     Get a specific calendar by ID.
+    Answers 304 when `If-None-Match` holds its ETag.
     """
     calendar = calendar_crud.get(db=db, id=calendar_id)
     if not calendar:
@@ -42,8 +70,160 @@ def read_calendar(
     if calendar.owner_id != current_user.id:
         # You might want to check for membership as well in a real app
         raise HTTPException(status_code=403, detail="Not enough permissions")
+    # Owner and membership changes do not touch the calendar row, the embedded users go into the ETag
+    owner = calendar.owner
+    validators = Validators.for_row(
+        calendar,
+        (owner.id, owner.email, owner.is_active),
+        tuple(sorted((m.id, m.email, m.is_active) for m in calendar.members)),
+    )
+    cached = validators.not_modified(request)
+    if cached is not None:
+        return cached
+    response.headers.update(validators.headers)
     return calendar
 
+# Longest event window the overview accepts
+MAX_OVERVIEW_DAYS = 92
+
+@router.get("/{calendar_id}/overview", response_model=calendar_schemas.CalendarOverview)
+def read_calendar_overview(
+    calendar_id: int,
+    start: Optional[datetime] = Query(None, description="Start of the event window, defaults to now"),
+    end: Optional[datetime] = Query(None, description="End of the event window, defaults to start + 7 days"),
+    list_limit: int = Query(50, ge=1, le=200, description="Maximum number of lists"),
+    items_per_list: int = Query(5, ge=0, le=50, description="Top items returned per list"),
+    event_limit: int = Query(100, ge=1, le=500, description="Maximum number of events"),
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+):
+    """
+    Everything a calendar screen needs in one call: the calendar, its lists
+    with item, completion and vote counts and their most voted items, and the
+    events in a time window. Every part is bounded, and the response is built
+    from the same handful of queries whatever the size of the calendar.
+    """
+    deps.check_calendar_access(db=db, calendar_id=calendar_id, user=current_user)
+    start = as_utc(start) if start is not None else datetime.now(timezone.utc)
+    end = as_utc(end) if end is not None else start + timedelta(days=7)
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    if end - start > timedelta(days=MAX_OVERVIEW_DAYS):
+        raise HTTPException(status_code=400, detail=f"Window must not exceed {MAX_OVERVIEW_DAYS} days")
+
+    calendar = calendar_crud.get(db, id=calendar_id, with_members=False)
+    list_rows = list_crud.get_multi_with_counts(db, calendar_id=calendar_id, limit=list_limit + 1)
+    lists_truncated = len(list_rows) > list_limit
+    list_rows = list_rows[:list_limit]
+
+    top_items = {}
+    for item, vote_count in list_item_crud.get_top_by_lists(
+        db, list_ids=[row[0].id for row in list_rows], per_list=items_per_list
+    ):
+        top_items.setdefault(item.list_id, []).append(
+            list_item_schemas.ListItem.model_validate(item).model_copy(update={"vote_count": vote_count})
+        )
+
+    events = event_crud.get_multi_by_date_range(
+        db, calendar_id=calendar_id, start_date=start, end_date=end, limit=event_limit + 1
+    )
+    return calendar_schemas.CalendarOverview(
+        calendar=calendar,
+        lists=[
+            calendar_schemas.ListOverview.model_validate(list_obj).model_copy(update={
+                "item_count": item_count,
+                "completed_count": completed_count,
+                "vote_count": vote_count,
+                "top_items": top_items.get(list_obj.id, []),
+            })
+            for list_obj, item_count, completed_count, vote_count in list_rows
+        ],
+        lists_truncated=lists_truncated,
+        start=start,
+        end=end,
+        events=events[:event_limit],
+        events_truncated=len(events) > event_limit,
+    )
+
+# Longest window free/busy accepts: every member's events in it are read and expanded
+MAX_FREE_BUSY_DAYS = 92
+
+@router.get("/{calendar_id}/free-busy", response_model=calendar_schemas.FreeBusy)
+def read_free_busy(
+    calendar_id: int,
+    start: datetime = Query(..., description="Window start"),
+    end: datetime = Query(..., description="Window end"),
+    duration_minutes: int = Query(30, ge=1, le=24 * 60, description="Length of the wanted slot"),
+    slots: int = Query(5, ge=1, le=100, description="Number of free slots to return"),
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+):
+    """
+    Get the combined busy blocks of everyone on a calendar, and the first free
+    slots of the requested length.
+    Busy time covers every calendar each member can access, not just this one.
+    Only start and end times are exposed.
+    """
+    deps.check_calendar_access(db=db, calendar_id=calendar_id, user=current_user)
+    start, end = as_utc(start), as_utc(end)
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    if end - start > timedelta(days=MAX_FREE_BUSY_DAYS):
+        raise HTTPException(status_code=400, detail=f"Window must not exceed {MAX_FREE_BUSY_DAYS} days")
+
+    member_ids = calendar_crud.get_member_ids(db, calendar_id=calendar_id)
+    intervals = event_crud.get_busy_intervals(
+        db, user_ids=member_ids, start_date=start, end_date=end
+    )
+    busy = merge_intervals(intervals, window_start=start, window_end=end)
+    free = find_free_slots(
+        busy,
+        window_start=start,
+        window_end=end,
+        duration=timedelta(minutes=duration_minutes),
+        count=slots,
+    )
+    return calendar_schemas.FreeBusy(
+        start=start,
+        end=end,
+        busy=[calendar_schemas.TimeSlot(start=s, end=e) for s, e in busy],
+        free=[calendar_schemas.TimeSlot(start=s, end=e) for s, e in free],
+    )
+
+@router.get("/{calendar_id}/export.ndjson", response_class=StreamingResponse)
+def export_calendar_ndjson(
+    calendar_id: int,
+    gzip: bool = Query(False, description="Compress the export (application/gzip, .ndjson.gz)"),
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+):
+    """
+    Export a whole calendar as newline-delimited JSON: the calendar, then its
+    lists, list items, votes and events, one `{"type", "data"}` record per
+    line. Rows are streamed from server-side cursors, so memory use does not
+    grow with the size of the calendar.
+    """
+    deps.check_calendar_access(db=db, calendar_id=calendar_id, user=current_user)
+    bind = db.get_bind()
+
+    def body():
+        # The request session is closed before the body is streamed, so use our own
+        with Session(bind=bind) as stream_db:
+            yield from export.stream_calendar(stream_db, calendar_id)
+
+    filename = f"calendar-{calendar_id}.ndjson"
+    if gzip:
+        return StreamingResponse(
+            export.gzipped(body()),
+            media_type="application/gzip",
+            headers={"Content-Disposition": f'attachment; filename="{filename}.gz"'},
+        )
+    return StreamingResponse(
+        body(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
 @router.post("/", response_model=calendar_schemas.Calendar)
 def create_calendar(
     *,
@@ -1,21 +1,147 @@
-from typing import Any, List as ListTyping, Optional
-from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Query
+import asyncio
+import io
+from typing import Any, List as ListTyping, Optional, Type
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from app import models
+from app.core import ical, reminders
+from app.core.conditional import Validators
+from app.core.response_cache import response_cache
+from app.core.single_flight import single_flight
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.recurrence import as_utc
+from app.core.serialization import serialize_many
+from app.crud import calendar as calendar_crud
 from app.crud import event as event_crud
 from app.schemas import event as event_schemas
 from app.api import deps
 
 router = APIRouter()
 
+# Longest period a density request may cover (a year view plus slack)
+MAX_DENSITY_DAYS = 400
+
+def _check_conflicts(
+    db: Session,
+    *,
+    user: models.User,
+    calendar_id: int,
+    start_time: datetime,
+    end_time: Optional[datetime],
+    scope: event_schemas.ConflictScope,
+    exclude_id: Optional[int] = None,
+) -> None:
+    """
+    Raise 409 listing the events that overlap [start_time, end_time) in the
+    requested scope. For a recurring event only its first occurrence is checked.
+    """
+    if scope == event_schemas.ConflictScope.USER:
+        calendar_ids = sorted(deps.get_accessible_calendar_ids(db, user))
+    else:
+        calendar_ids = [calendar_id]
+    conflicts = event_crud.get_conflicts(
+        db,
+        calendar_ids=calendar_ids,
+        start_time=start_time,
+        end_time=end_time,
+        exclude_id=exclude_id,
+    )
+    if conflicts:
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "message": "Event overlaps existing events",
+                "conflicts": [
+                    event_schemas.Event.model_validate(conflict).model_dump(mode="json")
+                    for conflict in conflicts
+                ],
+            },
+        )
+
+@router.get("/agenda", response_model=event_schemas.AgendaPage)
+def read_agenda(
+    db: Session = Depends(deps.get_db),
+    from_time: Optional[datetime] = Query(None, description="Start time of the feed, defaults to now"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=200),
+    current_user: models.User = Depends(deps.get_current_active_user),
+):
+    """
+    Get upcoming events from every calendar the current user can access,
+    merged into one time-ordered feed with cursor pagination.
+    """
+    if from_time is None:
+        from_time = datetime.now(timezone.utc)
+    after = None
+    if cursor is not None:
+        start_time, event_id = decode_cursor(cursor, 2)
+        try:
+            after = (datetime.fromisoformat(start_time), int(event_id))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+    calendar_ids = sorted(deps.get_accessible_calendar_ids(db, current_user))
+    events = event_crud.get_agenda(
+        db, calendar_ids=calendar_ids, from_time=from_time, after=after, limit=limit + 1
+    )
+
+    next_cursor = None
+    if len(events) > limit:
+        events = events[:limit]
+        last = events[-1]
+        next_cursor = encode_cursor(as_utc(last.start_time).isoformat(), last.id)
+    return event_schemas.AgendaPage(items=events, next_cursor=next_cursor)
+
+@router.get("/reminders/stream", response_class=StreamingResponse)
+async def stream_reminders(
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+):
+    """
+    Server-Sent Events feed of reminders for every calendar the current user
+    can access, so clients need not poll `/upcoming`. Calendars shared after
+    the connection opened are picked up on reconnect.
+    """
+    scheduler = reminders.get_scheduler()
+    if scheduler is None or not isinstance(scheduler.sink, reminders.BroadcastSink):
+        raise HTTPException(status_code=503, detail="Reminder streaming is not enabled")
+    calendar_ids = await run_in_threadpool(
+        calendar_crud.get_accessible_ids, db, user_id=current_user.id
+    )
+    sink = scheduler.sink
+    subscription = sink.subscribe(calendar_ids)
+
+    async def body():
+        try:
+            while True:
+                try:
+                    reminder = await asyncio.wait_for(subscription.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: reminder\ndata: {reminder.to_json()}\n\n"
+        finally:
+            sink.unsubscribe(subscription)
+
+    return StreamingResponse(
+        body(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"}
+    )
+
 @router.get("/calendar/{calendar_id}", response_model=ListTyping[event_schemas.Event])
 def read_events_by_calendar(
     calendar_id: int,
+    request: Request,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    include_archived: bool = Query(False, description="Include archived events, ordered by start time"),
+    fieldset: Type[BaseModel] = Depends(deps.sparse_fields(event_schemas.Event)),
     current_user: models.User = Depends(deps.get_current_active_user),
 ):
     """
@@ -24,10 +150,26 @@ def read_events_by_calendar(
     # Check if user has access to the calendar
     deps.check_calendar_access(db=db, calendar_id=calendar_id, user=current_user)
     
-    events = event_crud.get_multi_by_calendar(
-        db, calendar_id=calendar_id, skip=skip, limit=limit
-    )
-    return events
+    # Same answer for every member once access is checked
+    cache_key = response_cache.key(request, scope=f"calendar:{calendar_id}")
+    cached = response_cache.get(request, cache_key)
+    if cached is not None:
+        return cached
+    validators = Validators.for_collection(request, *event_crud.stamps_by_calendar(db, calendar_id=calendar_id))
+    cached = validators.not_modified(request)
+    if cached is not None:
+        return cached
+
+    def render():
+        events = event_crud.get_multi_by_calendar(
+            db, calendar_id=calendar_id, skip=skip, limit=limit, fields=fieldset.model_fields,
+            include_archived=include_archived,
+        )
+        return response_cache.store(
+            cache_key, serialize_many(fieldset, events, headers=validators.headers),
+            tags=[f"calendar:{calendar_id}"],
+        )
+    return single_flight.do("events.by_calendar", (cache_key.key, validators.etag), render)
 
 @router.get("/calendar/{calendar_id}/upcoming", response_model=ListTyping[event_schemas.Event])
 def read_upcoming_events(
@@ -36,54 +178,161 @@ def read_upcoming_events(
     from_time: Optional[datetime] = Query(None, description="Start time for upcoming events"),
     skip: int = 0,
     limit: int = 100,
+    fieldset: Type[BaseModel] = Depends(deps.sparse_fields(event_schemas.Event)),
     current_user: models.User = Depends(deps.get_current_active_user),
 ):
     """
     Get upcoming events for a calendar.
     """
     events = event_crud.get_upcoming_events(
-        db, calendar_id=calendar_id, from_time=from_time, skip=skip, limit=limit
+        db, calendar_id=calendar_id, from_time=from_time, skip=skip, limit=limit,
+        fields=fieldset.model_fields
     )
-    return events
+    return serialize_many(fieldset, events)
 
 @router.get("/calendar/{calendar_id}/date-range", response_model=ListTyping[event_schemas.Event])
 def read_events_by_date_range(
     calendar_id: int,
+    request: Request,
     start_date: datetime = Query(..., description="Start date for event range"),
     end_date: datetime = Query(..., description="End date for event range"),
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    fieldset: Type[BaseModel] = Depends(deps.sparse_fields(event_schemas.Event)),
     current_user: models.User = Depends(deps.get_current_active_user),
 ):
     """
     Get events within a specific date range for a calendar.
     """
+    validators = Validators.for_collection(request, *event_crud.stamps_by_calendar(db, calendar_id=calendar_id))
+    cached = validators.not_modified(request)
+    if cached is not None:
+        return cached
     events = event_crud.get_multi_by_date_range(
         db, 
         calendar_id=calendar_id, 
         start_date=start_date, 
         end_date=end_date,
         skip=skip, 
-        limit=limit
+        limit=limit,
+        fields=fieldset.model_fields
+    )
+    return serialize_many(fieldset, events, headers=validators.headers)
+
+@router.get("/calendar/{calendar_id}/density", response_model=event_schemas.Density)
+def read_event_density(
+    calendar_id: int,
+    start: datetime = Query(..., description="Start of the period (inclusive)"),
+    end: datetime = Query(..., description="End of the period (exclusive)"),
+    granularity: event_schemas.DensityGranularity = Query(event_schemas.DensityGranularity.DAY),
+    tz: str = Query("UTC", description="IANA time zone the buckets follow, e.g. Asia/Taipei"),
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+):
+    """
+    Get the number of events per day, week or month of a calendar, for month
+    and year views that only need counts.
+    """
+    deps.check_calendar_access(db=db, calendar_id=calendar_id, user=current_user)
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    if end - start > timedelta(days=MAX_DENSITY_DAYS):
+        raise HTTPException(status_code=400, detail=f"Period must not exceed {MAX_DENSITY_DAYS} days")
+    try:
+        ZoneInfo(tz)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(status_code=400, detail=f"Unknown time zone {tz!r}")
+
+    counts = event_crud.get_density(
+        db,
+        calendar_id=calendar_id,
+        start_date=start,
+        end_date=end,
+        granularity=granularity.value,
+        tz=tz,
+    )
+    return event_schemas.Density(
+        granularity=granularity,
+        tz=tz,
+        buckets=[event_schemas.DensityBucket(start=local, count=count) for local, count in counts],
     )
-    return events
+
+@router.get("/calendar/{calendar_id}/export.ics", response_class=StreamingResponse)
+def export_calendar_ics(
+    calendar_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+):
+    """
+    Export every event of a calendar as an iCalendar (.ics) file.
+    Events are streamed from a server-side cursor, so memory use does not grow
+    with the size of the calendar.
+    """
+    deps.check_calendar_access(db=db, calendar_id=calendar_id, user=current_user)
+    name = calendar_crud.get(db, id=calendar_id).name
+    bind = db.get_bind()
+
+    def body():
+        # The request session is closed before the body is streamed, so use our own
+        with Session(bind=bind) as stream_db:
+            events = event_crud.stream_by_calendar(stream_db, calendar_id=calendar_id)
+            yield from ical.chunked(ical.serialize_calendar(events, name=name))
+
+    return StreamingResponse(
+        body(),
+        media_type="text/calendar",
+        headers={"Content-Disposition": f'attachment; filename="calendar-{calendar_id}.ics"'},
+    )
+
+@router.post("/calendar/{calendar_id}/import.ics", response_model=event_schemas.ImportResult)
+def import_calendar_ics(
+    calendar_id: int,
+    file: UploadFile = File(..., description="iCalendar (.ics) file"),
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+):
+    """
+    Import the VEVENTs of an iCalendar (.ics) file into a calendar.
+    The upload is parsed incrementally and inserted in batches within a single
+    transaction: either every event is imported or none is.
+    """
+    deps.check_calendar_access(db=db, calendar_id=calendar_id, user=current_user)
+
+    lines = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+    try:
+        imported = event_crud.bulk_create_for_calendar(
+            db,
+            rows=ical.parse_events(lines),
+            calendar_id=calendar_id,
+            creator_id=current_user.id,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid iCalendar data: {e}")
+    finally:
+        lines.detach()
+    return event_schemas.ImportResult(imported=imported)
 
 @router.get("/{event_id}", response_model=event_schemas.Event)
 def read_event(
     event_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_user),
 ):
     """
-    Get a specific event by ID.
+    Get a specific event by ID. Archived events can still be read.
+    Answers 304 when `If-None-Match` holds its ETag.
     """
-    event = event_crud.get(db=db, id=event_id)
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
-    
-    # Check if user has access to the calendar
-    deps.check_calendar_access(db=db, calendar_id=event.calendar_id, user=current_user)
+    event = event_crud.get_if_accessible(
+        db, id=event_id, user_id=current_user.id, include_archived=True
+    )
+    validators = Validators.for_row(event)
+    cached = validators.not_modified(request)
+    if cached is not None:
+        return cached
+    response.headers.update(validators.headers)
     return event
 
 @router.post("/", response_model=event_schemas.Event)
@@ -91,6 +340,8 @@ def create_event(
     *,
     db: Session = Depends(deps.get_db),
     event_in: event_schemas.EventCreate,
+    detect_conflicts: bool = Query(False, description="Reject the event with 409 if it overlaps existing events"),
+    conflict_scope: event_schemas.ConflictScope = Query(event_schemas.ConflictScope.CALENDAR),
     current_user: models.User = Depends(deps.get_current_active_user),
 ):
     """
@@ -99,6 +350,16 @@ def create_event(
     # Check if user has access to the calendar
     deps.check_calendar_access(db=db, calendar_id=event_in.calendar_id, user=current_user)
     
+    if detect_conflicts:
+        _check_conflicts(
+            db,
+            user=current_user,
+            calendar_id=event_in.calendar_id,
+            start_time=event_in.start_time,
+            end_time=event_in.end_time,
+            scope=conflict_scope,
+        )
+
     event = event_crud.create_with_user(
         db=db, obj_in=event_in, creator_id=current_user.id
     )
@@ -110,18 +371,28 @@ def update_event(
     db: Session = Depends(deps.get_db),
     event_id: int,
     event_in: event_schemas.EventUpdate,
+    detect_conflicts: bool = Query(False, description="Reject the update with 409 if it overlaps existing events"),
+    conflict_scope: event_schemas.ConflictScope = Query(event_schemas.ConflictScope.CALENDAR),
     current_user: models.User = Depends(deps.get_current_active_user),
 ):
     """
     Update an event.
     """
-    event = event_crud.get(db=db, id=event_id)
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
-    
-    # Check if user has access to the calendar
-    deps.check_calendar_access(db=db, calendar_id=event.calendar_id, user=current_user)
+    # Fetches the event and checks calendar access in one query
+    event = event_crud.get_if_accessible(db, id=event_id, user_id=current_user.id)
     
+    if detect_conflicts:
+        changes = event_in.model_dump(exclude_unset=True)
+        _check_conflicts(
+            db,
+            user=current_user,
+            calendar_id=event.calendar_id,
+            start_time=changes.get("start_time", event.start_time),
+            end_time=changes.get("end_time", event.end_time),
+            scope=conflict_scope,
+            exclude_id=event.id,
+        )
+
     event = event_crud.update(db=db, db_obj=event, obj_in=event_in)
     return event
 
@@ -135,12 +406,8 @@ def delete_event(
     """
     Delete an event.
     """
-    event = event_crud.get(db=db, id=event_id)
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
-    
-    # Check if user has access to the calendar
-    deps.check_calendar_access(db=db, calendar_id=event.calendar_id, user=current_user)
+    # Fetches the event and checks calendar access in one query
+    event = event_crud.get_if_accessible(db, id=event_id, user_id=current_user.id)
     
     event = event_crud.remove(db=db, id=event_id)
     return event
\ No newline at end of file
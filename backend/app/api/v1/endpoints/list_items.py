@@ -1,9 +1,15 @@
-from typing import Any, List as ListTyping
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List as ListTyping, Type
+from fastapi import APIRouter, Depends, Request, Response
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from app import models
+from app.core.conditional import Validators
+from app.core.response_cache import response_cache
+from app.core.single_flight import single_flight
+from app.core.serialization import schema_columns, serialize_many
 from app.crud import list_item as list_item_crud
+from app.crud import vote as vote_crud
 from app.schemas import list_item as list_item_schemas
 from app.api import deps
 
@@ -12,9 +18,11 @@ router = APIRouter()
 @router.get("/list/{list_id}", response_model=ListTyping[list_item_schemas.ListItem])
 def read_list_items(
     list_id: int,
+    request: Request,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    fieldset: Type[BaseModel] = Depends(deps.sparse_fields(list_item_schemas.ListItem)),
     current_user: models.User = Depends(deps.get_current_active_user),
 ):
     """
@@ -23,17 +31,24 @@ def read_list_items(
     # Check if user has access to the list
     deps.check_list_access(db=db, list_id=list_id, user=current_user)
     
+    validators = Validators.for_collection(request, list_item_crud.stamp_by_list(db, list_id=list_id))
+    cached = validators.not_modified(request)
+    if cached is not None:
+        return cached
     items = list_item_crud.get_multi_by_list(
-        db, list_id=list_id, skip=skip, limit=limit
+        db, list_id=list_id, skip=skip, limit=limit,
+        columns=schema_columns(fieldset, models.ListItem)
     )
-    return items
+    return serialize_many(fieldset, items, headers=validators.headers)
 
-@router.get("/list/{list_id}/with-votes", response_model=ListTyping[dict])
+@router.get("/list/{list_id}/with-votes", response_model=ListTyping[list_item_schemas.ListItem])
 def read_list_items_with_votes(
     list_id: int,
+    request: Request,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    fieldset: Type[BaseModel] = Depends(deps.sparse_fields(list_item_schemas.ListItem)),
     current_user: models.User = Depends(deps.get_current_active_user),
 ):
     """
@@ -88,41 +103,51 @@ def read_list_items_with_votes(
     # Check if user has access to the list
     deps.check_list_access(db=db, list_id=list_id, user=current_user)
     
-    items_with_votes = list_item_crud.get_multi_with_vote_counts(
-        db, list_id=list_id, skip=skip, limit=limit
+    # Same answer for every member once access is checked
+    cache_key = response_cache.key(request, scope=f"list:{list_id}")
+    cached = response_cache.get(request, cache_key)
+    if cached is not None:
+        return cached
+    validators = Validators.for_collection(
+        request,
+        list_item_crud.stamp_by_list(db, list_id=list_id),
+        vote_crud.stamp_by_list(db, list_id=list_id),
     )
-    
-    # Convert to dict format with vote counts
-    result = []
-    for item, vote_count in items_with_votes:
-        item_dict = {
-            "id": item.id,
-            "content": item.content,
-            "is_completed": item.is_completed,
-            "list_id": item.list_id,
-            "creator_id": item.creator_id,
-            "created_at": item.created_at,
-            "vote_count": vote_count or 0
-        }
-        result.append(item_dict)
-    
-    return result
+    cached = validators.not_modified(request)
+    if cached is not None:
+        return cached
+
+    def render():
+        # Rows of the schema's columns plus vote_count, serialized in one pass
+        items_with_votes = list_item_crud.get_multi_with_vote_counts(
+            db, list_id=list_id, skip=skip, limit=limit,
+            columns=schema_columns(fieldset, models.ListItem)
+        )
+        return response_cache.store(
+            cache_key, serialize_many(fieldset, items_with_votes, headers=validators.headers),
+            tags=[f"list:{list_id}"],
+        )
+    # Concurrent identical reads (a live vote) share one query and render
+    return single_flight.do("list_items.with_votes", (cache_key.key, validators.etag), render)
 
 @router.get("/{item_id}", response_model=list_item_schemas.ListItem)
 def read_list_item(
     item_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_user),
 ):
     """
-    Get a specific list item by ID.
+    Get a specific list item by ID. Answers 304 when `If-None-Match` holds its ETag.
     """
-    item = list_item_crud.get(db=db, id=item_id)
-    if not item:
-        raise HTTPException(status_code=404, detail="List item not found")
-    
-    # Check if user has access to the list
-    deps.check_list_access(db=db, list_id=item.list_id, user=current_user)
+    # Fetches the item and checks list access in one query
+    item = list_item_crud.get_if_accessible(db, id=item_id, user_id=current_user.id)
+    validators = Validators.for_row(item)
+    cached = validators.not_modified(request)
+    if cached is not None:
+        return cached
+    response.headers.update(validators.headers)
     return item
 
 @router.post("/", response_model=list_item_schemas.ListItem)
@@ -154,12 +179,8 @@ def update_list_item(
     """
     Update a list item.
     """
-    item = list_item_crud.get(db=db, id=item_id)
-    if not item:
-        raise HTTPException(status_code=404, detail="List item not found")
-    
-    # Check if user has access to the list
-    deps.check_list_access(db=db, list_id=item.list_id, user=current_user)
+    # Fetches the item and checks list access in one query
+    item = list_item_crud.get_if_accessible(db, id=item_id, user_id=current_user.id)
     
     item = list_item_crud.update(db=db, db_obj=item, obj_in=item_in)
     return item
@@ -174,12 +195,8 @@ def delete_list_item(
     """
     Delete a list item.
     """
-    item = list_item_crud.get(db=db, id=item_id)
-    if not item:
-        raise HTTPException(status_code=404, detail="List item not found")
-    
-    # Check if user has access to the list
-    deps.check_list_access(db=db, list_id=item.list_id, user=current_user)
+    # Fetches the item and checks list access in one query
+    item = list_item_crud.get_if_accessible(db, id=item_id, user_id=current_user.id)
     
     item = list_item_crud.remove(db=db, id=item_id)
     return item
\ No newline at end of file
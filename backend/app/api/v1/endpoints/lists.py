@@ -1,8 +1,11 @@
-from typing import Any, List as ListTyping
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List as ListTyping, Optional, Type
+from fastapi import APIRouter, Depends, Query, Request, Response
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from app import models
+from app.core.conditional import Validators
+from app.core.serialization import schema_columns, serialize_many
 from app.crud.crud_list import list_crud
 from app.schemas import list as list_schemas
 from app.api import deps
@@ -11,9 +14,12 @@ router = APIRouter()
 
 @router.get("/", response_model=ListTyping[list_schemas.List])
 def read_lists(
+    request: Request,
     db: Session = Depends(deps.get_db),
-    skip: int = 0,
+    after_id: Optional[int] = Query(None, description="Id of the last list of the previous page"),
+    skip: int = Query(0, deprecated=True, description="Use after_id instead"),
     limit: int = 100,
+    fieldset: Type[BaseModel] = Depends(deps.sparse_fields(list_schemas.List)),
     current_user: models.User = Depends(deps.get_current_active_user),
 ):
     """
@@ -22,12 +28,13 @@ def read_lists(
     取得當前用戶可存取的所有清單。
 
     ### 🔧 功能說明
-    - 返回用戶有權限存取的所有清單
-    - 支援分頁查詢
+    - 返回用戶擁有或受邀加入之日曆中的所有清單，依 `id` 排序
+    - 支援 keyset 分頁查詢
     - 包含 TODO 和 PRIORITY 兩種類型
 
     ### 📊 查詢參數
-    - `skip`: 跳過筆數（分頁用）
+    - `after_id`: 上一頁最後一筆清單的 `id`（分頁用）
+    - `skip`: 跳過筆數（已棄用，請改用 `after_id`）
     - `limit`: 返回筆數上限（最大 100）
 
     ### ✅ 成功回應
@@ -53,39 +60,59 @@ def read_lists(
     ### 🔑 權限要求
     需要有效的 JWT Token
     """
-    lists = list_crud.get_multi(db, skip=skip, limit=limit)
-    return lists
+    validators = Validators.for_collection(request, list_crud.stamp_accessible(db, user_id=current_user.id))
+    cached = validators.not_modified(request)
+    if cached is not None:
+        return cached
+    lists = list_crud.get_multi_accessible(
+        db, user_id=current_user.id, after_id=after_id, skip=skip, limit=limit,
+        columns=schema_columns(fieldset, models.List)
+    )
+    return serialize_many(fieldset, lists, headers=validators.headers)
 
 @router.get("/calendar/{calendar_id}", response_model=ListTyping[list_schemas.List])
 def read_lists_by_calendar(
     calendar_id: int,
+    request: Request,
     db: Session = Depends(deps.get_db),
-    skip: int = 0,
+    after_id: Optional[int] = Query(None, description="Id of the last list of the previous page"),
+    skip: int = Query(0, deprecated=True, description="Use after_id instead"),
     limit: int = 100,
+    fieldset: Type[BaseModel] = Depends(deps.sparse_fields(list_schemas.List)),
     current_user: models.User = Depends(deps.get_current_active_user),
 ):
     """
-    Retrieve lists for a specific calendar.
-    Add permission check here in the future.
+    Retrieve lists for a specific calendar the user can access, in id order.
     """
+    deps.check_calendar_access(db=db, calendar_id=calendar_id, user=current_user)
+    validators = Validators.for_collection(request, list_crud.stamp_by_calendar(db, calendar_id=calendar_id))
+    cached = validators.not_modified(request)
+    if cached is not None:
+        return cached
     lists = list_crud.get_multi_by_calendar(
-        db, calendar_id=calendar_id, skip=skip, limit=limit
+        db, calendar_id=calendar_id, after_id=after_id, skip=skip, limit=limit,
+        columns=schema_columns(fieldset, models.List)
     )
-    return lists
+    return serialize_many(fieldset, lists, headers=validators.headers)
 
 @router.get("/{list_id}", response_model=list_schemas.List)
 def read_list(
     list_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_user),
 ):
     """
-    Get a specific list by ID.
+    Get a specific list by ID. Answers 304 when `If-None-Match` holds its ETag.
     """
-    list_obj = list_crud.get(db=db, id=list_id)
-    if not list_obj:
-        raise HTTPException(status_code=404, detail="List not found")
-    # Add permission check here in the future
+    # Fetches the list and checks calendar access in one query
+    list_obj = list_crud.get_if_accessible(db, id=list_id, user_id=current_user.id)
+    validators = Validators.for_row(list_obj)
+    cached = validators.not_modified(request)
+    if cached is not None:
+        return cached
+    response.headers.update(validators.headers)
     return list_obj
 
 @router.post("/", response_model=list_schemas.List)
@@ -150,10 +177,7 @@ def update_list(
     """
     Update a list.
     """
-    list_obj = list_crud.get(db=db, id=list_id)
-    if not list_obj:
-        raise HTTPException(status_code=404, detail="List not found")
-    # Add permission check here: if list_obj.calendar.owner_id != current_user.id: ...
+    list_obj = list_crud.get_if_accessible(db, id=list_id, user_id=current_user.id)
     list_obj = list_crud.update(db=db, db_obj=list_obj, obj_in=list_in)
     return list_obj
 
@@ -167,9 +191,6 @@ def delete_list(
     """
     Delete a list.
     """
-    list_obj = list_crud.get(db=db, id=list_id)
-    if not list_obj:
-        raise HTTPException(status_code=404, detail="List not found")
-    # Add permission check here
+    list_crud.get_if_accessible(db, id=list_id, user_id=current_user.id)
     list_obj = list_crud.remove(db=db, id=list_id)
     return list_obj
@@ -0,0 +1,49 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.api import deps
+from app.core import sync
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.serialization import ORJSONResponse
+from app.schemas import sync as sync_schemas
+
+router = APIRouter()
+
+@router.get("", response_model=sync_schemas.SyncPage)
+def read_changes(
+    since: Optional[str] = Query(None, description="Cursor of the previous sync; omit it to only get the current cursor"),
+    limit: int = Query(1000, ge=1, le=5000, description="Maximum number of changed or deleted entities"),
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+):
+    """
+    Calendars, lists, list items, votes and events of the user's calendars
+    created, updated or deleted since the `since` cursor, in their current
+    state (deleted or no longer accessible ones as ids).
+
+    Start by calling without `since` and then loading the data in full; sync
+    with the returned cursor afterwards, again immediately while `has_more`.
+    A calendar the client does not know yet was just shared with the user and
+    is loaded in full too. A cursor older than the retained change history
+    gets 410: load the data in full again.
+    """
+    if since is None:
+        return sync_schemas.SyncPage(cursor=encode_cursor(sync.current_position(db), 0, 0))
+    position, upper, after = decode_cursor(since, 3)
+    if not all(isinstance(value, int) and value >= 0 for value in (position, upper, after)):
+        raise HTTPException(status_code=400, detail="Invalid sync cursor")
+    if position < sync.floor_position(db):
+        raise HTTPException(
+            status_code=410,
+            detail="The sync cursor is older than the retained change history; reload the data in full",
+        )
+    # Not the access cache: a membership it has not seen yet would be skipped for good
+    calendar_ids = crud.calendar.get_accessible_ids(db, user_id=current_user.id)
+    page = sync.changes_since(
+        db, since=position, upper=upper or None, after=after,
+        user_id=current_user.id, calendar_ids=calendar_ids, limit=limit,
+    )
+    page["cursor"] = encode_cursor(*page["cursor"])
+    return ORJSONResponse(page)
@@ -1,45 +1,62 @@
-from typing import Any, List as ListTyping
+from typing import Any, List as ListTyping, Type
 from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from app import models, crud
 from app.crud import vote as vote_crud
 from app.schemas import vote as vote_schemas
 from app.api import deps
+from app.core.conditional import Validators
 from app.core.rate_limiter import vote_rate_limit
+from app.core.serialization import schema_columns, serialize_many
 
 router = APIRouter()
 
 @router.get("/item/{item_id}", response_model=ListTyping[vote_schemas.Vote])
 def read_votes_for_item(
     item_id: int,
+    request: Request,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    fieldset: Type[BaseModel] = Depends(deps.sparse_fields(vote_schemas.Vote)),
     current_user: models.User = Depends(deps.get_current_active_user),
 ):
     """
     Get all votes for a specific list item.
     """
+    validators = Validators.for_collection(request, vote_crud.stamp_by_item(db, list_item_id=item_id))
+    cached = validators.not_modified(request)
+    if cached is not None:
+        return cached
     votes = vote_crud.get_multi_by_item(
-        db, list_item_id=item_id, skip=skip, limit=limit
+        db, list_item_id=item_id, skip=skip, limit=limit,
+        columns=schema_columns(fieldset, models.Vote)
     )
-    return votes
+    return serialize_many(fieldset, votes, headers=validators.headers)
 
 @router.get("/user/my-votes", response_model=ListTyping[vote_schemas.Vote])
 def read_my_votes(
+    request: Request,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    fieldset: Type[BaseModel] = Depends(deps.sparse_fields(vote_schemas.Vote)),
     current_user: models.User = Depends(deps.get_current_active_user),
 ):
     """
     Get all votes by the current user.
     """
+    validators = Validators.for_collection(request, vote_crud.stamp_by_user(db, user_id=current_user.id))
+    cached = validators.not_modified(request)
+    if cached is not None:
+        return cached
     votes = vote_crud.get_multi_by_user(
-        db, user_id=current_user.id, skip=skip, limit=limit
+        db, user_id=current_user.id, skip=skip, limit=limit,
+        columns=schema_columns(fieldset, models.Vote)
     )
-    return votes
+    return serialize_many(fieldset, votes, headers=validators.headers)
 
 @router.post("/", response_model=vote_schemas.Vote)
 def create_vote(
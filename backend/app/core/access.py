@@ -0,0 +1,209 @@
+"""
+In-memory authorization data for `deps.check_calendar_access` and
+`deps.check_list_access`.
+
+`AccessCache` holds, per user, the set of calendar ids they own or are a member
+of, plus a list id -> calendar id map, so a permission check is a set lookup
+instead of a join against `calendar_user_association`.
+
+Entries are invalidated from SQLAlchemy session events when a commit creates or
+deletes a calendar, changes its owner or members, or deletes or moves a list.
+Only ORM changes are seen, and only by this process, so entries also expire
+after ACCESS_CACHE_TTL_SECONDS to bound staleness across workers and for
+changes made with bulk statements.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, FrozenSet, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, attributes
+
+from app.core.config import settings
+from app.models.calendar import Calendar
+from app.models.list import List
+from app.models.user import User
+
+
+class AccessCache:
+    """
+    Bounded LRU caches of accessible calendar ids per user and of the calendar
+    each list belongs to, with hit/miss counters.
+
+    Loads go through `calendar_ids` / `list_calendar_id` with a loader callback;
+    a result loaded while an invalidation ran is returned but not stored, so a
+    slow load cannot put back data a concurrent commit just made stale.
+    """
+
+    def __init__(self, max_users: int, max_lists: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.max_users = max_users
+        self.max_lists = max_lists
+        self.ttl = ttl
+        self.clock = clock
+        # user id -> (expires at, calendar ids)
+        self._calendars: "OrderedDict[int, Tuple[float, FrozenSet[int]]]" = OrderedDict()
+        # list id -> (expires at, calendar id)
+        self._lists: "OrderedDict[int, Tuple[float, int]]" = OrderedDict()
+        # Bumped by every invalidation
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = {"calendars": 0, "lists": 0}
+        self.misses = {"calendars": 0, "lists": 0}
+
+    def _lookup(self, entries: OrderedDict, kind: str, key: int):
+        with self._lock:
+            entry = entries.get(key)
+            if entry is not None and entry[0] > self.clock():
+                entries.move_to_end(key)
+                self.hits[kind] += 1
+                return entry[1], None
+            self.misses[kind] += 1
+            return None, self._generation
+
+    def _store(self, entries: OrderedDict, max_size: int, key: int, value, generation: int) -> None:
+        with self._lock:
+            if generation != self._generation:
+                return
+            entries[key] = (self.clock() + self.ttl, value)
+            entries.move_to_end(key)
+            while len(entries) > max_size:
+                entries.popitem(last=False)
+
+    def calendar_ids(self, user_id: int, load: Callable[[], Iterable[int]]) -> FrozenSet[int]:
+        """Ids of the calendars `user_id` owns or is a member of; `load` runs on a miss."""
+        ids, generation = self._lookup(self._calendars, "calendars", user_id)
+        if ids is None:
+            ids = frozenset(load())
+            self._store(self._calendars, self.max_users, user_id, ids, generation)
+        return ids
+
+    def list_calendar_id(self, list_id: int, load: Callable[[], Optional[int]]) -> Optional[int]:
+        """Calendar id of a list, or None if it does not exist (not cached); `load` runs on a miss."""
+        calendar_id, generation = self._lookup(self._lists, "lists", list_id)
+        if calendar_id is None:
+            calendar_id = load()
+            if calendar_id is not None:
+                self._store(self._lists, self.max_lists, list_id, calendar_id, generation)
+        return calendar_id
+
+    def invalidate(
+        self,
+        *,
+        user_ids: Iterable[int] = (),
+        calendar_ids: Iterable[int] = (),
+        list_ids: Iterable[int] = (),
+    ) -> None:
+        """
+        Drop the calendar sets of `user_ids`, everything referring to the deleted
+        `calendar_ids`, and the entries of `list_ids`.
+        """
+        user_ids, calendar_ids, list_ids = set(user_ids), set(calendar_ids), set(list_ids)
+        with self._lock:
+            self._generation += 1
+            if calendar_ids:
+                user_ids.update(
+                    user_id for user_id, (_, ids) in self._calendars.items()
+                    if not ids.isdisjoint(calendar_ids)
+                )
+                list_ids.update(
+                    list_id for list_id, (_, calendar_id) in self._lists.items()
+                    if calendar_id in calendar_ids
+                )
+            for user_id in user_ids:
+                self._calendars.pop(user_id, None)
+            for list_id in list_ids:
+                self._lists.pop(list_id, None)
+
+    def stats(self) -> Dict[str, float]:
+        """Hit and miss counts and hit rates since the last `clear`."""
+        with self._lock:
+            result: Dict[str, float] = {}
+            for kind in ("calendars", "lists"):
+                hits, misses = self.hits[kind], self.misses[kind]
+                result[f"{kind}_hits"] = hits
+                result[f"{kind}_misses"] = misses
+                result[f"{kind}_hit_rate"] = hits / (hits + misses) if hits + misses else 0.0
+            return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._calendars.clear()
+            self._lists.clear()
+            self.hits = {"calendars": 0, "lists": 0}
+            self.misses = {"calendars": 0, "lists": 0}
+
+    def __len__(self) -> int:
+        return len(self._calendars) + len(self._lists)
+
+
+# Global access cache instance
+access_cache = AccessCache(
+    max_users=settings.ACCESS_CACHE_USERS,
+    max_lists=settings.ACCESS_CACHE_LISTS,
+    ttl=settings.ACCESS_CACHE_TTL_SECONDS,
+)
+
+
+# --- Invalidation from session events ---
+
+_PENDING_KEY = "access_cache_invalidations"
+
+
+def _changed_ids(obj, key: str) -> Set[int]:
+    """Ids of objects added to or removed from a relationship collection in this flush."""
+    history = attributes.get_history(obj, key, passive=attributes.PASSIVE_NO_INITIALIZE)
+    return {
+        related.id for related in (*history.added, *history.deleted)
+        if related is not None and related.id is not None
+    }
+
+
+def _collect(session: Session) -> Dict[str, Set[int]]:
+    pending = session.info.setdefault(
+        _PENDING_KEY, {"user_ids": set(), "calendar_ids": set(), "list_ids": set()}
+    )
+    for obj in session.new:
+        if isinstance(obj, Calendar):
+            pending["user_ids"].add(obj.owner_id)
+            pending["user_ids"].update(_changed_ids(obj, "members"))
+        elif isinstance(obj, User):
+            pending["user_ids"].add(obj.id)
+    for obj in session.dirty:
+        if isinstance(obj, Calendar):
+            owner = attributes.get_history(obj, "owner_id")
+            pending["user_ids"].update(value for value in (*owner.added, *owner.deleted) if value is not None)
+            pending["user_ids"].update(_changed_ids(obj, "members"))
+        elif isinstance(obj, User):
+            if _changed_ids(obj, "calendars"):
+                pending["user_ids"].add(obj.id)
+        elif isinstance(obj, List):
+            if attributes.get_history(obj, "calendar_id").has_changes():
+                pending["list_ids"].add(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, Calendar):
+            pending["calendar_ids"].add(obj.id)
+        elif isinstance(obj, User):
+            pending["user_ids"].add(obj.id)
+        elif isinstance(obj, List):
+            pending["list_ids"].add(obj.id)
+    return pending
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session: Session, flush_context) -> None:
+    _collect(session)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending and any(pending.values()):
+        access_cache.invalidate(**pending)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _after_rollback(session: Session, previous_transaction) -> None:
+    session.info.pop(_PENDING_KEY, None)
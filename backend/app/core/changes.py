@@ -0,0 +1,197 @@
+"""
+Change log behind delta sync (`GET /sync`, see app/core/sync.py).
+
+Every create, update or delete of a calendar, list, list item, vote or event
+appends a `Change` entry naming the entity and its calendar, in the same
+transaction as the write. ORM writes are logged from session events, which
+covers the CRUD methods and the objects they delete by cascade; the writes
+made with bulk statements (`bulk_create_for_calendar`, toggling a calendar's
+`no_double_booking`) call `record_bulk`. Moving events to `events_archive`
+does not change them for clients and is not logged.
+
+Membership and ownership changes, and calendar deletions, also write an entry
+addressed to each user concerned, so a user who gains or loses a calendar
+hears about it even though it is not (or no longer) among their calendars.
+
+The same hooks collect the response cache tags of every write
+(`calendar:{id}`, `list:{id}`, `user:{id}`) and invalidate them in
+app/core/response_cache.py once the transaction commits.
+
+Sync reads the log by position (app/core/sync.py), and an entry must not
+become visible below a position a client already synced past. SQLite
+serializes writers, so ids commit in order and are the positions. On
+PostgreSQL transactions commit sequence values out of order, so every entry
+records its writing transaction's id (`txid`) instead: writers never wait on
+each other, and readers only take the entries of transactions older than the
+oldest one still running.
+"""
+
+from typing import Any, Dict, Iterable, List as ListTyping, Optional, Set, Tuple
+
+from sqlalchemy import BigInteger, event, insert, literal, select, text
+from sqlalchemy.orm import Session, attributes
+
+from app.core.access import access_cache
+from app.core.response_cache import response_cache
+from app.models.calendar import Calendar
+from app.models.change import Change
+from app.models.event import Event, EventArchive
+from app.models.list import List
+from app.models.list_item import ListItem
+from app.models.user import User
+from app.models.vote import Vote
+
+# Model -> `Change.entity`
+ENTITIES = {
+    Calendar: "calendar",
+    List: "list",
+    ListItem: "list_item",
+    Vote: "vote",
+    Event: "event",
+    EventArchive: "event",
+}
+
+
+def _txid(connection) -> Optional[int]:
+    """Id of the writing transaction on PostgreSQL, None elsewhere."""
+    if connection.dialect.name == "postgresql":
+        return connection.scalar(text("SELECT txid_current()"))
+    return None
+
+
+_PENDING_KEY = "change_log_entries"
+_TAGS_KEY = "change_log_cache_tags"
+
+
+def record_bulk(db: Session, model: Any, calendar_id: int, *criteria: Any) -> None:
+    """
+    Log a change of every `model` row (a model with a `calendar_id`) of
+    calendar `calendar_id` matching `criteria`, for writes made with bulk
+    statements, which session events do not see. Runs in the caller's
+    transaction.
+    """
+    connection = db.connection()
+    txid = _txid(connection)
+    connection.execute(
+        insert(Change.__table__).from_select(
+            ["entity", "entity_id", "calendar_id", "txid"],
+            select(literal(ENTITIES[model]), model.id, model.calendar_id, literal(txid, BigInteger))
+            .where(model.calendar_id == calendar_id, *criteria),
+        )
+    )
+    db.info.setdefault(_TAGS_KEY, set()).add(f"calendar:{calendar_id}")
+
+
+# --- Logging ORM writes from session events ---
+
+
+def _values(obj: Any, key: str) -> Set[Any]:
+    """Value of a column attribute, plus the previous one if this flush changes it."""
+    history = attributes.get_history(obj, key, passive=attributes.PASSIVE_NO_INITIALIZE)
+    values = {*history.added, *history.unchanged, *history.deleted}
+    return values or {getattr(obj, key)}
+
+
+def _list_calendar_id(session: Session, list_id: int) -> Optional[int]:
+    return access_cache.list_calendar_id(
+        list_id, lambda: session.scalar(select(List.calendar_id).where(List.id == list_id))
+    )
+
+
+def _list_ids(session: Session, obj: Any) -> Set[int]:
+    """Lists a list, list item or vote belongs to, before and after this flush."""
+    if isinstance(obj, List):
+        return {obj.id}
+    if isinstance(obj, ListItem):
+        return _values(obj, "list_id")
+    if isinstance(obj, Vote):
+        item = session.get(ListItem, obj.list_item_id)
+        return {item.list_id} if item is not None else set()
+    return set()
+
+
+def _calendar_ids(session: Session, obj: Any) -> Set[int]:
+    """Calendars `obj` belongs to, before and after this flush."""
+    if isinstance(obj, Calendar):
+        return {obj.id}
+    if isinstance(obj, (ListItem, Vote)):
+        ids = {_list_calendar_id(session, list_id) for list_id in _list_ids(session, obj)}
+    else:
+        ids = _values(obj, "calendar_id")
+    return ids - {None}
+
+
+def _access_changes(obj: Any, deleted: bool) -> Iterable[Tuple[int, int]]:
+    """(calendar id, user id) of every user gaining or losing a calendar through `obj`."""
+    if isinstance(obj, Calendar):
+        if deleted:
+            users = {obj.owner_id, *(member.id for member in obj.members)}
+        else:
+            owner = attributes.get_history(obj, "owner_id")
+            members = attributes.get_history(obj, "members", passive=attributes.PASSIVE_NO_INITIALIZE)
+            users = {
+                *owner.added, *owner.deleted,
+                *(member.id for member in (*members.added, *members.deleted)),
+            }
+        return [(obj.id, user_id) for user_id in users if user_id is not None]
+    if isinstance(obj, User) and not deleted:
+        calendars = attributes.get_history(obj, "calendars", passive=attributes.PASSIVE_NO_INITIALIZE)
+        return [(calendar.id, obj.id) for calendar in (*calendars.added, *calendars.deleted)]
+    return []
+
+
+def _collect(session: Session, obj: Any, *, deleted: bool = False) -> ListTyping[Dict[str, Any]]:
+    """The change log entries of `obj`; adds its cache tags to the session's."""
+    entries = []
+    entity = ENTITIES.get(type(obj))
+    if entity is not None:
+        entries = [
+            {"entity": entity, "entity_id": obj.id, "calendar_id": calendar_id, "user_id": None}
+            for calendar_id in _calendar_ids(session, obj)
+        ]
+    entries.extend(
+        {"entity": "calendar", "entity_id": calendar_id, "calendar_id": calendar_id, "user_id": user_id}
+        for calendar_id, user_id in _access_changes(obj, deleted)
+    )
+    tags = session.info.setdefault(_TAGS_KEY, set())
+    tags.update(f"calendar:{entry['calendar_id']}" for entry in entries)
+    tags.update(f"user:{entry['user_id']}" for entry in entries if entry["user_id"] is not None)
+    tags.update(f"list:{list_id}" for list_id in _list_ids(session, obj))
+    return entries
+
+
+@event.listens_for(Session, "before_flush")
+def _before_flush(session: Session, flush_context, instances) -> None:
+    # Deleted objects are resolved to their calendars while their parents still exist
+    with session.no_autoflush:
+        pending = session.info.setdefault(_PENDING_KEY, [])
+        for obj in session.deleted:
+            pending.extend(_collect(session, obj, deleted=True))
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session: Session, flush_context) -> None:
+    entries = session.info.pop(_PENDING_KEY, [])
+    with session.no_autoflush:
+        for obj in session.new:
+            entries.extend(_collect(session, obj))
+        for obj in session.dirty:
+            if session.is_modified(obj):
+                entries.extend(_collect(session, obj))
+    if entries:
+        connection = session.connection()
+        txid = _txid(connection)
+        connection.execute(insert(Change.__table__), [{**entry, "txid": txid} for entry in entries])
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    tags = session.info.pop(_TAGS_KEY, None)
+    if tags:
+        response_cache.invalidate(tags)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _after_rollback(session: Session, previous_transaction) -> None:
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_TAGS_KEY, None)
@@ -0,0 +1,86 @@
+"""
+Conditional GET: strong ETags and Last-Modified from row versions.
+
+Single resources are validated by their table, id and `version` column.
+Collections are validated by a stamp of their whole scope (see
+`CRUDBase.collection_stamp`): row count, highest id, sum of versions and
+latest modification time, which change with any insert, update or delete in
+the scope. Where a row can be deleted and another inserted in the same second
+(SQLite hands a deleted highest id out again), the scope can add a checksum of
+the column that differs between its rows, e.g. the voter of an item's votes. The stamp is
+one aggregate query run before the page is loaded, so a matching
+`If-None-Match` answers 304 without reading or serializing the rows.
+"""
+
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from hashlib import blake2b
+from typing import Any, Dict, NamedTuple, Optional
+
+from fastapi import Request, Response
+
+
+class CollectionStamp(NamedTuple):
+    """Aggregate over the rows in a collection's scope."""
+    count: int
+    max_id: Optional[int]
+    # Zero for tables without a version column
+    version_sum: int
+    last_modified: Optional[datetime]
+    # Sum of the scope's checksum column, zero without one
+    checksum: int = 0
+
+
+def make_etag(*parts: Any) -> str:
+    """A strong entity tag derived from `parts`."""
+    digest = blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+class Validators(NamedTuple):
+    """The ETag and Last-Modified of a response."""
+    etag: str
+    last_modified: Optional[datetime] = None
+
+    @classmethod
+    def for_row(cls, obj: Any, *extra: Any) -> "Validators":
+        """Validators of one versioned row; `extra` is mixed into the ETag."""
+        return cls(make_etag(type(obj).__tablename__, obj.id, obj.version, *extra), obj.updated_at)
+
+    @classmethod
+    def for_collection(cls, request: Request, *stamps: CollectionStamp) -> "Validators":
+        """
+        Validators of a collection response: its path and query string (the
+        page, fieldset...) and the stamps of the tables it reads.
+        """
+        modified = [stamp.last_modified for stamp in stamps if stamp.last_modified is not None]
+        return cls(
+            make_etag(request.url.path, str(request.url.query), *(tuple(stamp) for stamp in stamps)),
+            max(map(_as_utc, modified)) if modified else None,
+        )
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        headers = {"ETag": self.etag}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(_as_utc(self.last_modified), usegmt=True)
+        return headers
+
+    def matches(self, request: Request) -> bool:
+        """Whether the request's If-None-Match (weak comparison) lists our ETag."""
+        header = request.headers.get("if-none-match")
+        if not header:
+            return False
+        candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+        return "*" in candidates or self.etag in candidates
+
+    def not_modified(self, request: Request) -> Optional[Response]:
+        """The 304 response to return if the client already has this version, else None."""
+        if self.matches(request):
+            return Response(status_code=304, headers=self.headers)
+        return None
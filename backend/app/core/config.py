@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -20,6 +22,99 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 days
 
+    """Event query settings."""
+    # Longest event allowed (end minus start); the non-PostgreSQL range query fallback
+    # relies on it to find events that start before the requested window.
+    EVENT_MAX_DURATION_DAYS: int = 31
+    # Number of parsed recurrence rules kept in memory
+    RECURRENCE_CACHE_SIZE: int = 1024
+    # Limits on recurrence rules (FREQ is at most DAILY): occurrences of a COUNT or
+    # UNTIL series, and how far past the start UNTIL may be
+    RECURRENCE_MAX_OCCURRENCES: int = 5000
+    RECURRENCE_MAX_YEARS: int = 10
+    # Events that ended more than this many days ago are moved to `events_archive`
+    # by `python -m app.jobs.event_maintenance archive`; None disables archiving
+    EVENT_ARCHIVE_AFTER_DAYS: Optional[int] = None
+    # Number of cached (calendar, granularity, time zone, bucket) event counts
+    DENSITY_CACHE_SIZE: int = 8192
+
+    """Authorization cache settings."""
+    # Users whose accessible calendar ids are kept in memory
+    ACCESS_CACHE_USERS: int = 10000
+    # Cached list id -> calendar id entries
+    ACCESS_CACHE_LISTS: int = 50000
+    # Upper bound on how long a membership change made by another worker can go unseen
+    ACCESS_CACHE_TTL_SECONDS: float = 30.0
+
+    """Response cache settings."""
+    # Cache hot list GETs (calendars, a calendar's events, a list's items with votes)
+    RESPONSE_CACHE_ENABLED: bool = False
+    # "memory" (per process) or "redis" (shared by every worker, needs the redis package);
+    # with more than one worker use "redis", or workers serve each other's stale data
+    RESPONSE_CACHE_BACKEND: str = "memory"
+    RESPONSE_CACHE_REDIS_URL: Optional[str] = None
+    # Bounds of the in-process backend
+    RESPONSE_CACHE_MAX_ENTRIES: int = 10000
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    # Upper bound on how long a write made by another worker (memory backend) or by bulk SQL goes unseen
+    RESPONSE_CACHE_TTL_SECONDS: float = 30.0
+    # Let identical concurrent reads of the cached endpoints share one query and render
+    SINGLE_FLIGHT_ENABLED: bool = True
+
+    """Sync settings."""
+    # Change log entries older than this are deleted by `python -m app.jobs.change_log prune`;
+    # clients that have not synced for longer reload their data in full
+    SYNC_RETENTION_DAYS: int = 30
+
+    """Metrics settings."""
+    # Record request, rate limiter and password hashing metrics
+    METRICS_ENABLED: bool = True
+    # Serve them at GET /metrics (unauthenticated unless METRICS_TOKEN is set)
+    METRICS_ENDPOINT: bool = False
+    # When set, scrapers must send `Authorization: Bearer <token>`
+    METRICS_TOKEN: Optional[str] = None
+
+    """Tracing settings."""
+    # Share of requests traced (0 disables, 1 traces all); when above 0 or an exporter is set,
+    # an incoming traceparent's sampled flag wins
+    TRACING_SAMPLE_RATE: float = 0.0
+    # Where sampled spans are exported as OTLP/JSON: None (only buffered), "file" or "otlp"
+    TRACING_EXPORTER: Optional[str] = None
+    TRACING_FILE_PATH: Optional[str] = None
+    # OTLP/HTTP traces endpoint of a collector, e.g. http://localhost:4318/v1/traces
+    TRACING_OTLP_ENDPOINT: Optional[str] = None
+    # Newest finished spans kept in memory
+    TRACING_BUFFER_SIZE: int = 2000
+    # Serve the buffered spans at GET /debug/traces (unauthenticated, for development)
+    TRACING_DEBUG_ENDPOINT: bool = False
+
+    """Request profiling settings."""
+    # Install the profiling middleware; when off it is not in the stack at all
+    PROFILING_ENABLED: bool = False
+    # Requests sending this value in X-Profile-Token are profiled; unset disables the header
+    PROFILING_TOKEN: Optional[str] = None
+    # Fraction of requests profiled without the header, limited to PROFILING_ROUTES templates when set
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_ROUTES: list[str] = []
+    # "sample" (folded stacks for flamegraphs) or "cprofile" (pstats)
+    PROFILING_MODE: str = "sample"
+    PROFILING_INTERVAL_MS: float = 2.0
+    # Profiles are written here; only the newest PROFILING_MAX_FILES are kept
+    PROFILING_DIR: str = "blob/profiles"
+    PROFILING_MAX_FILES: int = 50
+
+    """Reminder settings."""
+    # Run the reminder scheduler in this process; enable it in exactly one worker
+    REMINDERS_ENABLED: bool = False
+    # How long before an event starts its reminder fires
+    REMINDER_LEAD_MINUTES: int = 10
+    # How far ahead reminders are held in memory; the window is reloaded every half
+    # horizon, which is also how late writes from other workers are picked up
+    REMINDER_HORIZON_HOURS: int = 24
+    # Where due reminders go: "sse" (GET /events/reminders/stream), "queue" or "webhook"
+    REMINDER_SINK: str = "sse"
+    REMINDER_WEBHOOK_URL: Optional[str] = None
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -0,0 +1,146 @@
+"""
+Per-bucket event counts for calendar heatmaps (month and year views).
+
+Buckets are calendar days, ISO weeks (starting Monday) or months in the
+caller's time zone, so a bucket is a wall-clock span that may be 23 or 25 hours
+long around DST changes. An event is counted in the bucket its start falls in.
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.recurrence import as_utc
+
+GRANULARITIES = ("day", "week", "month")
+
+# (local bucket start, UTC start, UTC end)
+Bucket = Tuple[datetime, datetime, datetime]
+
+
+def _floor(day: date, granularity: str) -> date:
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _next(day: date, granularity: str) -> date:
+    if granularity == "week":
+        return day + timedelta(weeks=1)
+    if granularity == "month":
+        return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return day + timedelta(days=1)
+
+
+def bucket_of(value: datetime, granularity: str, zone) -> datetime:
+    """Local start of the bucket containing `value`."""
+    day = _floor(as_utc(value).astimezone(zone).date(), granularity)
+    return datetime(day.year, day.month, day.day, tzinfo=zone)
+
+
+def iter_buckets(start: datetime, end: datetime, granularity: str, zone) -> Iterator[Bucket]:
+    """Yield the buckets covering [start, end), the first one possibly starting before `start`."""
+    end = as_utc(end)
+    day = bucket_of(start, granularity, zone).date()
+    while True:
+        local = datetime(day.year, day.month, day.day, tzinfo=zone)
+        utc_start = local.astimezone(timezone.utc)
+        if utc_start >= end:
+            return
+        day = _next(day, granularity)
+        utc_end = datetime(day.year, day.month, day.day, tzinfo=zone).astimezone(timezone.utc)
+        yield local, utc_start, utc_end
+
+
+class DensityCache:
+    """
+    Bounded LRU cache of event counts keyed by (calendar, granularity, time zone,
+    bucket). Writes to a calendar drop the cached buckets containing the changed
+    start time, in every granularity and time zone, or the whole calendar when
+    the change can touch any bucket (e.g. a recurring series).
+
+    The cache is per process, so with several workers a write is only seen by
+    other workers once their entry ages out; counts are for display only.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        # key -> (UTC bucket end, count); the UTC bucket start is part of the key
+        self._counts: "OrderedDict[tuple, Tuple[datetime, int]]" = OrderedDict()
+        # calendar id -> its keys in `_counts`, so invalidation never scans other calendars
+        self._keys: Dict[int, Set[tuple]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, calendar_id: int, granularity: str, tz: str, utc_start: datetime) -> Optional[int]:
+        key = (calendar_id, granularity, tz, utc_start)
+        with self._lock:
+            entry = self._counts.get(key)
+            if entry is None:
+                return None
+            self._counts.move_to_end(key)
+            return entry[1]
+
+    def put_many(
+        self, calendar_id: int, granularity: str, tz: str, counts: Dict[Tuple[datetime, datetime], int]
+    ) -> None:
+        """Store counts given as {(UTC start, UTC end): count}."""
+        with self._lock:
+            keys = self._keys.setdefault(calendar_id, set())
+            for (utc_start, utc_end), count in counts.items():
+                key = (calendar_id, granularity, tz, utc_start)
+                self._counts[key] = (utc_end, count)
+                self._counts.move_to_end(key)
+                keys.add(key)
+            while len(self._counts) > self.max_size:
+                key, _ = self._counts.popitem(last=False)
+                self._discard(key)
+
+    def invalidate(self, calendar_id: int, *times: Optional[datetime]) -> None:
+        """
+        Drop the buckets of a calendar containing any of `times`, or every bucket
+        of the calendar if no time is given.
+        """
+        instants = [as_utc(value) for value in times if value is not None]
+        with self._lock:
+            stale = [
+                key for key in self._keys.get(calendar_id, ())
+                if not instants or any(
+                    key[3] <= instant < self._counts[key][0] for instant in instants
+                )
+            ]
+            for key in stale:
+                del self._counts[key]
+                self._discard(key)
+
+    def _discard(self, key: tuple) -> None:
+        keys = self._keys.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys[key[0]]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._keys.clear()
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+
+# Global density cache instance
+density_cache = DensityCache(max_size=settings.DENSITY_CACHE_SIZE)
+
+
+def add_to_buckets(
+    counts: Dict[datetime, int], starts: Iterable[datetime], granularity: str, zone
+) -> None:
+    """Count start times into `counts` (keyed by local bucket start), skipping other buckets."""
+    for value in starts:
+        local = bucket_of(value, granularity, zone)
+        if local in counts:
+            counts[local] += 1
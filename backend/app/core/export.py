@@ -0,0 +1,91 @@
+"""
+Streaming NDJSON export of a whole calendar.
+
+The export is one JSON object per line, `{"type": ..., "data": ...}`: the
+calendar first, then its lists, list items, votes and events (archived ones
+included, series unexpanded), each in the shape of its read schema. Every
+table is read through a server-side cursor `batch_size` rows at a time and
+each batch becomes one chunk of output, so memory use depends on the batch
+size and not on the size of the calendar.
+
+The chunks are produced lazily: `StreamingResponse` only asks for the next
+one once the previous one has been sent, so a slow client slows the cursor
+down instead of making the server buffer rows.
+"""
+
+import zlib
+from itertools import islice
+from typing import Any, Iterable, Iterator
+
+import orjson
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.core.serialization import get_serializer, schema_columns
+from app.models.event import Event
+from app.models.list import List
+from app.models.list_item import ListItem
+from app.models.vote import Vote
+from app.schemas import calendar as calendar_schemas
+from app.schemas import event as event_schemas
+from app.schemas import list as list_schemas
+from app.schemas import list_item as list_item_schemas
+from app.schemas import vote as vote_schemas
+
+# Rows fetched from the cursor and encoded per chunk
+BATCH_SIZE = 1000
+
+
+def _lines(kind: str, schema: Any, rows: Iterable[Any], batch_size: int) -> Iterator[bytes]:
+    """Encode rows as NDJSON records of `kind`, one chunk per batch."""
+    serializer = get_serializer(schema)
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield b"".join(
+            orjson.dumps({"type": kind, "data": data}, option=orjson.OPT_UTC_Z) + b"\n"
+            for data in serializer.many(batch)
+        )
+
+
+def stream_calendar(
+    db: Session, calendar_id: int, *, batch_size: int = BATCH_SIZE
+) -> Iterator[bytes]:
+    """
+    Yield the NDJSON export of a calendar in chunks of up to `batch_size`
+    records. `db` must be a fresh session that stays open until the iterator
+    is exhausted.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        # One snapshot for every table, so votes never refer to items the export lacks
+        db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+
+    calendar = crud.calendar.get(db, id=calendar_id, with_members=False)
+    header = calendar_schemas.CalendarSummary.model_validate(calendar).model_dump(mode="json")
+    yield orjson.dumps({"type": "calendar", "data": header}) + b"\n"
+
+    for kind, schema, model, crud_obj in (
+        ("list", list_schemas.List, List, crud.list_crud),
+        ("list_item", list_item_schemas.ListItem, ListItem, crud.list_item),
+        ("vote", vote_schemas.Vote, Vote, crud.vote),
+    ):
+        rows = crud_obj.stream_by_calendar(
+            db, calendar_id=calendar_id, columns=schema_columns(schema, model), batch_size=batch_size
+        )
+        yield from _lines(kind, schema, rows, batch_size)
+
+    fields = [column.key for column in schema_columns(event_schemas.Event, Event)]
+    events = crud.event.stream_by_calendar(db, calendar_id=calendar_id, fields=fields, batch_size=batch_size)
+    yield from _lines("event", event_schemas.Event, events, batch_size)
+
+
+def gzipped(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Compress a stream of chunks into one gzip member, chunk by chunk."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
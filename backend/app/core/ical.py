@@ -0,0 +1,231 @@
+"""
+Streaming iCalendar (RFC 5545) export and incremental import of events.
+
+Only the VEVENT properties DateTree stores are handled: SUMMARY, DESCRIPTION,
+DTSTART, DTEND, RRULE and EXDATE. Everything else is ignored on import.
+"""
+
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from app.core.recurrence import as_utc, check_duration, normalize_exceptions, parse_rule, series_end
+
+PRODID = "-//DateTree//DateTree Calendar//EN"
+CRLF = "\r\n"
+
+
+# --- Export ---
+
+def _escape(text: str) -> str:
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Fold a content line to 75 octets per RFC 5545 section 3.1."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + CRLF
+    parts = []
+    limit = 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        # Never split a multi-byte UTF-8 sequence
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode("utf-8"))
+        encoded = encoded[cut:]
+        limit = 74  # continuation lines start with a space
+    return (CRLF + " ").join(parts) + CRLF
+
+
+def _format_utc(value: datetime) -> str:
+    return as_utc(value).strftime("%Y%m%dT%H%M%SZ")
+
+
+def serialize_event(event: Any, dtstamp: str) -> str:
+    """Render one event as a VEVENT block."""
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:event-{event.id}@datetree",
+        f"DTSTAMP:{dtstamp}",
+        f"DTSTART:{_format_utc(event.start_time)}",
+    ]
+    if event.end_time is not None:
+        lines.append(f"DTEND:{_format_utc(event.end_time)}")
+    lines.append(f"SUMMARY:{_escape(event.title)}")
+    if event.description:
+        lines.append(f"DESCRIPTION:{_escape(event.description)}")
+    if event.recurrence_rule:
+        lines.append(f"RRULE:{event.recurrence_rule.split(':', 1)[-1]}")
+        for value in event.recurrence_exceptions or ():
+            lines.append(f"EXDATE:{_format_utc(datetime.fromisoformat(value))}")
+    lines.append("END:VEVENT")
+    return "".join(_fold(line) for line in lines)
+
+
+def serialize_calendar(events: Iterable[Any], *, name: str) -> Iterator[str]:
+    """
+    Lazily render a VCALENDAR, one chunk per event, so the caller can stream
+    rows straight from a database cursor.
+    """
+    dtstamp = _format_utc(datetime.now(timezone.utc))
+    yield "".join(_fold(line) for line in (
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        f"X-WR-CALNAME:{_escape(name)}",
+    ))
+    for event in events:
+        yield serialize_event(event, dtstamp)
+    yield "END:VCALENDAR" + CRLF
+
+
+def chunked(parts: Iterable[str], size: int = 64 * 1024) -> Iterator[str]:
+    """Coalesce small string parts into chunks of roughly `size` characters."""
+    buffer: List[str] = []
+    buffered = 0
+    for part in parts:
+        buffer.append(part)
+        buffered += len(part)
+        if buffered >= size:
+            yield "".join(buffer)
+            buffer, buffered = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+# --- Import ---
+
+def _unfold(lines: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    """Join folded content lines lazily; yields (line number, logical line)."""
+    current: Optional[str] = None
+    start = 0
+    for number, raw in enumerate(lines, start=1):
+        line = raw.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current:
+            yield start, current
+        current, start = line, number
+    if current:
+        yield start, current
+
+
+def _unescape(text: str) -> str:
+    if "\\" not in text:
+        return text
+    out = []
+    chars = iter(text)
+    for char in chars:
+        if char == "\\":
+            nxt = next(chars, "")
+            out.append("\n" if nxt in ("n", "N") else nxt)
+        else:
+            out.append(char)
+    return "".join(out)
+
+
+def _split_property(line: str) -> Tuple[str, Dict[str, str], str]:
+    head, _, value = line.partition(":")
+    name, *raw_params = head.split(";")
+    params = {}
+    for param in raw_params:
+        key, _, param_value = param.partition("=")
+        params[key.upper()] = param_value.strip('"')
+    return name.upper(), params, value
+
+
+def _parse_datetime(value: str, params: Dict[str, str]) -> datetime:
+    """Parse a DATE or DATE-TIME value into an aware UTC datetime."""
+    value = value.strip()
+    if params.get("VALUE") == "DATE" or len(value) == 8:
+        day = date(int(value[:4]), int(value[4:6]), int(value[6:8]))
+        return datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+    if len(value) not in (15, 16) or value[8] != "T":
+        raise ValueError(f"Invalid date-time {value!r}")
+    parsed = datetime(
+        int(value[0:4]), int(value[4:6]), int(value[6:8]),
+        int(value[9:11]), int(value[11:13]), int(value[13:15]),
+    )
+    if value.endswith("Z"):
+        return parsed.replace(tzinfo=timezone.utc)
+    if "TZID" in params:
+        try:
+            return parsed.replace(tzinfo=ZoneInfo(params["TZID"])).astimezone(timezone.utc)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"Unknown time zone {params['TZID']!r}")
+    return parsed.replace(tzinfo=timezone.utc)  # floating time, read as UTC
+
+
+def parse_events(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Incrementally parse VEVENTs from iCalendar text lines.
+
+    Yields one dict of `Event` column values per VEVENT, without calendar or
+    creator. Raises ValueError (with the line number) on malformed input.
+    """
+    event: Optional[Dict[str, Any]] = None
+    exceptions: List[datetime] = []
+    depth = 0  # nesting inside the VEVENT (VALARM and friends are skipped)
+    event_line = 0
+    for number, line in _unfold(lines):
+        try:
+            name, params, value = _split_property(line)
+            if name == "BEGIN":
+                if event is not None:
+                    depth += 1
+                elif value.upper() == "VEVENT":
+                    event, exceptions, depth, event_line = {}, [], 0, number
+                continue
+            if name == "END":
+                if event is not None and depth:
+                    depth -= 1
+                elif event is not None and value.upper() == "VEVENT":
+                    yield _finish_event(event, exceptions)
+                    event = None
+                continue
+            if event is None or depth:
+                continue
+            if name == "SUMMARY":
+                event["title"] = _unescape(value)
+            elif name == "DESCRIPTION":
+                event["description"] = _unescape(value)
+            elif name == "DTSTART":
+                event["start_time"] = _parse_datetime(value, params)
+            elif name == "DTEND":
+                event["end_time"] = _parse_datetime(value, params)
+            elif name == "RRULE":
+                event["recurrence_rule"] = value.strip()
+            elif name == "EXDATE":
+                exceptions.extend(_parse_datetime(v, params) for v in value.split(","))
+        except ValueError as e:
+            raise ValueError(f"line {number}: {e}")
+    if event is not None:
+        raise ValueError(f"line {event_line}: VEVENT is never closed")
+
+
+def _finish_event(event: Dict[str, Any], exceptions: List[datetime]) -> Dict[str, Any]:
+    if "start_time" not in event:
+        raise ValueError("VEVENT without DTSTART")
+    check_duration(event["start_time"], event.get("end_time"))
+    rule = event.get("recurrence_rule")
+    if rule:
+        parse_rule(rule, event["start_time"])
+    return {
+        "title": event.get("title") or "(no title)",
+        "description": event.get("description"),
+        "start_time": event["start_time"],
+        "end_time": event.get("end_time"),
+        "recurrence_rule": rule,
+        "recurrence_exceptions": normalize_exceptions(exceptions) if rule and exceptions else None,
+        "recurrence_end": series_end(rule, event["start_time"], event.get("end_time")),
+    }
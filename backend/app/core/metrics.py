@@ -0,0 +1,322 @@
+"""
+Process metrics in the Prometheus text format, served at GET /metrics.
+
+Counters and histograms are recorded on request paths, so recording takes no
+lock: every thread writes to its own shard (a dict of label values -> counts
+that only that thread mutates) and a scrape sums the shards. A thread takes
+the registry lock once, to register its shard. Scrapes copy each shard's
+dict, an atomic operation for a plain dict, and may read a count one
+observation behind, which is fine for monitoring.
+
+Gauges are read when scraped, from callbacks registered with
+`Registry.gauge_callback` (pool occupancy, cache statistics...), so they cost
+nothing between scrapes.
+
+Recorded here (see `instrument`): per-route request latency and status
+counts (`MetricsMiddleware`), rate limiter rejections per policy, bcrypt
+hashing in flight and duration; read at scrape time: SQLAlchemy pool
+occupancy, rate limiter tracked keys, the worker threadpool, and access
+cache, response cache and single-flight statistics.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List as ListTyping, Optional, Sequence, Tuple
+
+from anyio import to_thread
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Request latency buckets in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[str, ...]
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class _Metric:
+    """A metric whose values are summed over per-thread shards."""
+
+    kind = ""
+
+    def __init__(self, registry: "Registry", name: str, documentation: str, labelnames: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._registry = registry
+        self._local = threading.local()
+        self._shards: ListTyping[Dict[Labels, list]] = []
+
+    def _shard(self) -> Dict[Labels, list]:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._registry.lock:
+                self._shards.append(shard)
+        return shard
+
+    def _merged(self) -> Dict[Labels, list]:
+        merged: Dict[Labels, list] = {}
+        with self._registry.lock:
+            shards = list(self._shards)
+        for shard in shards:
+            for labels, values in shard.copy().items():
+                total = merged.get(labels)
+                if total is None:
+                    merged[labels] = list(values)
+                else:
+                    for index, value in enumerate(values):
+                        total[index] += value
+        return merged
+
+    def samples(self) -> Iterable[Sample]:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        with self._registry.lock:
+            for shard in self._shards:
+                shard.clear()
+
+
+class Counter(_Metric):
+    """A monotonically increasing count per label values."""
+
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        shard = self._shard()
+        values = shard.get(labels)
+        if values is None:
+            shard[labels] = [amount]
+        else:
+            values[0] += amount
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, (value,) in sorted(self._merged().items()):
+            yield self.name, dict(zip(self.labelnames, labels)), value
+
+
+class Gauge(Counter):
+    """An up and down count kept with `inc` and `dec`, such as work in flight."""
+
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    """Observations per label values, counted in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, registry: "Registry", name: str, documentation: str, labelnames: Sequence[str],
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels: str) -> None:
+        shard = self._shard()
+        values = shard.get(labels)
+        if values is None:
+            # Per bucket counts (the last one is +Inf), then sum and count
+            values = shard[labels] = [0] * (len(self.buckets) + 3)
+        values[bisect_left(self.buckets, value)] += 1
+        values[-2] += value
+        values[-1] += 1
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, values in sorted(self._merged().items()):
+            names = dict(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), values):
+                cumulative += count
+                yield f"{self.name}_bucket", {**names, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_sum", names, values[-2]
+            yield f"{self.name}_count", names, values[-1]
+
+
+class _GaugeCallback:
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, read: Callable[[], Iterable[Tuple[Dict[str, str], float]]]):
+        self.name = name
+        self.documentation = documentation
+        self.read = read
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, value in self.read():
+            yield self.name, labels, value
+
+    def clear(self) -> None:
+        pass
+
+
+class Registry:
+    """The metrics of this process, rendered by `expose`."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._metrics: Dict[str, object] = {}
+
+    def _add(self, metric):
+        with self.lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(self, name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(self, name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._add(Histogram(self, name, documentation, labelnames, buckets))
+
+    def gauge_callback(self, name: str, documentation: str,
+                       read: Callable[[], Iterable[Tuple[Dict[str, str], float]]]) -> None:
+        """Register a gauge whose samples `read` returns as (labels, value) pairs at scrape time."""
+        self._add(_GaugeCallback(name, documentation, read))
+
+    def expose(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        with self.lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        """Reset recorded counts (tests)."""
+        with self.lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.clear()
+
+
+registry = Registry()
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "Time to serve a request, by route template.", ("method", "route")
+)
+http_requests = registry.counter(
+    "http_requests_total", "Requests served, by route template and status code.", ("method", "route", "status")
+)
+rate_limit_rejections = registry.counter(
+    "rate_limit_rejections_total", "Requests rejected with 429, by rate limit policy.", ("policy",)
+)
+password_hashing_in_flight = registry.gauge(
+    "password_hashing_in_flight", "bcrypt hash and verify calls running or waiting for a CPU."
+)
+password_hashing_duration = registry.histogram(
+    "password_hashing_duration_seconds", "Time spent in a bcrypt hash or verify call.", ("operation",),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording each HTTP request's latency and status under
+    the template of the route that served it ("unmatched" for 404s without a
+    route), so ids in paths do not multiply the series.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            template = getattr(route, "path_format", None) or "unmatched"
+            http_request_duration.observe(time.perf_counter() - start, scope["method"], template)
+            http_requests.inc(scope["method"], template, str(status))
+
+
+def _stats_gauge(name: str, documentation: str, stats: Callable[[], Dict[str, float]],
+                 keys: Optional[Sequence[str]] = None) -> None:
+    """Expose the entries of a `stats()` dict as one gauge labelled by entry."""
+    def read():
+        values = stats()
+        return [({"stat": key}, value) for key, value in values.items() if keys is None or key in keys]
+    registry.gauge_callback(name, documentation, read)
+
+
+def instrument(engine, rate_limiter) -> None:
+    """Register the scrape-time gauges of the application's shared components."""
+    from app.core.access import access_cache
+    from app.core.response_cache import response_cache
+    from app.core.single_flight import single_flight
+
+    def pool():
+        pool = engine.pool
+        # Pools without a fixed size (SQLite memory, NullPool) have none of these
+        if not all(hasattr(pool, name) for name in ("size", "checkedout", "checkedin", "overflow")):
+            return []
+        return [
+            ({"state": "size"}, pool.size()),
+            ({"state": "checked_out"}, pool.checkedout()),
+            ({"state": "checked_in"}, pool.checkedin()),
+            # Counted from -size by SQLAlchemy; connections opened past the pool size
+            ({"state": "overflow"}, max(pool.overflow(), 0)),
+        ]
+
+    def threadpool():
+        # Sync endpoints and dependencies run in AnyIO's worker threads; only
+        # readable from the event loop, so scrapes from elsewhere skip it
+        try:
+            statistics = to_thread.current_default_thread_limiter().statistics()
+        except RuntimeError:
+            return []
+        return [
+            ({"state": "busy"}, statistics.borrowed_tokens),
+            ({"state": "limit"}, statistics.total_tokens),
+            ({"state": "waiting"}, statistics.tasks_waiting),
+        ]
+
+    registry.gauge_callback("db_pool_connections", "SQLAlchemy connection pool occupancy.", pool)
+    registry.gauge_callback("threadpool_threads", "Worker threads in use, their limit and tasks queued for one.", threadpool)
+    registry.gauge_callback(
+        "rate_limit_tracked_keys", "Client identifiers held by the in-memory rate limiter.",
+        lambda: [({}, rate_limiter.tracked_keys())],
+    )
+    _stats_gauge("access_cache", "Authorization cache hit and miss counts and hit rates.", access_cache.stats)
+    _stats_gauge("response_cache", "Response cache hits, misses, hit rate, invalidations and size.", response_cache.stats)
+    _stats_gauge("single_flight", "Coalesced read calls per route and calls in flight.", single_flight.stats)
@@ -0,0 +1,233 @@
+"""
+On-demand request profiling.
+
+`ProfilingMiddleware` profiles a request when it carries the
+`X-Profile-Token` header with the PROFILING_TOKEN value, or when it is picked
+by the sampling rule (probability PROFILING_SAMPLE_RATE, restricted to the
+route templates in PROFILING_ROUTES when set). The profile is written to
+PROFILING_DIR, named after the time, method, route template and status, and
+only the newest PROFILING_MAX_FILES profiles are kept. Requests profiled
+through the header get the file name back in `X-Profile`.
+
+Modes (PROFILING_MODE):
+
+- "sample": a statistical profiler. A thread reads the stacks of the busy
+  threads every PROFILING_INTERVAL_MS (the event loop and the worker threads
+  running sync endpoints and dependencies) and writes them in the folded
+  format (`frame;frame;frame count`) read by flamegraph.pl and speedscope.
+- "cprofile": the deterministic profiler, written as pstats. It sees the
+  worker threads on Python 3.12+ only; before that, only the event loop.
+
+One request is profiled at a time, so a profile holds no other profiled
+request; others run unprofiled meanwhile. Threads are sampled as a whole, so
+on a busy worker a "sample" profile also shows other requests' work.
+
+The middleware is only installed when PROFILING_ENABLED is set, so a disabled
+profiler costs nothing.
+"""
+
+import cProfile
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Callable, Collection, Optional, Sequence
+
+from anyio import to_thread
+from starlette.routing import BaseRoute, Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+TOKEN_HEADER = b"x-profile-token"
+EXTENSIONS = {"sample": ".folded", "cprofile": ".pstats"}
+
+# Innermost frames of threads waiting for work, left out of samples
+_IDLE = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+}
+
+
+def _frame_name(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Counts the stacks of busy threads, sampled by a daemon thread until `stop`."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        while not self._stop.wait(self.interval):
+            self.samples += 1
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                code = frame.f_code
+                if (os.path.basename(code.co_filename), code.co_name) in _IDLE:
+                    continue
+                frames = []
+                while frame is not None:
+                    frames.append(_frame_name(frame.f_code))
+                    frame = frame.f_back
+                if ident not in names:
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+                frames.append(names.get(ident, f"thread-{ident}"))
+                self.stacks[";".join(reversed(frames))] += 1
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "_", text).strip("_") or "root"
+
+
+def prune(directory: str, keep: int) -> None:
+    """Delete all but the newest `keep` profiles in `directory`."""
+    profiles = sorted(
+        (entry for entry in os.scandir(directory) if entry.name.endswith(tuple(EXTENSIONS.values()))),
+        key=lambda entry: entry.name,
+    )
+    for entry in profiles[:max(len(profiles) - keep, 0)]:
+        try:
+            os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling requests picked by the debug header or the sampling rule."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        routes: Sequence[BaseRoute] = (),
+        directory: Optional[str] = None,
+        token: Optional[str] = None,
+        sample_rate: Optional[float] = None,
+        route_templates: Optional[Collection[str]] = None,
+        mode: Optional[str] = None,
+        interval: Optional[float] = None,
+        max_files: Optional[int] = None,
+    ):
+        self.app = app
+        self.routes = routes
+        self.directory = directory or settings.PROFILING_DIR
+        self.token = (token if token is not None else settings.PROFILING_TOKEN or "").encode()
+        self.sample_rate = sample_rate if sample_rate is not None else settings.PROFILING_SAMPLE_RATE
+        self.route_templates = set(route_templates if route_templates is not None else settings.PROFILING_ROUTES)
+        self.mode = mode or settings.PROFILING_MODE
+        if self.mode not in EXTENSIONS:
+            raise ValueError(f"Unknown PROFILING_MODE {self.mode!r}, use one of {sorted(EXTENSIONS)}")
+        self.interval = interval if interval is not None else settings.PROFILING_INTERVAL_MS / 1000
+        self.max_files = max_files if max_files is not None else settings.PROFILING_MAX_FILES
+        self._busy = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _authorized(self, scope: Scope) -> bool:
+        if not self.token:
+            return False
+        for name, value in scope["headers"]:
+            if name == TOKEN_HEADER:
+                return hmac.compare_digest(value, self.token)
+        return False
+
+    def _sampled(self, scope: Scope) -> bool:
+        if not (self.sample_rate > 0 and random.random() < self.sample_rate):
+            return False
+        if not self.route_templates:
+            return True
+        for route in self.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return getattr(route, "path_format", None) in self.route_templates
+        return False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        authorized = self._authorized(scope)
+        if not (authorized or self._sampled(scope)) or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self._profile(scope, receive, send, report=authorized)
+        finally:
+            self._busy.release()
+
+    async def _profile(self, scope: Scope, receive: Receive, send: Send, *, report: bool) -> None:
+        started = datetime.now(timezone.utc)
+        status = 500
+        name_parts = [started.strftime("%Y%m%dT%H%M%S.%f"), scope["method"]]
+        # Known once routing ran; the file name is announced before the body is sent
+        file_name: Optional[str] = None
+
+        def name_file() -> str:
+            template = getattr(scope.get("route"), "path_format", None) or "unmatched"
+            return "-".join([*name_parts, _slug(template), str(status)]) + EXTENSIONS[self.mode]
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, file_name
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                file_name = name_file()
+                if report:
+                    message = {**message, "headers": [*message.get("headers", []), (b"x-profile", file_name.encode())]}
+            await send(message)
+
+        start = time.perf_counter()
+        if self.mode == "cprofile":
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                profiler.disable()
+                path = os.path.join(self.directory, file_name or name_file())
+                await to_thread.run_sync(self._write, lambda: profiler.dump_stats(path))
+            return
+
+        sampler = StackSampler(self.interval)
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sampler.stop()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            path = os.path.join(self.directory, file_name or name_file())
+
+            def write() -> None:
+                with open(path, "w", encoding="utf-8") as file:
+                    file.write(f"# {scope['method']} {scope['path']} {elapsed_ms:.1f} ms, {sampler.samples} samples\n")
+                    file.write(sampler.folded())
+
+            await to_thread.run_sync(self._write, write)
+
+    def _write(self, write: Callable[[], None]) -> None:
+        write()
+        prune(self.directory, self.max_files)
@@ -8,6 +8,8 @@ from fastapi import Request, HTTPException, status
 from collections import defaultdict
 import threading
 
+from app.core.metrics import rate_limit_rejections
+
 
 class InMemoryRateLimiter:
     """
@@ -55,6 +57,10 @@ class InMemoryRateLimiter:
             request_times.append(current_time)
             return True
     
+    def tracked_keys(self) -> int:
+        """Number of identifiers with request times held in memory."""
+        return len(self._requests)
+
     def get_remaining(
         self, 
         identifier: str, 
@@ -93,13 +99,14 @@ def get_client_identifier(request: Request) -> str:
     return client_host
 
 
-def rate_limit(max_requests: int = 5, window_seconds: int = 60):
+def rate_limit(max_requests: int = 5, window_seconds: int = 60, policy: str = "default"):
     """
     Rate limiting decorator for FastAPI endpoints.
     
     Args:
         max_requests: Maximum number of requests allowed in the window
         window_seconds: Time window in seconds
+        policy: Name rejections are counted under in the metrics
     """
     def decorator(func):
         def wrapper(*args, **kwargs):
@@ -123,6 +130,7 @@ def rate_limit(max_requests: int = 5, window_seconds: int = 60):
             
             # Check rate limit
             if not rate_limiter.is_allowed(identifier, max_requests, window_seconds):
+                rate_limit_rejections.inc(policy)
                 remaining_time = window_seconds
                 raise HTTPException(
                     status_code=status.HTTP_429_TOO_MANY_REQUESTS,
@@ -148,9 +156,10 @@ def rate_limit(max_requests: int = 5, window_seconds: int = 60):
     return decorator
 
 
-def create_rate_limit_dependency(max_requests: int = 5, window_seconds: int = 60):
+def create_rate_limit_dependency(max_requests: int = 5, window_seconds: int = 60, policy: str = "default"):
     """
-    Create a FastAPI dependency for rate limiting.
+    Create a FastAPI dependency for rate limiting. Rejections are counted
+    per `policy` in the metrics.
     
     Usage:
         rate_limit_dep = create_rate_limit_dependency(max_requests=10, window_seconds=60)
@@ -163,6 +172,7 @@ def create_rate_limit_dependency(max_requests: int = 5, window_seconds: int = 60
         identifier = get_client_identifier(request)
         
         if not rate_limiter.is_allowed(identifier, max_requests, window_seconds):
+            rate_limit_rejections.inc(policy)
             raise HTTPException(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 detail=f"Rate limit exceeded. Maximum {max_requests} requests per {window_seconds} seconds.",
@@ -178,6 +188,6 @@ def create_rate_limit_dependency(max_requests: int = 5, window_seconds: int = 60
 
 
 # Common rate limit dependencies
-auth_rate_limit = create_rate_limit_dependency(max_requests=5, window_seconds=300)  # 5 per 5 minutes for auth
-vote_rate_limit = create_rate_limit_dependency(max_requests=20, window_seconds=60)  # 20 per minute for voting
-general_rate_limit = create_rate_limit_dependency(max_requests=100, window_seconds=60)  # 100 per minute general
\ No newline at end of file
+auth_rate_limit = create_rate_limit_dependency(max_requests=5, window_seconds=300, policy="auth")  # 5 per 5 minutes for auth
+vote_rate_limit = create_rate_limit_dependency(max_requests=20, window_seconds=60, policy="vote")  # 20 per minute for voting
+general_rate_limit = create_rate_limit_dependency(max_requests=100, window_seconds=60, policy="general")  # 100 per minute general
\ No newline at end of file
@@ -0,0 +1,295 @@
+"""
+Recurring event support.
+
+A recurring event is stored as a single `events` row (the series) carrying an
+RFC 5545 RRULE. Occurrences are never stored; they are expanded lazily, and
+only inside the window a query asks for. Expansion runs in UTC.
+
+Rules are limited so that no rule costs unbounded work: occurrences at most
+daily (no BYHOUR, BYMINUTE or BYSECOND), and a bounded series (COUNT or UNTIL)
+has at most RECURRENCE_MAX_OCCURRENCES occurrences and ends within
+RECURRENCE_MAX_YEARS. Series without COUNT are expanded from the last period
+boundary before the query window rather than from their first occurrence, so
+queries do not get slower as a series ages.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from dateutil.parser import parse as parse_datetime
+from dateutil.relativedelta import relativedelta
+from dateutil.rrule import rrule, rrulestr
+
+from app.core.config import settings
+
+
+def as_utc(value: datetime) -> datetime:
+    """
+    Return `value` as an aware UTC datetime.
+    Naive values (e.g. read back from SQLite) are assumed to be UTC already.
+    """
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+# Frequencies allowed in rules, coarsest first
+FREQUENCIES = ("YEARLY", "MONTHLY", "WEEKLY", "DAILY")
+# Rule parts that repeat an occurrence within its day
+SUBDAILY_PARTS = ("BYHOUR", "BYMINUTE", "BYSECOND")
+
+
+def _rule_parts(rule: str) -> Dict[str, str]:
+    """The NAME=value parts of an RRULE, names upper-cased."""
+    body = rule.split(":", 1)[-1]
+    parts = {}
+    for part in body.split(";"):
+        name, _, value = part.partition("=")
+        parts[name.strip().upper()] = value.strip()
+    return parts
+
+
+def _parse(rule: str, dtstart: datetime) -> rrule:
+    parsed = rrulestr(rule, dtstart=as_utc(dtstart))
+    if not isinstance(parsed, rrule):
+        raise ValueError("Only a single RRULE is supported")
+    return parsed
+
+
+def parse_rule(rule: str, dtstart: datetime) -> rrule:
+    """
+    Parse an RRULE anchored at `dtstart`, for a rule being saved.
+    Raises ValueError if the rule is invalid, is not a single RRULE, repeats
+    more often than daily or has a COUNT above RECURRENCE_MAX_OCCURRENCES.
+    """
+    parsed = _parse(rule, dtstart)
+    parts = _rule_parts(rule)
+    if parts.get("FREQ", "").upper() not in FREQUENCIES:
+        raise ValueError(f"FREQ must be one of {', '.join(FREQUENCIES)}")
+    if parts.keys() & set(SUBDAILY_PARTS):
+        raise ValueError(f"{', '.join(SUBDAILY_PARTS)} are not supported, occurrences repeat at most daily")
+    if "COUNT" in parts and int(parts["COUNT"]) > settings.RECURRENCE_MAX_OCCURRENCES:
+        raise ValueError(f"COUNT must be at most {settings.RECURRENCE_MAX_OCCURRENCES}")
+    return parsed
+
+
+def _is_bounded(rule: str) -> bool:
+    """Whether the rule has COUNT or UNTIL, i.e. a last occurrence."""
+    return bool(_rule_parts(rule).keys() & {"COUNT", "UNTIL"})
+
+
+def _rebased(rule: rrule, event: Any, before: datetime) -> rrule:
+    """
+    `rule` restarted at the last period boundary (a multiple of INTERVAL
+    days, weeks, months or years after the series start) at or before
+    `before`, so iterating it does not walk every earlier occurrence. The
+    defaults the series start implies (weekday, day of month, month, time
+    of day) are passed explicitly, so the occurrences after `before` are
+    unchanged. Rules with COUNT, already bounded, are returned as they are.
+    """
+    parts = _rule_parts(event.recurrence_rule)
+    if "COUNT" in parts:
+        return rule
+    freq = parts.get("FREQ", "").upper()
+    interval = int(parts.get("INTERVAL") or 1)
+    origin = as_utc(event.start_time).replace(microsecond=0)
+    boundary = None
+    if freq == "DAILY":
+        periods = (before - origin) // timedelta(days=interval)
+        boundary = origin + timedelta(days=periods * interval)
+    elif freq == "WEEKLY":
+        periods = (before - origin) // timedelta(weeks=interval)
+        boundary = origin + timedelta(weeks=periods * interval)
+    elif freq == "MONTHLY":
+        months = (before.year - origin.year) * 12 + before.month - origin.month
+        periods = months // interval
+        boundary = datetime(origin.year, origin.month, 1, tzinfo=timezone.utc) + relativedelta(months=periods * interval)
+    elif freq == "YEARLY":
+        periods = (before.year - origin.year) // interval
+        boundary = datetime(origin.year + periods * interval, 1, 1, tzinfo=timezone.utc)
+    if boundary is None or periods <= 0:
+        return rule
+
+    defaults: Dict[str, Any] = {}
+    if not parts.keys() & {"BYWEEKNO", "BYYEARDAY", "BYMONTHDAY", "BYDAY", "BYEASTER"}:
+        if freq == "YEARLY":
+            if "BYMONTH" not in parts:
+                defaults["bymonth"] = origin.month
+            defaults["bymonthday"] = origin.day
+        elif freq == "MONTHLY":
+            defaults["bymonthday"] = origin.day
+        elif freq == "WEEKLY":
+            defaults["byweekday"] = origin.weekday()
+    for part, name in zip(SUBDAILY_PARTS, ("hour", "minute", "second")):
+        if part not in parts:
+            defaults[f"by{name}"] = getattr(origin, name)
+    return rule.replace(dtstart=boundary, **defaults)
+
+
+def _duration(start_time: datetime, end_time: Optional[datetime]) -> timedelta:
+    """How long each occurrence lasts, for overlap tests (never negative)."""
+    if end_time is None:
+        return timedelta(0)
+    return max(as_utc(end_time) - as_utc(start_time), timedelta(0))
+
+
+def check_duration(start_time: datetime, end_time: Optional[datetime]) -> None:
+    """
+    Raise ValueError if an event lasts longer than EVENT_MAX_DURATION_DAYS,
+    which range queries outside PostgreSQL rely on to find running events.
+    """
+    if end_time is not None and _duration(start_time, end_time) > timedelta(days=settings.EVENT_MAX_DURATION_DAYS):
+        raise ValueError(f"An event must not last longer than {settings.EVENT_MAX_DURATION_DAYS} days")
+
+
+def series_end(
+    rule: Optional[str], start_time: datetime, end_time: Optional[datetime]
+) -> Optional[datetime]:
+    """
+    Compute the end of the last occurrence of a series.
+    Returns None for single events and for series that never end.
+    Raises ValueError if `parse_rule` rejects the rule, UNTIL is more than
+    RECURRENCE_MAX_YEARS after the start or the series has more than
+    RECURRENCE_MAX_OCCURRENCES occurrences.
+    """
+    if not rule:
+        return None
+    parsed = parse_rule(rule, start_time)
+    if not _is_bounded(rule):
+        return None
+    until = _rule_parts(rule).get("UNTIL")
+    horizon = as_utc(start_time) + timedelta(days=365 * settings.RECURRENCE_MAX_YEARS)
+    if until and as_utc(parse_datetime(until)) > horizon:
+        raise ValueError(f"UNTIL must be at most {settings.RECURRENCE_MAX_YEARS} years after the start")
+    limit = settings.RECURRENCE_MAX_OCCURRENCES
+    last_start = as_utc(start_time)
+    for index, occurrence in enumerate(islice(parsed, limit + 1)):
+        if index == limit:
+            raise ValueError(f"The rule has more than {limit} occurrences")
+        last_start = occurrence
+    return last_start + _duration(start_time, end_time)
+
+
+class RecurrenceCache:
+    """
+    Bounded LRU cache of parsed rules keyed by rule version.
+
+    A rule version is (event id, start time, rule), so editing any of them yields
+    a new key and the stale entry simply ages out. Only the parsed rules are
+    kept, not their occurrences, so an entry's size does not grow with the
+    age of the series.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._rules: "OrderedDict[tuple, rrule]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, event: Any) -> rrule:
+        key = (event.id, as_utc(event.start_time), event.recurrence_rule)
+        with self._lock:
+            rule = self._rules.get(key)
+            if rule is not None:
+                self._rules.move_to_end(key)
+                return rule
+        # Stored rules were checked when saved; rows older than the limits still expand
+        rule = _parse(event.recurrence_rule, event.start_time)
+        with self._lock:
+            self._rules[key] = rule
+            self._rules.move_to_end(key)
+            while len(self._rules) > self.max_size:
+                self._rules.popitem(last=False)
+        return rule
+
+    def clear(self) -> None:
+        with self._lock:
+            self._rules.clear()
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+
+# Global recurrence cache instance
+recurrence_cache = RecurrenceCache(max_size=settings.RECURRENCE_CACHE_SIZE)
+
+
+@dataclass(frozen=True)
+class EventOccurrence:
+    """
+    One expanded occurrence of a recurring event.
+    Mirrors the `Event` columns exposed by the API, plus `recurrence_id`.
+    """
+    id: int
+    title: str
+    description: Optional[str]
+    start_time: datetime
+    end_time: Optional[datetime]
+    calendar_id: int
+    creator_id: Optional[int]
+    recurrence_rule: str
+    recurrence_exceptions: Optional[List[str]]
+    # Start of this occurrence within its series (RFC 5545 RECURRENCE-ID)
+    recurrence_id: datetime
+
+
+def expand(
+    event: Any,
+    *,
+    start: datetime,
+    end: Optional[datetime] = None,
+    include_ongoing: bool = True,
+) -> Iterator[EventOccurrence]:
+    """
+    Lazily yield the occurrences of a recurring event in start-time order.
+
+    :param event: The series row (anything with the `Event` columns).
+    :param start: Window start. Occurrences starting earlier are still yielded
+        while they are in progress at `start`, unless `include_ongoing` is False.
+    :param end: Window end (inclusive), or None for an open-ended window.
+    """
+    start = as_utc(start)
+    end = as_utc(end) if end is not None else None
+    offset = (
+        as_utc(event.end_time) - as_utc(event.start_time)
+        if event.end_time is not None else None
+    )
+    lookback = _duration(event.start_time, event.end_time) if include_ongoing else timedelta(0)
+    excluded = {
+        as_utc(datetime.fromisoformat(value))
+        for value in event.recurrence_exceptions or ()
+    }
+
+    rule = _rebased(recurrence_cache.get(event), event, start - lookback)
+    for occurrence_start in rule.xafter(start - lookback, inc=True):
+        if end is not None and occurrence_start > end:
+            return
+        if occurrence_start in excluded:
+            continue
+        yield EventOccurrence(
+            id=event.id,
+            title=event.title,
+            description=event.description,
+            start_time=occurrence_start,
+            end_time=occurrence_start + offset if offset is not None else None,
+            calendar_id=event.calendar_id,
+            creator_id=event.creator_id,
+            recurrence_rule=event.recurrence_rule,
+            recurrence_exceptions=event.recurrence_exceptions,
+            recurrence_id=occurrence_start,
+        )
+
+
+def start_key(event: Any) -> datetime:
+    """Sort key for merging rows and occurrences by start time."""
+    return as_utc(event.start_time)
+
+
+def normalize_exceptions(values: Optional[Iterable[datetime]]) -> Optional[List[str]]:
+    """Store exception datetimes as sorted UTC ISO 8601 strings."""
+    if values is None:
+        return None
+    return sorted(as_utc(value).isoformat() for value in values)
@@ -0,0 +1,454 @@
+"""
+Reminder scheduling for upcoming events.
+
+`ReminderScheduler` keeps the reminders due within the next horizon in a heap,
+reloaded through `CRUDEvent.get_agenda` every half horizon, so the events
+table is read once per slice rather than scanned every tick. Event writes in
+the scheduler's process update the heap in place (O(log n) per reminder;
+removals are lazy), and due reminders are handed to a pluggable `ReminderSink`.
+
+The scheduler lives in one process: enable it (REMINDERS_ENABLED) in a single
+worker. Each slice reloads the whole window, so events created, moved or
+deleted by other workers are picked up within REMINDER_HORIZON_HOURS / 2;
+until then a moved or deleted event may still be reminded at its old time, and
+an event created elsewhere that starts sooner than that may get no reminder.
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import queue
+import threading
+import urllib.request
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core import recurrence
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Reminder:
+    """A reminder for one event, or one occurrence of a recurring event."""
+    event_id: int
+    calendar_id: int
+    title: str
+    start_time: datetime
+    fire_at: datetime
+    # Start of the occurrence, for recurring events
+    recurrence_id: Optional[datetime] = None
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), default=lambda value: value.isoformat())
+
+
+# --- Sinks ---
+
+class ReminderSink:
+    """Receives due reminders from the scheduler thread. Subclass and override `deliver`."""
+
+    def deliver(self, reminder: Reminder) -> None:
+        raise NotImplementedError
+
+
+class QueueSink(ReminderSink):
+    """Puts reminders on a local queue for an in-process consumer."""
+
+    def __init__(self, maxsize: int = 10000):
+        self.queue: "queue.Queue[Reminder]" = queue.Queue(maxsize)
+
+    def deliver(self, reminder: Reminder) -> None:
+        try:
+            self.queue.put_nowait(reminder)
+        except queue.Full:
+            logger.warning("Reminder queue full, dropping reminder for event %s", reminder.event_id)
+
+
+class WebhookSink(ReminderSink):
+    """POSTs each reminder as JSON to a URL."""
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        self.url = url
+        self.timeout = timeout
+
+    def deliver(self, reminder: Reminder) -> None:
+        request = urllib.request.Request(
+            self.url,
+            data=reminder.to_json().encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+class BroadcastSink(ReminderSink):
+    """
+    Fans reminders out to subscribers, e.g. Server-Sent Events connections.
+    Each subscriber gets an asyncio queue fed from the scheduler thread.
+    """
+
+    def __init__(self, maxsize: int = 100):
+        self.maxsize = maxsize
+        self._subscribers: Dict[asyncio.Queue, Tuple[asyncio.AbstractEventLoop, Set[int]]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, calendar_ids: Iterable[int]) -> asyncio.Queue:
+        """Register the running event loop for reminders of the given calendars."""
+        subscription: asyncio.Queue = asyncio.Queue(self.maxsize)
+        with self._lock:
+            self._subscribers[subscription] = (asyncio.get_running_loop(), set(calendar_ids))
+        return subscription
+
+    def unsubscribe(self, subscription: asyncio.Queue) -> None:
+        with self._lock:
+            self._subscribers.pop(subscription, None)
+
+    def deliver(self, reminder: Reminder) -> None:
+        with self._lock:
+            targets = [
+                (loop, subscription)
+                for subscription, (loop, calendar_ids) in self._subscribers.items()
+                if reminder.calendar_id in calendar_ids
+            ]
+        for loop, subscription in targets:
+            loop.call_soon_threadsafe(self._offer, subscription, reminder)
+
+    @staticmethod
+    def _offer(subscription: asyncio.Queue, reminder: Reminder) -> None:
+        # Slow clients lose reminders rather than holding memory
+        if not subscription.full():
+            subscription.put_nowait(reminder)
+
+
+# --- Scheduler ---
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class ReminderScheduler:
+    """
+    Fires a reminder `lead` before each event starts.
+
+    Reminders are kept for events starting before `loaded_until`, which is
+    pushed forward in slices of half the horizon; each slice reloads the
+    whole window from the database. Events created shortly before they start
+    (inside the lead time) are reminded immediately.
+    """
+
+    def __init__(
+        self,
+        *,
+        sink: ReminderSink,
+        session_factory: Callable[[], Session],
+        lead: timedelta,
+        horizon: timedelta,
+        clock: Callable[[], datetime] = _utcnow,
+        page_size: int = 500,
+    ):
+        self.sink = sink
+        self.session_factory = session_factory
+        self.lead = lead
+        self.horizon = horizon
+        self.clock = clock
+        self.page_size = page_size
+        # (fire_at, sequence, reminder); entries whose sequence is no longer live are skipped
+        self._heap: List[Tuple[datetime, int, Reminder]] = []
+        # event id -> sequences of its scheduled reminders
+        self._live: Dict[int, Set[int]] = {}
+        self._calendar_events: Dict[int, Set[int]] = {}
+        self._stale = 0
+        self._sequence = itertools.count()
+        # (event id, start time) of delivered reminders, so a reload does not send them again
+        self._fired: Set[Tuple[int, datetime]] = set()
+        # Event and calendar ids written in this process while a slice is being read
+        self._touched: Optional[Tuple[Set[int], Set[int]]] = None
+        self.loaded_until: Optional[datetime] = None
+        self._wakeup = threading.Condition()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        with self._wakeup:
+            return len(self._heap) - self._stale
+
+    # Loading
+
+    def load_until(self, until: datetime) -> int:
+        """
+        Replace the scheduled reminders with those of the events starting
+        between now and `until`, read from the database, so writes made by
+        other processes since the last slice are picked up. Returns the
+        number of reminders scheduled.
+        """
+        from app.models.calendar import Calendar
+
+        now = self.clock()
+        if until <= now:
+            return 0
+        with self._wakeup:
+            self._touched = (set(), set())
+        items = self._read(select(Calendar.id), start=now, until=until)
+        with self._wakeup:
+            touched_events, touched_calendars = self._touched
+            self._touched = None
+            self._heap, self._live, self._calendar_events, self._stale = [], {}, {}, 0
+            self._fired = {key for key in self._fired if key[1] >= now}
+            added = sum(self._push(item, now) for item in items)
+            self.loaded_until = until
+            self._wakeup.notify()
+        # Writes in this process while the window was read may be missing from it
+        if touched_events:
+            self._reload_events(touched_events)
+        for calendar_id in touched_calendars:
+            self.calendar_changed(calendar_id)
+        return added
+
+    def _read(self, calendar_ids: Any, *, start: datetime, until: datetime) -> List[Any]:
+        """The events and occurrences of `calendar_ids` starting in [start, until)."""
+        from app.crud import event as event_crud
+
+        items: List[Any] = []
+        after = None
+        with self.session_factory() as db:
+            while True:
+                page = event_crud.get_agenda(
+                    db, calendar_ids=calendar_ids, from_time=start, after=after, limit=self.page_size
+                )
+                for item in page:
+                    if recurrence.as_utc(item.start_time) >= until:
+                        return items
+                    items.append(item)
+                if len(page) < self.page_size:
+                    return items
+                after = (page[-1].start_time, page[-1].id)
+
+    def _reload_events(self, event_ids: Set[int]) -> None:
+        from app.models.event import Event
+
+        with self.session_factory() as db:
+            events = db.scalars(select(Event).where(Event.id.in_(event_ids))).all()
+            with self._wakeup:
+                for event_id in event_ids:
+                    self._cancel(event_id)
+                for event in events:
+                    self._schedule(event, self.clock())
+                self._wakeup.notify()
+
+    def _push(self, item: Any, now: datetime) -> int:
+        start_time = recurrence.as_utc(item.start_time)
+        if start_time < now or (item.id, start_time) in self._fired:
+            return 0
+        reminder = Reminder(
+            event_id=item.id,
+            calendar_id=item.calendar_id,
+            title=item.title,
+            start_time=start_time,
+            fire_at=max(start_time - self.lead, now),
+            recurrence_id=getattr(item, "recurrence_id", None),
+        )
+        sequence = next(self._sequence)
+        heapq.heappush(self._heap, (reminder.fire_at, sequence, reminder))
+        self._live.setdefault(item.id, set()).add(sequence)
+        self._calendar_events.setdefault(item.calendar_id, set()).add(item.id)
+        return 1
+
+    # Incremental updates
+
+    def event_saved(self, event: Any) -> None:
+        """Reschedule the reminders of a created or updated event."""
+        now = self.clock()
+        with self._wakeup:
+            self._cancel(event.id)
+            if self._touched is not None:
+                self._touched[0].add(event.id)
+            self._schedule(event, now)
+            self._wakeup.notify()
+
+    def _schedule(self, event: Any, now: datetime) -> None:
+        if self.loaded_until is None:
+            return
+        if event.recurrence_rule:
+            occurrences = recurrence.expand(
+                event, start=now, end=self.loaded_until, include_ongoing=False
+            )
+            for occurrence in occurrences:
+                if occurrence.start_time < self.loaded_until:
+                    self._push(occurrence, now)
+        elif recurrence.as_utc(event.start_time) < self.loaded_until:
+            self._push(event, now)
+
+    def calendar_changed(self, calendar_id: int) -> None:
+        """Reload the reminders of one calendar, e.g. after a bulk import."""
+        now = self.clock()
+        with self._wakeup:
+            for event_id in self._calendar_events.pop(calendar_id, set()):
+                self._cancel(event_id)
+            if self._touched is not None:
+                self._touched[1].add(calendar_id)
+            until = self.loaded_until
+        if until is not None:
+            items = self._read([calendar_id], start=now, until=until)
+            with self._wakeup:
+                # Whatever was scheduled for the calendar meanwhile is superseded by this read
+                for event_id in self._calendar_events.pop(calendar_id, set()):
+                    self._cancel(event_id)
+                for item in items:
+                    self._push(item, now)
+                self._wakeup.notify()
+
+    def event_deleted(self, event_id: int) -> None:
+        with self._wakeup:
+            self._cancel(event_id)
+            if self._touched is not None:
+                self._touched[0].add(event_id)
+
+    def calendar_deleted(self, calendar_id: int) -> None:
+        with self._wakeup:
+            for event_id in self._calendar_events.pop(calendar_id, set()):
+                self._cancel(event_id)
+            if self._touched is not None:
+                self._touched[1].add(calendar_id)
+
+    def _cancel(self, event_id: int) -> None:
+        self._stale += len(self._live.pop(event_id, ()))
+        # Compact once most of the heap is cancelled entries
+        if self._stale > 64 and self._stale * 2 > len(self._heap):
+            self._heap = [
+                entry for entry in self._heap
+                if entry[1] in self._live.get(entry[2].event_id, ())
+            ]
+            heapq.heapify(self._heap)
+            self._stale = 0
+
+    # Firing
+
+    def run_pending(self) -> int:
+        """
+        Deliver every reminder that is due and load the next slice when the
+        loaded window runs short. Returns the number of reminders delivered.
+        """
+        now = self.clock()
+        due = []
+        with self._wakeup:
+            while self._heap and self._heap[0][0] <= now:
+                _, sequence, reminder = heapq.heappop(self._heap)
+                sequences = self._live.get(reminder.event_id)
+                if sequences is None or sequence not in sequences:
+                    self._stale -= 1
+                    continue
+                sequences.discard(sequence)
+                if not sequences:
+                    del self._live[reminder.event_id]
+                    self._calendar_events.get(reminder.calendar_id, set()).discard(reminder.event_id)
+                self._fired.add((reminder.event_id, reminder.start_time))
+                due.append(reminder)
+            needs_load = self.loaded_until is None or self.loaded_until - now < self.horizon / 2
+        for reminder in due:
+            try:
+                self.sink.deliver(reminder)
+            except Exception:
+                logger.exception("Failed to deliver reminder for event %s", reminder.event_id)
+        if needs_load:
+            self.load_until(now + self.horizon + self.lead)
+        return len(due)
+
+    def _seconds_until_next(self) -> float:
+        now = self.clock()
+        wakeups = [self.loaded_until - self.horizon / 2] if self.loaded_until else []
+        if self._heap:
+            wakeups.append(self._heap[0][0])
+        if not wakeups:
+            return 60.0
+        return min(max((min(wakeups) - now).total_seconds(), 0.0), 60.0)
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                self.run_pending()
+            except Exception:
+                logger.exception("Reminder scheduler iteration failed")
+            with self._wakeup:
+                if not self._stopping.is_set():
+                    self._wakeup.wait(timeout=self._seconds_until_next())
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="reminder-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        with self._wakeup:
+            self._wakeup.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+
+# --- Process-wide scheduler ---
+
+_scheduler: Optional[ReminderScheduler] = None
+
+
+def build_sink() -> ReminderSink:
+    """Create the sink selected by REMINDER_SINK."""
+    if settings.REMINDER_SINK == "webhook":
+        if not settings.REMINDER_WEBHOOK_URL:
+            raise ValueError("REMINDER_WEBHOOK_URL is required for the webhook reminder sink")
+        return WebhookSink(settings.REMINDER_WEBHOOK_URL)
+    if settings.REMINDER_SINK == "queue":
+        return QueueSink()
+    return BroadcastSink()
+
+
+def start_scheduler(session_factory: Callable[[], Session], sink: Optional[ReminderSink] = None) -> ReminderScheduler:
+    global _scheduler
+    _scheduler = ReminderScheduler(
+        sink=sink or build_sink(),
+        session_factory=session_factory,
+        lead=timedelta(minutes=settings.REMINDER_LEAD_MINUTES),
+        horizon=timedelta(hours=settings.REMINDER_HORIZON_HOURS),
+    )
+    _scheduler.start()
+    return _scheduler
+
+
+def stop_scheduler() -> None:
+    global _scheduler
+    if _scheduler is not None:
+        _scheduler.stop()
+        _scheduler = None
+
+
+def get_scheduler() -> Optional[ReminderScheduler]:
+    return _scheduler
+
+
+# Hooks called by CRUDEvent; no-ops when this process runs no scheduler
+
+def event_saved(event: Any) -> None:
+    if _scheduler is not None:
+        _scheduler.event_saved(event)
+
+
+def calendar_changed(calendar_id: int) -> None:
+    if _scheduler is not None:
+        _scheduler.calendar_changed(calendar_id)
+
+
+def event_deleted(event_id: int) -> None:
+    if _scheduler is not None:
+        _scheduler.event_deleted(event_id)
+
+
+def calendar_deleted(calendar_id: int) -> None:
+    if _scheduler is not None:
+        _scheduler.calendar_deleted(calendar_id)
@@ -0,0 +1,305 @@
+"""
+Server-side cache of hot GET responses.
+
+Polling clients read the same calendar's events, a list's items with their
+votes and their own calendars over and over, and between writes the answers
+are identical. `ResponseCache` keeps the rendered body and validator headers
+of those responses, keyed by request path and query plus the authorization
+scope the endpoint answers for: the user for per-user listings, or the
+calendar or list whose access the endpoint checked before the lookup, so the
+members of a shared calendar share entries.
+
+Entries are tagged (`calendar:{id}`, `list:{id}`, `user:{id}`). The write
+hooks in app/core/changes.py collect the tags of every write and drop the
+tagged entries once the transaction commits; a response rendered while an
+invalidation ran is not stored, so a slow read cannot put back data a
+concurrent commit just made stale. Entries also expire after
+RESPONSE_CACHE_TTL_SECONDS, which bounds how long writes this process does
+not see stay hidden: those of other workers when the backend is per process,
+and bulk SQL outside the CRUD layer.
+
+Backends: `LRUBackend`, in process and bounded by entries and bytes, and
+`RedisBackend`, shared by every worker (needs the `redis` package). The cache
+is off unless RESPONSE_CACHE_ENABLED is set; deployments running more than
+one worker need the Redis backend, since with per-process entries a write
+stays invisible to the other workers for up to the TTL.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, NamedTuple, Optional, Set, Tuple
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+
+from app.core.conditional import Validators
+from app.core.config import settings
+
+# Response headers kept with a cached body
+CACHED_HEADERS = ("etag", "last-modified")
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    media_type: str
+    headers: Dict[str, str]
+
+    def respond(self, request: Request) -> Response:
+        """The cached response, or a 304 if the request's If-None-Match has its ETag."""
+        etag = self.headers.get("etag")
+        if etag is not None and Validators(etag).matches(request):
+            return Response(status_code=304, headers=self.headers)
+        return Response(self.body, media_type=self.media_type, headers=self.headers)
+
+
+class CacheKey(NamedTuple):
+    key: str
+    # Invalidation generation when the key was made; see ResponseCache.store
+    generation: int
+
+
+# --- Backends ---
+
+class CacheBackend:
+    """Storage of a `ResponseCache`. Subclass and override every method."""
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: CachedResponse, tags: Tuple[str, ...], ttl: float) -> None:
+        raise NotImplementedError
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, float]:
+        raise NotImplementedError
+
+
+class LRUBackend(CacheBackend):
+    """
+    Per-process LRU of responses, bounded by entry count and total body size.
+    Evicts least recently used entries past either bound.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.clock = clock
+        # key -> (expires at, response, tags)
+        self._entries: "OrderedDict[str, Tuple[float, CachedResponse, Tuple[str, ...]]]" = OrderedDict()
+        # tag -> keys of the entries carrying it
+        self._tags: Dict[str, Set[str]] = {}
+        self._bytes = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= len(entry[1].body)
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= self.clock():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: CachedResponse, tags: Tuple[str, ...], ttl: float) -> None:
+        if len(value.body) > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (self.clock() + ttl, value, tags)
+            self._bytes += len(value.body)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                for key in self._tags.pop(tag, ()):
+                    self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self._bytes = 0
+            self.evictions = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "evictions": self.evictions}
+
+
+class RedisBackend(CacheBackend):
+    """
+    Responses in Redis, shared by every worker, so a write served by one
+    worker invalidates the entries of all of them. Each entry is a hash with
+    a TTL; each tag is a set of entry keys. Eviction is left to Redis
+    (configure `maxmemory`).
+    """
+
+    def __init__(self, url: str, prefix: str = "response-cache:"):
+        try:
+            import redis
+        except ImportError:
+            raise ValueError("RESPONSE_CACHE_BACKEND=redis needs the redis package (pip install redis)")
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self.client.hgetall(self.prefix + key)
+        if not entry:
+            return None
+        return CachedResponse(entry[b"body"], entry[b"media_type"].decode(), json.loads(entry[b"headers"]))
+
+    def set(self, key: str, value: CachedResponse, tags: Tuple[str, ...], ttl: float) -> None:
+        key = self.prefix + key
+        milliseconds = int(ttl * 1000)
+        pipeline = self.client.pipeline()
+        pipeline.hset(key, mapping={
+            "body": value.body, "media_type": value.media_type, "headers": json.dumps(value.headers),
+        })
+        pipeline.pexpire(key, milliseconds)
+        for tag in tags:
+            pipeline.sadd(f"{self.prefix}tag:{tag}", key)
+            pipeline.pexpire(f"{self.prefix}tag:{tag}", milliseconds)
+        pipeline.execute()
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            tag_key = f"{self.prefix}tag:{tag}"
+            keys = self.client.smembers(tag_key)
+            self.client.delete(tag_key, *keys)
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+    def stats(self) -> Dict[str, float]:
+        return {}
+
+
+# --- Cache ---
+
+class ResponseCache:
+    """
+    Looks responses up and stores them for endpoints, with hit, miss and
+    invalidation counters. Usage in an endpoint, after its access checks:
+
+        cache_key = response_cache.key(request, scope=f"calendar:{calendar_id}")
+        cached = response_cache.get(request, cache_key)
+        if cached is not None:
+            return cached
+        ...
+        return response_cache.store(cache_key, response, tags=[f"calendar:{calendar_id}"])
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float, enabled: bool = True):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        # Bumped by every invalidation
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def key(self, request: Request, *, scope: str) -> CacheKey:
+        """Key of the response to `request` (path and query) within an authorization scope."""
+        query = urlencode(sorted(request.query_params.multi_items()))
+        return CacheKey(f"{scope}|{request.url.path}?{query}", self._generation)
+
+    def get(self, request: Request, key: CacheKey) -> Optional[Response]:
+        """The cached response (or 304) for `key`, None on a miss."""
+        if not self.enabled:
+            return None
+        cached = self.backend.get(key.key)
+        with self._lock:
+            if cached is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return cached.respond(request)
+
+    def store(self, key: CacheKey, response: Response, *, tags: Iterable[str]) -> Response:
+        """
+        Cache a rendered 200 response under `key` with `tags` and return it.
+        Not stored if an invalidation ran since `key` was made.
+        """
+        if self.enabled and response.status_code == 200 and key.generation == self._generation:
+            headers = {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers}
+            self.backend.set(
+                key.key, CachedResponse(bytes(response.body), response.media_type, headers), tuple(tags), self.ttl
+            )
+        return response
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        """Drop every entry carrying one of `tags`."""
+        tags = set(tags)
+        if not tags:
+            return
+        with self._lock:
+            self._generation += 1
+            self.invalidations += 1
+        self.backend.invalidate(tags)
+
+    def stats(self) -> Dict[str, float]:
+        """Hit, miss, invalidation and backend counts since the last `clear`."""
+        with self._lock:
+            hits, misses = self.hits, self.misses
+            result: Dict[str, float] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                "invalidations": self.invalidations,
+            }
+        result.update(self.backend.stats())
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self.hits = self.misses = self.invalidations = 0
+        self.backend.clear()
+
+
+def build_backend() -> CacheBackend:
+    """Create the backend selected by RESPONSE_CACHE_BACKEND."""
+    if settings.RESPONSE_CACHE_BACKEND == "redis":
+        if not settings.RESPONSE_CACHE_REDIS_URL:
+            raise ValueError("RESPONSE_CACHE_REDIS_URL is required for the redis response cache backend")
+        return RedisBackend(settings.RESPONSE_CACHE_REDIS_URL)
+    return LRUBackend(
+        max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES, max_bytes=settings.RESPONSE_CACHE_MAX_BYTES
+    )
+
+
+# Global response cache instance
+response_cache = ResponseCache(
+    build_backend(), ttl=settings.RESPONSE_CACHE_TTL_SECONDS, enabled=settings.RESPONSE_CACHE_ENABLED
+)
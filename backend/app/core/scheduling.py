@@ -0,0 +1,56 @@
+"""
+Interval helpers for free/busy lookups and meeting slot search.
+"""
+
+from datetime import datetime, timedelta
+from typing import Iterable, List, Tuple
+
+Interval = Tuple[datetime, datetime]
+
+
+def merge_intervals(
+    intervals: Iterable[Interval], *, window_start: datetime, window_end: datetime
+) -> List[Interval]:
+    """
+    Union busy intervals into sorted, non-overlapping blocks clipped to the window.
+    Touching intervals are merged; empty intervals are dropped.
+    """
+    clipped = sorted(
+        (max(start, window_start), min(end, window_end))
+        for start, end in intervals
+        if end > window_start and start < window_end
+    )
+    merged: List[Interval] = []
+    for start, end in clipped:
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def find_free_slots(
+    busy: List[Interval],
+    *,
+    window_start: datetime,
+    window_end: datetime,
+    duration: timedelta,
+    count: int,
+) -> List[Interval]:
+    """
+    Return up to `count` earliest back-to-back slots of exactly `duration` that fit
+    in the gaps between merged `busy` blocks.
+    """
+    slots: List[Interval] = []
+    cursor = window_start
+    for busy_start, busy_end in busy + [(window_end, window_end)]:
+        while len(slots) < count and busy_start - cursor >= duration:
+            slots.append((cursor, cursor + duration))
+            cursor += duration
+        if len(slots) >= count:
+            break
+        cursor = max(cursor, busy_end)
+    return slots
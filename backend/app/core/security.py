@@ -1,12 +1,14 @@
 # backend/app/core/security.py
 
 from datetime import datetime, timedelta, timezone
-from typing import Any, Union
+import time
+from typing import Any, Callable, TypeVar, Union
 
 from jose import jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.metrics import password_hashing_duration, password_hashing_in_flight
 
 # Create a CryptContext instance for password hashing, using bcrypt algorithm
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -34,6 +36,20 @@ def create_access_token(
     return encoded_jwt
 
 
+T = TypeVar("T")
+
+
+def _measured(operation: str, call: Callable[[], T]) -> T:
+    """Run a bcrypt call, counting it in flight and timing it for the metrics."""
+    password_hashing_in_flight.inc()
+    start = time.perf_counter()
+    try:
+        return call()
+    finally:
+        password_hashing_duration.observe(time.perf_counter() - start, operation)
+        password_hashing_in_flight.dec()
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a plain password against a hashed password.
@@ -42,7 +58,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     :param hashed_password: The hashed password from the database.
     :return: True if the passwords match, False otherwise.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return _measured("verify", lambda: pwd_context.verify(plain_password, hashed_password))
 
 
 def get_password_hash(password: str) -> str:
@@ -52,4 +68,4 @@ def get_password_hash(password: str) -> str:
     :param password: The plain text password.
     :return: The hashed password.
     """
-    return pwd_context.hash(password)
\ No newline at end of file
+    return _measured("hash", lambda: pwd_context.hash(password))
\ No newline at end of file
@@ -0,0 +1,177 @@
+"""
+Fast JSON output for list endpoints.
+
+FastAPI validates every returned ORM object through the endpoint's
+`response_model` (`from_attributes`) and then dumps the validated models.
+For rows that come straight from the database that validation re-checks what
+the schema of the table already guarantees, and it dominates the cost of
+returning a page of 100 events or items.
+
+`RowSerializer` builds the same JSON-ready dicts directly from ORM objects or
+SQLAlchemy `Row` tuples, reading only the schema's fields, and the app's
+default `ORJSONResponse` encodes datetimes and enums natively in the same
+format Pydantic uses. Endpoints opt in with `serialize_many` and keep their
+`response_model` for the OpenAPI schema.
+
+`fields_schema` builds the trimmed read schema of a sparse fieldset
+(`?fields=id,title`); its `schema_columns` are the columns to select.
+"""
+
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+import orjson
+from fastapi import HTTPException
+from fastapi.responses import ORJSONResponse as _ORJSONResponse
+from pydantic import BaseModel, ConfigDict, create_model
+from sqlalchemy import inspect
+from sqlalchemy.engine import Row
+
+from app.core.recurrence import normalize_exceptions
+from app.core.tracing import span, traced
+
+
+class ORJSONResponse(_ORJSONResponse):
+    """
+    orjson-rendered JSON response. UTC datetimes end in "Z", like Pydantic's
+    JSON mode, so output does not depend on which path built the content.
+    """
+
+    def render(self, content: Any) -> bytes:
+        with span("serialize.render") as current:
+            body = orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+            if current is not None:
+                current.set_attribute("bytes", len(body))
+            return body
+
+
+def _exceptions(values: Optional[List[Any]]) -> Optional[List[str]]:
+    # Stored normalized (the write schemas serialize them); only datetimes need it
+    if values is None or all(isinstance(value, str) for value in values):
+        return values
+    return normalize_exceptions(values)
+
+
+# Fields whose stored value may differ from the serialized one, mirroring the
+# schemas' @field_serializer methods
+CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    "recurrence_exceptions": _exceptions,
+}
+
+
+class RowSerializer:
+    """
+    Turns objects with a schema's fields as attributes (ORM instances, `Row`
+    tuples, `EventOccurrence`s) into dicts for that schema without validation.
+    Fields the object lacks, such as computed ones, get the schema default.
+    """
+
+    def __init__(self, schema: Type[BaseModel]):
+        self.schema = schema
+        self.fields: Tuple[str, ...] = tuple(schema.model_fields)
+        self._defaults = {
+            name: field.get_default(call_default_factory=True)
+            for name, field in schema.model_fields.items()
+            if not field.is_required()
+        }
+        # Object type (or Row column names) -> (getter, fields it reads, defaults it fills)
+        self._plans: Dict[Any, Tuple[Callable, Tuple[str, ...], Dict[str, Any]]] = {}
+
+    def columns(self, model: Any) -> List[Any]:
+        """The columns of `model` backing this schema, to select rows for `many`."""
+        # Mapped attribute names, which can differ from the table's column names
+        attrs = inspect(model).column_attrs
+        return [getattr(model, name) for name in self.fields if name in attrs]
+
+    def _plan(self, obj: Any):
+        # Row tuples of different queries share a class, so key them by their columns
+        is_row = isinstance(obj, Row)
+        key = obj._fields if is_row else type(obj)
+        plan = self._plans.get(key)
+        if plan is None:
+            present = tuple(name for name in self.fields if hasattr(obj, name))
+            missing = {name: self._defaults[name] for name in self.fields if name not in present and name in self._defaults}
+            absent = [name for name in self.fields if name not in present and name not in missing]
+            if absent:
+                raise TypeError(f"{key!r} has no {absent!r} for {self.schema.__name__}")
+            if is_row and present == key:
+                # Columns selected in schema order: the row already is the value tuple
+                getter = None
+            else:
+                getter = attrgetter(*present)
+                if len(present) == 1:
+                    getter = lambda obj, get=getter: (get(obj),)
+            converters = [(name, CONVERTERS[name]) for name in present if name in CONVERTERS]
+            plan = self._plans[key] = (getter, present, missing, converters)
+        return plan
+
+    def one(self, obj: Any) -> Dict[str, Any]:
+        return self.many((obj,))[0]
+
+    @traced("serialize.rows")
+    def many(self, objects: Iterable[Any]) -> List[Dict[str, Any]]:
+        result = []
+        plan_key = plan = None
+        for obj in objects:
+            key = obj._fields if isinstance(obj, Row) else type(obj)
+            if key is not plan_key:
+                plan_key, plan = key, self._plan(obj)
+            getter, present, missing, converters = plan
+            data = dict(zip(present, obj if getter is None else getter(obj)))
+            if missing:
+                data.update(missing)
+            for name, convert in converters:
+                data[name] = convert(data[name])
+            result.append(data)
+        return result
+
+
+@lru_cache(maxsize=None)
+def get_serializer(schema: Type[BaseModel]) -> RowSerializer:
+    """The cached serializer of a read schema."""
+    return RowSerializer(schema)
+
+
+def serialize_many(
+    schema: Type[BaseModel], objects: Iterable[Any], *, status_code: int = 200, headers: Optional[dict] = None
+) -> ORJSONResponse:
+    """Respond with `objects` as a JSON array of `schema`, skipping response_model validation."""
+    return ORJSONResponse(get_serializer(schema).many(objects), status_code=status_code, headers=headers)
+
+
+def schema_columns(schema: Type[BaseModel], model: Any) -> List[Any]:
+    """The columns of `model` to select for rows serialized as `schema`."""
+    return get_serializer(schema).columns(model)
+
+
+def parse_fields(schema: Type[BaseModel], fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a comma-separated `fields` parameter into field names of `schema`,
+    in schema order. Returns None when no fieldset was requested and raises
+    400 for unknown or missing names.
+    """
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    if not requested:
+        raise HTTPException(status_code=400, detail="fields must name at least one field")
+    unknown = requested.difference(schema.model_fields)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(name for name in schema.model_fields if name in requested)
+
+
+@lru_cache(maxsize=256)
+def fields_schema(schema: Type[BaseModel], fields: Optional[Tuple[str, ...]]) -> Type[BaseModel]:
+    """
+    The read schema restricted to `fields` (as returned by `parse_fields`),
+    or `schema` itself when `fields` is None.
+    """
+    if fields is None or fields == tuple(schema.model_fields):
+        return schema
+    return create_model(
+        f"{schema.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (schema.model_fields[name].annotation, schema.model_fields[name]) for name in fields},
+    )
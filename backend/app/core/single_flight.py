@@ -0,0 +1,99 @@
+"""
+Single-flight coalescing of identical concurrent reads.
+
+When many clients poll the same resource at once (a live vote on a list),
+every request that misses the response cache would run the same query and
+serialize the same payload. `SingleFlight.do(route, key, fn)` lets the first
+caller for a key run `fn` while callers arriving before it finishes wait and
+get its result (or its exception) instead of running their own.
+
+Each route chooses its key, and it must cover everything the result depends
+on: the authorization scope the route checked before the call, the query
+string and the collection's validators (so a request that saw a newer stamp
+never shares an older render). Access checks stay outside `do`, per user.
+Results are shared between threads and must not be mutated by callers.
+"""
+
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.followers = 0
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    In-flight calls by (route, key), with per-route counts of calls and of
+    calls that were served another call's result.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._calls: Dict[Tuple[str, Hashable], _Call] = {}
+        self._lock = threading.Lock()
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.coalesced: Dict[str, int] = defaultdict(int)
+
+    def do(self, route: str, key: Hashable, fn: Callable[[], T]) -> T:
+        """Run `fn`, or wait for the identical call of `route` already running and share its result."""
+        if not self.enabled:
+            return fn()
+        flight_key = (route, key)
+        with self._lock:
+            self.calls[route] += 1
+            call = self._calls.get(flight_key)
+            leader = call is None
+            if leader:
+                call = self._calls[flight_key] = _Call()
+            else:
+                call.followers += 1
+                self.coalesced[route] += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[flight_key]
+            call.done.set()
+        return call.result
+
+    def stats(self) -> Dict[str, float]:
+        """Per-route calls, coalesced calls and coalesced share since the last `clear`, plus in-flight counts."""
+        with self._lock:
+            result: Dict[str, float] = {
+                "in_flight": len(self._calls),
+                "waiting": sum(call.followers for call in self._calls.values()),
+            }
+            for route, calls in self.calls.items():
+                coalesced = self.coalesced[route]
+                result[f"{route}_calls"] = calls
+                result[f"{route}_coalesced"] = coalesced
+                result[f"{route}_coalesced_rate"] = coalesced / calls
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self.calls.clear()
+            self.coalesced.clear()
+
+
+# Global instance shared by the read endpoints
+single_flight = SingleFlight(enabled=settings.SINGLE_FLIGHT_ENABLED)
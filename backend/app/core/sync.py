@@ -0,0 +1,205 @@
+"""
+Delta sync: what changed in a user's calendars since a cursor.
+
+`changes_since` reads the change log (app/core/changes.py) past the cursor,
+keeps the latest entry of each entity and loads the current rows of those
+entities with one query per type. Entities whose row is gone, or whose
+calendar the user can no longer access, come back as tombstones (ids only).
+A sync therefore costs O(changes since the cursor) rather than O(data), and an
+entity edited many times since is sent once, in its current state.
+
+Cursors are positions in the log: the entry id on SQLite, which commits
+writers one at a time, and the writing transaction's id on PostgreSQL (see
+app/core/changes.py). A sync reads the positions from its cursor up to
+`current_position`, below which no entry can still appear, so entries
+committed late are picked up by a later sync rather than skipped. On
+PostgreSQL a long-running transaction holds that position back, delaying
+syncs until it ends. Pages of one sync share the same upper bound.
+
+`prune` deletes entries older than SYNC_RETENTION_DAYS and raises the floor
+position; cursors below it get 410 and the client reloads in full.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Callable, Collection, Dict, List as ListTyping, Optional, Sequence
+
+from sqlalchemy import and_, delete, func, or_, select, text
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from app.core.serialization import get_serializer, schema_columns
+from app.models.calendar import Calendar
+from app.models.change import Change, ChangeFloor
+from app.models.event import Event, EventArchive
+from app.models.list import List
+from app.models.list_item import ListItem
+from app.models.vote import Vote
+from app.schemas import calendar as calendar_schemas
+from app.schemas import event as event_schemas
+from app.schemas import list as list_schemas
+from app.schemas import list_item as list_item_schemas
+from app.schemas import vote as vote_schemas
+
+
+def _is_postgresql(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _position(db: Session) -> Any:
+    """The column holding an entry's position."""
+    return Change.txid if _is_postgresql(db) else Change.id
+
+
+def current_position(db: Session) -> int:
+    """
+    Position below which every change log entry is final: committed and
+    visible, or rolled back. Entries may still appear at or above it.
+    """
+    if _is_postgresql(db):
+        # Transactions older than the oldest one running have all ended
+        return db.scalar(text("SELECT txid_snapshot_xmin(txid_current_snapshot())"))
+    return db.scalar(select(func.coalesce(func.max(Change.id), 0))) + 1
+
+
+def floor_position(db: Session) -> int:
+    """Oldest position the change log still covers, 0 until it is first pruned."""
+    return db.scalar(select(ChangeFloor.position).where(ChangeFloor.id == 1)) or 0
+
+
+def prune(db: Session, *, before: datetime) -> int:
+    """
+    Delete the change log entries written before `before` and raise the
+    floor position past them. Returns the number of entries deleted.
+    """
+    position = _position(db)
+    # Entries go by position, so none at or above the oldest one kept is deleted
+    floor = current_position(db)
+    oldest_kept = db.scalar(select(func.min(position)).where(Change.created_at >= before))
+    if oldest_kept is not None:
+        floor = min(floor, oldest_kept)
+    deleted = db.execute(delete(Change).where(position < floor)).rowcount
+    row = db.get(ChangeFloor, 1)
+    if row is None:
+        db.add(ChangeFloor(id=1, position=floor, pruned_at=datetime.now(timezone.utc)))
+    elif floor > row.position:
+        row.position, row.pruned_at = floor, datetime.now(timezone.utc)
+    db.commit()
+    return deleted
+
+
+def _calendars(db: Session, ids: Sequence[int], calendar_ids: Collection[int]) -> ListTyping[Dict[str, Any]]:
+    calendars = (
+        db.query(Calendar)
+        .options(joinedload(Calendar.owner), selectinload(Calendar.members))
+        .filter(Calendar.id.in_(ids))
+        .all()
+    )
+    return [
+        calendar_schemas.Calendar.model_validate(calendar).model_dump(mode="json")
+        for calendar in calendars if calendar.id in calendar_ids
+    ]
+
+
+def _rows(schema: Any, model: Any, *joins: Any) -> Callable[..., ListTyping[Dict[str, Any]]]:
+    """Loader of the rows of `model` with the given ids in accessible calendars, as `schema` dicts."""
+    calendar_id = List.calendar_id if joins else model.calendar_id
+
+    def load(db: Session, ids: Sequence[int], calendar_ids: Collection[int]) -> ListTyping[Dict[str, Any]]:
+        query = db.query(*schema_columns(schema, model), calendar_id.label("visible_in"))
+        for target, onclause in joins:
+            query = query.join(target, onclause)
+        # Filtering on the calendar in SQL lets the planner start from the
+        # calendar's rows instead of the ids, so it is done here
+        rows = query.filter(model.id.in_(ids)).order_by(model.id)
+        return get_serializer(schema).many(row for row in rows if row.visible_in in calendar_ids)
+    return load
+
+
+_lists = _rows(list_schemas.List, List)
+_list_items = _rows(list_item_schemas.ListItem, ListItem, (List, List.id == ListItem.list_id))
+_votes = _rows(
+    vote_schemas.Vote, Vote,
+    (ListItem, ListItem.id == Vote.list_item_id), (List, List.id == ListItem.list_id),
+)
+_live_events = _rows(event_schemas.Event, Event)
+_archived_events = _rows(event_schemas.Event, EventArchive)
+
+
+def _events(db: Session, ids: Sequence[int], calendar_ids: Collection[int]) -> ListTyping[Dict[str, Any]]:
+    # Archived events are still events to clients
+    events = _live_events(db, ids, calendar_ids)
+    found = {event["id"] for event in events}
+    archived = [event_id for event_id in ids if event_id not in found]
+    if archived:
+        events.extend(_archived_events(db, archived, calendar_ids))
+    return events
+
+
+# `Change.entity` -> (key in the sync page, loader)
+LOADERS = {
+    "calendar": ("calendars", _calendars),
+    "list": ("lists", _lists),
+    "list_item": ("list_items", _list_items),
+    "vote": ("votes", _votes),
+    "event": ("events", _events),
+}
+
+
+def changes_since(
+    db: Session,
+    *,
+    since: int,
+    user_id: int,
+    calendar_ids: Collection[int],
+    limit: int,
+    upper: Optional[int] = None,
+    after: int = 0,
+) -> Dict[str, Any]:
+    """
+    The changes at positions from `since` up to `upper` (the current position
+    if None) visible to `user_id`, whose accessible calendars are
+    `calendar_ids`: at most `limit` entities, oldest change first, skipping
+    those a previous page up to entry id `after` sent. Returns a `SyncPage`
+    dict whose cursor is the (since, upper, after) tuple of the next page, or
+    (upper, 0, 0) once the window is done.
+    """
+    if upper is None:
+        upper = current_position(db)
+    calendar_ids = frozenset(calendar_ids)
+    position = _position(db)
+    seq = func.max(Change.id).label("seq")
+    latest = db.execute(
+        select(Change.entity, Change.entity_id, seq)
+        .where(
+            position >= since,
+            position < upper,
+            Change.id > after,
+            or_(
+                and_(Change.user_id.is_(None), Change.calendar_id.in_(sorted(calendar_ids))),
+                Change.user_id == user_id,
+            ),
+        )
+        .group_by(Change.entity, Change.entity_id)
+        .order_by(seq)
+        .limit(limit + 1)
+    ).all()
+    has_more = len(latest) > limit
+    latest = latest[:limit]
+
+    ids = defaultdict(list)
+    for entity, entity_id, _ in latest:
+        ids[entity].append(entity_id)
+    changed: Dict[str, ListTyping[Dict[str, Any]]] = {}
+    deleted: Dict[str, ListTyping[int]] = {}
+    for entity, (key, load) in LOADERS.items():
+        wanted = ids.get(entity, [])
+        rows = load(db, wanted, calendar_ids) if wanted else []
+        present = {row["id"] for row in rows}
+        changed[key] = rows
+        deleted[key] = sorted(entity_id for entity_id in wanted if entity_id not in present)
+    return {
+        "cursor": (since, upper, latest[-1].seq) if has_more else (max(upper, since), 0, 0),
+        "has_more": has_more,
+        "changed": changed,
+        "deleted": deleted,
+    }
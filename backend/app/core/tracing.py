@@ -0,0 +1,432 @@
+"""
+Lightweight request tracing: spans around the auth and access dependencies,
+CRUD methods and response serialization.
+
+`TracingMiddleware` decides per request whether to trace it: the request is
+sampled with probability TRACING_SAMPLE_RATE, unless it carries a W3C
+`traceparent` header and tracing is on (a sample rate above 0 or an exporter
+configured), in which case the header's sampled flag wins. With tracing off,
+clients cannot turn it on for their requests. A sampled request gets a root span in a
+context variable, which AnyIO copies into the worker thread of a sync
+endpoint; `span` and `traced` open child spans under it. Unsampled requests
+set nothing, so instrumented code only pays one context variable lookup.
+
+Finished spans go to a bounded ring buffer (the newest TRACING_BUFFER_SIZE,
+served at GET /debug/traces when TRACING_DEBUG_ENDPOINT is on) and, with
+TRACING_EXPORTER set, to a queue drained by a background thread that exports
+batches as OTLP/JSON: appended to a file ("file", one ExportTraceServiceRequest
+per line, the format of the OpenTelemetry Collector's file exporter) or posted
+to a collector's OTLP/HTTP endpoint ("otlp"). Spans are dropped, and counted,
+when the queue is full rather than slowing requests down.
+"""
+
+import contextvars
+import functools
+import json
+import queue
+import random
+import threading
+import time
+import urllib.request
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List as ListTyping, NamedTuple, Optional, TypeVar
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# OTLP span kinds and status codes
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name: str, trace_id: int, parent_id: Optional[int], kind: int = KIND_INTERNAL):
+        self.trace_id = trace_id
+        self.span_id = random.getrandbits(64) or 1
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes: Dict[str, Any] = {}
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The span as it is served by the debug endpoint."""
+        return {
+            "trace_id": f"{self.trace_id:032x}",
+            "span_id": f"{self.span_id:016x}",
+            "parent_span_id": f"{self.parent_id:016x}" if self.parent_id else None,
+            "name": self.name,
+            "start_time_unix_nano": self.start_ns,
+            "duration_ms": (self.end_ns - self.start_ns) / 1e6,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+_current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    """The innermost open span of this request, None if it is not traced."""
+    return _current.get()
+
+
+class _SpanScope:
+    """Context manager opening a child span of the current one."""
+
+    __slots__ = ("span", "token")
+
+    def __init__(self, span: Span):
+        self.span = span
+
+    def __enter__(self) -> Span:
+        self.token = _current.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if exc is not None:
+            self.span.error = f"{exc_type.__name__}: {exc}"
+        _current.reset(self.token)
+        tracer.end(self.span)
+
+
+class _NoSpan:
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name: str, **attributes: Any):
+    """Context manager timing a block as a child span; yields the span, or None when not traced."""
+    parent = _current.get()
+    if parent is None:
+        return _NO_SPAN
+    child = Span(name, parent.trace_id, parent.span_id)
+    child.attributes.update(attributes)
+    return _SpanScope(child)
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorator running the function in a span called `name`."""
+    def decorate(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _current.get() is None:
+                return fn(*args, **kwargs)
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# --- Export ---
+
+def _attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+def to_otlp(spans: Iterable[Span], service_name: str) -> Dict[str, Any]:
+    """An OTLP/JSON ExportTraceServiceRequest carrying `spans`."""
+    return {"resourceSpans": [{
+        "resource": {"attributes": [_attribute("service.name", service_name)]},
+        "scopeSpans": [{
+            "scope": {"name": __name__},
+            "spans": [
+                {
+                    "traceId": f"{item.trace_id:032x}",
+                    "spanId": f"{item.span_id:016x}",
+                    "parentSpanId": f"{item.parent_id:016x}" if item.parent_id else "",
+                    "name": item.name,
+                    "kind": item.kind,
+                    "startTimeUnixNano": str(item.start_ns),
+                    "endTimeUnixNano": str(item.end_ns),
+                    "attributes": [_attribute(key, value) for key, value in item.attributes.items()],
+                    "status": (
+                        {"code": STATUS_ERROR, "message": item.error} if item.error else {"code": STATUS_OK}
+                    ),
+                }
+                for item in spans
+            ],
+        }],
+    }]}
+
+
+class SpanExporter:
+    """Destination of finished spans. Subclass and override `export`."""
+
+    def export(self, spans: ListTyping[Span]) -> None:
+        raise NotImplementedError
+
+
+class FileExporter(SpanExporter):
+    """Appends each batch to a file as one line of OTLP/JSON."""
+
+    def __init__(self, path: str, service_name: str = settings.PROJECT_NAME):
+        self.path = path
+        self.service_name = service_name
+
+    def export(self, spans: ListTyping[Span]) -> None:
+        line = json.dumps(to_otlp(spans, self.service_name), separators=(",", ":"))
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(line + "\n")
+
+
+class OTLPHttpExporter(SpanExporter):
+    """Posts each batch as OTLP/JSON to a collector, e.g. http://localhost:4318/v1/traces."""
+
+    def __init__(self, endpoint: str, service_name: str = settings.PROJECT_NAME, timeout: float = 5.0):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+
+    def export(self, spans: ListTyping[Span]) -> None:
+        request = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(to_otlp(spans, self.service_name)).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+class BatchProcessor:
+    """
+    Queue of finished spans exported in batches by a daemon thread, started
+    with the first span. Spans that do not fit in the queue are dropped.
+    """
+
+    def __init__(self, exporter: SpanExporter, max_queue: int = 10000, batch_size: int = 512,
+                 interval: float = 2.0):
+        self.exporter = exporter
+        self.batch_size = batch_size
+        self.interval = interval
+        self.dropped = 0
+        self.failed = 0
+        self._queue: "queue.Queue[Optional[Span]]" = queue.Queue(max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, finished: Span) -> None:
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(finished)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch: ListTyping[Span] = []
+            deadline = time.monotonic() + self.interval
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            if batch:
+                self._export(batch)
+            if stop:
+                return
+
+    def _export(self, batch: ListTyping[Span]) -> None:
+        try:
+            self.exporter.export(batch)
+        except Exception:
+            # Tracing must never take the application down; the failure shows in `failed`
+            self.failed += len(batch)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Export what is queued and stop the thread."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def flush(self) -> None:
+        """Export everything queued so far, in the calling thread."""
+        batch = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                batch.append(item)
+        if batch:
+            self._export(batch)
+
+
+class Tracer:
+    """Sampling decisions and the destinations of finished spans."""
+
+    def __init__(self, sample_rate: float, buffer_size: int, processor: Optional[BatchProcessor] = None):
+        self.sample_rate = sample_rate
+        self.processor = processor
+        # The newest finished spans, for the debug endpoint; deque appends are thread-safe
+        self.buffer: "deque[Span]" = deque(maxlen=buffer_size)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether anything is traced at all: by sampling, or exported for upstream traces."""
+        return self.sample_rate > 0 or self.processor is not None
+
+    def should_sample(self, parent: Optional["TraceParent"] = None) -> bool:
+        """Whether to trace a request continuing `parent` (None for a new trace)."""
+        if parent is not None and self.enabled:
+            return parent.sampled
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def end(self, finished: Span) -> None:
+        finished.end_ns = time.time_ns()
+        self.buffer.append(finished)
+        if self.processor is not None:
+            self.processor.submit(finished)
+
+    def recent_traces(self, limit: int) -> ListTyping[Dict[str, Any]]:
+        """The `limit` most recent traces in the buffer, newest first, with their spans in start order."""
+        traces: Dict[int, ListTyping[Span]] = {}
+        for item in reversed(list(self.buffer)):
+            if item.trace_id not in traces:
+                if len(traces) == limit:
+                    continue
+                traces[item.trace_id] = []
+            traces[item.trace_id].append(item)
+        return [
+            {"trace_id": f"{trace_id:032x}", "spans": [item.to_dict() for item in sorted(spans, key=lambda s: s.start_ns)]}
+            for trace_id, spans in traces.items()
+        ]
+
+    def clear(self) -> None:
+        self.buffer.clear()
+
+
+class TraceParent(NamedTuple):
+    trace_id: int
+    span_id: int
+    sampled: bool
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[TraceParent]:
+    """The W3C trace context in a `traceparent` header, None if absent or malformed."""
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16 or len(parts[3]) != 2:
+        return None
+    try:
+        trace_id, span_id, flags = int(parts[1], 16), int(parts[2], 16), int(parts[3], 16)
+    except ValueError:
+        return None
+    if trace_id == 0 or span_id == 0:
+        return None
+    return TraceParent(trace_id, span_id, bool(flags & 1))
+
+
+class TracingMiddleware:
+    """ASGI middleware opening the root span of each sampled HTTP request."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        parent = None
+        for name, value in scope["headers"]:
+            if name == b"traceparent":
+                parent = parse_traceparent(value.decode("latin-1"))
+                break
+        if not tracer.should_sample(parent):
+            await self.app(scope, receive, send)
+            return
+
+        root = Span(
+            scope["method"],
+            parent.trace_id if parent is not None else random.getrandbits(128) or 1,
+            parent.span_id if parent is not None else None,
+            KIND_SERVER,
+        )
+        root.attributes["http.method"] = scope["method"]
+        root.attributes["url.path"] = scope["path"]
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                root.attributes["http.status_code"] = message["status"]
+                if message["status"] >= 500:
+                    root.error = f"HTTP {message['status']}"
+            await send(message)
+
+        token = _current.set(root)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            root.error = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            _current.reset(token)
+            template = getattr(scope.get("route"), "path_format", None)
+            if template is not None:
+                root.name = f"{scope['method']} {template}"
+                root.attributes["http.route"] = template
+            tracer.end(root)
+
+
+def build_processor() -> Optional[BatchProcessor]:
+    """Create the exporting processor selected by TRACING_EXPORTER, None when spans are only buffered."""
+    if settings.TRACING_EXPORTER == "file":
+        if not settings.TRACING_FILE_PATH:
+            raise ValueError("TRACING_FILE_PATH is required for the file span exporter")
+        return BatchProcessor(FileExporter(settings.TRACING_FILE_PATH))
+    if settings.TRACING_EXPORTER == "otlp":
+        if not settings.TRACING_OTLP_ENDPOINT:
+            raise ValueError("TRACING_OTLP_ENDPOINT is required for the otlp span exporter")
+        return BatchProcessor(OTLPHttpExporter(settings.TRACING_OTLP_ENDPOINT))
+    if settings.TRACING_EXPORTER:
+        raise ValueError(f"Unknown TRACING_EXPORTER {settings.TRACING_EXPORTER!r}")
+    return None
+
+
+# Global tracer instance
+tracer = Tracer(
+    sample_rate=settings.TRACING_SAMPLE_RATE,
+    buffer_size=settings.TRACING_BUFFER_SIZE,
+    processor=build_processor(),
+)
@@ -1,15 +1,49 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+import functools
+import inspect
+from typing import Any, Callable, Dict, Generic, List, Optional, Sequence, Tuple, Type, TypeVar, Union
 from pydantic import BaseModel
+from sqlalchemy import func, literal, select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from fastapi import HTTPException
+from app.core.conditional import CollectionStamp
+from app.core.tracing import current_span, span
 from app.models.base import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+def _traced_method(owner: str, name: str, method: Callable[..., Any]) -> Callable[..., Any]:
+    """`method` run in a span named after its class, tagged with the CRUD object's model."""
+    span_name = f"{owner}.{name}"
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if current_span() is None:
+            return method(self, *args, **kwargs)
+        with span(span_name, model=self.model.__name__):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _trace_methods(cls: type) -> None:
+    """
+    Wrap the public methods `cls` defines in spans. Generator methods (the
+    streaming reads) are consumed after they return, so a span around the
+    call would time nothing and they are left alone.
+    """
+    for name, attribute in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.isfunction(attribute) or inspect.isgeneratorfunction(attribute):
+            continue
+        setattr(cls, name, _traced_method(cls.__name__, name, attribute))
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _trace_methods(cls)
+
     def __init__(self, model: Type[ModelType]):
         """
         CRUD object with default methods to Create, Read, Update, Delete (CRUD).
@@ -24,6 +58,33 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def get_multi(self, db: Session, *, skip: int = 0, limit: int = 100) -> List[ModelType]:
         return db.query(self.model).offset(skip).limit(limit).all()
 
+    def collection_stamp(
+        self,
+        db: Session,
+        *criteria: Any,
+        joins: Sequence[Tuple[Any, Any]] = (),
+        model: Optional[Type[Base]] = None,
+        checksum: Optional[Any] = None,
+    ) -> CollectionStamp:
+        """
+        Count, highest id, sum of versions and latest update of the rows of
+        `model` (this CRUD's by default) matching `criteria`, after joining
+        each `(target, onclause)` of `joins`, plus the sum of the `checksum`
+        column if given, in one aggregate query. See app/core/conditional.py.
+        """
+        model = model or self.model
+        versioned = hasattr(model, "version")
+        query = select(
+            func.count(model.id),
+            func.max(model.id),
+            func.coalesce(func.sum(model.version), 0) if versioned else literal(0),
+            func.max(model.updated_at) if versioned else literal(None),
+            func.coalesce(func.sum(checksum), 0) if checksum is not None else literal(0),
+        ).select_from(model)
+        for target, onclause in joins:
+            query = query.join(target, onclause)
+        return CollectionStamp(*db.execute(query.where(*criteria)).one())
+
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         try:
             obj_in_data = obj_in.model_dump()
@@ -36,6 +97,8 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             db.rollback()
             if "unique constraint" in str(e).lower():
                 raise HTTPException(status_code=409, detail="Resource already exists")
+            elif "exclusion constraint" in str(e).lower():
+                raise HTTPException(status_code=409, detail="Resource conflicts with an existing one")
             elif "foreign key constraint" in str(e).lower():
                 raise HTTPException(status_code=400, detail="Invalid reference to related resource")
             else:
@@ -69,6 +132,8 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             db.rollback()
             if "unique constraint" in str(e).lower():
                 raise HTTPException(status_code=409, detail="Resource already exists")
+            elif "exclusion constraint" in str(e).lower():
+                raise HTTPException(status_code=409, detail="Resource conflicts with an existing one")
             elif "foreign key constraint" in str(e).lower():
                 raise HTTPException(status_code=400, detail="Invalid reference to related resource")
             else:
@@ -95,3 +160,6 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         except SQLAlchemyError as e:
             db.rollback()
             raise HTTPException(status_code=500, detail="Database error occurred")
+
+
+_trace_methods(CRUDBase)
@@ -1,11 +1,18 @@
 # backend/app/crud/crud_calendar.py
+from fastapi import HTTPException
+from sqlalchemy import exists, or_, select, union, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload, selectinload
-from typing import List as ListTyping
+from typing import Any, Dict, List as ListTyping, Optional, Union
 
+from app.core import changes, reminders
 from app.crud.base import CRUDBase
-from app.models.calendar import Calendar, CalendarType
+from app.models.calendar import Calendar, CalendarType, calendar_user_association
+from app.models.event import Event
 from app.schemas.calendar import CalendarCreate, CalendarUpdate
 
+OVERLAPPING_EVENTS_DETAIL = "Calendar already contains overlapping events"
+
 class CRUDCalendar(CRUDBase[Calendar, CalendarCreate, CalendarUpdate]):
     def create_with_owner(
         self, db: Session, *, obj_in: CalendarCreate, owner_id: int, calendar_type: CalendarType = CalendarType.GENERAL
@@ -23,14 +30,89 @@ class CRUDCalendar(CRUDBase[Calendar, CalendarCreate, CalendarUpdate]):
         db.refresh(db_obj)
         return db_obj
 
+    def update(
+        self,
+        db: Session,
+        *,
+        db_obj: Calendar,
+        obj_in: Union[CalendarUpdate, Dict[str, Any]]
+    ) -> Calendar:
+        """
+        Update a calendar. Toggling `no_double_booking` is copied onto the
+        calendar's events in the same transaction; turning it on fails with 409
+        if the calendar already holds overlapping events.
+        """
+        if isinstance(obj_in, dict):
+            update_data = dict(obj_in)
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+
+        if update_data.get("no_double_booking") is not None:
+            try:
+                db.execute(
+                    update(Event)
+                    .where(Event.calendar_id == db_obj.id)
+                    .values(no_double_booking=update_data["no_double_booking"])
+                    .execution_options(synchronize_session=False)
+                )
+                changes.record_bulk(db, Event, db_obj.id)
+            except IntegrityError:
+                db.rollback()
+                raise HTTPException(
+                    status_code=409,
+                    detail=OVERLAPPING_EVENTS_DETAIL
+                )
+            if update_data["no_double_booking"]:
+                # The exclusion constraint only exists on PostgreSQL
+                from app.crud import event as event_crud
+                event_crud._check_double_booking(db, db_obj.id, detail=OVERLAPPING_EVENTS_DETAIL)
+        else:
+            update_data.pop("no_double_booking", None)
+        return super().update(db, db_obj=db_obj, obj_in=update_data)
+
+    def remove(self, db: Session, *, id: int) -> Calendar:
+        """
+        Delete a calendar together with its lists and events.
+        """
+        calendar = super().remove(db, id=id)
+        reminders.calendar_deleted(id)
+        return calendar
+
+    def _people_options(self, *, with_members: bool = True):
+        """Loader options for the owner (joined) and members (one extra SELECT ... IN)."""
+        options = [joinedload(Calendar.owner)]
+        if with_members:
+            options.append(selectinload(Calendar.members))
+        return options
+
+    def get(self, db: Session, id: Any, *, with_members: bool = True) -> Optional[Calendar]:
+        """
+        Get a calendar with its owner and, unless `with_members` is False, its
+        members eagerly loaded.
+        """
+        return (
+            db.query(self.model)
+            .options(*self._people_options(with_members=with_members))
+            .filter(Calendar.id == id)
+            .first()
+        )
+
     def get_multi_by_owner(
-        self, db: Session, *, owner_id: int, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        *,
+        owner_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        with_members: bool = True,
     ) -> ListTyping[Calendar]:
         """
-        Retrieve calendars for a specific owner.
+        Retrieve calendars for a specific owner, with the owner eagerly loaded
+        and, unless `with_members` is False, the members too.
         """
         return (
             db.query(self.model)
+            .options(*self._people_options(with_members=with_members))
             .filter(Calendar.owner_id == owner_id)
             .offset(skip)
             .limit(limit)
@@ -47,6 +129,7 @@ class CRUDCalendar(CRUDBase[Calendar, CalendarCreate, CalendarUpdate]):
         return (
             db.query(Calendar)
             .options(
+                *self._people_options(),
                 selectinload(Calendar.lists),
                 selectinload(Calendar.events)
             )
@@ -65,6 +148,7 @@ class CRUDCalendar(CRUDBase[Calendar, CalendarCreate, CalendarUpdate]):
             db.query(Calendar)
             .options(
                 selectinload(Calendar.lists).selectinload("items").selectinload("votes"),
+                joinedload(Calendar.owner),
                 selectinload(Calendar.events),
                 selectinload(Calendar.members)
             )
@@ -72,4 +156,44 @@ class CRUDCalendar(CRUDBase[Calendar, CalendarCreate, CalendarUpdate]):
             .first()
         )
 
+    def get_member_ids(self, db: Session, *, calendar_id: int) -> ListTyping[int]:
+        """
+        Get the ids of everyone on a calendar: its owner plus its members.
+        """
+        owner = select(Calendar.owner_id).where(Calendar.id == calendar_id)
+        members = select(calendar_user_association.c.user_id).where(
+            calendar_user_association.c.calendar_id == calendar_id
+        )
+        return list(db.execute(union(owner, members)).scalars())
+
+    def accessible_ids_query(self, *, user_ids: ListTyping[int]):
+        """
+        Build a SELECT of ids of calendars owned by, or shared with, any of `user_ids`.
+        Meant to be used as a subquery, e.g. `Event.calendar_id.in_(...)`.
+        """
+        owned = select(Calendar.id).where(Calendar.owner_id.in_(user_ids))
+        shared = select(calendar_user_association.c.calendar_id).where(
+            calendar_user_association.c.user_id.in_(user_ids)
+        )
+        return union(owned, shared)
+
+    def access_clause(self, *, user_id: int):
+        """
+        Build a boolean expression that is true when `user_id` owns or is a member
+        of `Calendar`, for queries that already join the calendars table.
+        """
+        return or_(
+            Calendar.owner_id == user_id,
+            exists().where(
+                calendar_user_association.c.calendar_id == Calendar.id,
+                calendar_user_association.c.user_id == user_id,
+            ),
+        )
+
+    def get_accessible_ids(self, db: Session, *, user_id: int) -> ListTyping[int]:
+        """
+        Get the ids of all calendars a user owns or is a member of.
+        """
+        return list(db.execute(self.accessible_ids_query(user_ids=[user_id])).scalars())
+
 calendar_crud = CRUDCalendar(Calendar)
@@ -1,38 +1,440 @@
-from sqlalchemy.orm import Session
-from typing import List as ListTyping
-from datetime import datetime
+import heapq
+from itertools import dropwhile, islice
+from fastapi import HTTPException
+from sqlalchemy import and_, delete, func, insert, inspect, literal_column, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased, load_only
+from typing import Any, Dict, Iterable, Iterator, List as ListTyping, Optional, Sequence, Tuple, Union
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
 
+from app.core import changes, density, recurrence, reminders
+from app.core.config import settings
+from app.core.density import density_cache
+from app.core.recurrence import EventOccurrence
+from app.core.scheduling import Interval
+from app.core.conditional import CollectionStamp
 from app.crud.base import CRUDBase
-from app.models.event import Event
+from app.crud.crud_calendar import calendar_crud
+from app.models.calendar import Calendar
+from app.models.event import Event, EventArchive, EVENT_PERIOD_SQL
 from app.schemas.event import EventCreate, EventUpdate
 
+DOUBLE_BOOKING_DETAIL = "Event overlaps another event in a calendar that does not allow double booking"
+
 class CRUDEvent(CRUDBase[Event, EventCreate, EventUpdate]):
     def create_with_user(
         self, db: Session, *, obj_in: EventCreate, creator_id: int
     ) -> Event:
         """
         Create a new event with creator information.
+        Raises 409 if the calendar forbids double booking and the event overlaps
+        another one (enforced by the database on PostgreSQL).
         """
         obj_in_data = obj_in.model_dump()
         obj_in_data["creator_id"] = creator_id
+        obj_in_data["recurrence_end"] = recurrence.series_end(
+            obj_in.recurrence_rule, obj_in.start_time, obj_in.end_time
+        )
+        # A primary key lookup, skipped when the calendar is already in the session
+        calendar = db.get(Calendar, obj_in.calendar_id)
+        obj_in_data["no_double_booking"] = bool(calendar and calendar.no_double_booking)
         db_obj = self.model(**obj_in_data)
         db.add(db_obj)
-        db.commit()
+        try:
+            if db_obj.no_double_booking:
+                # Assigns the id the check filters on
+                db.flush()
+                self._check_double_booking(db, db_obj.calendar_id, Event.id == db_obj.id)
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            if "exclusion constraint" in str(e).lower():
+                raise HTTPException(status_code=409, detail=DOUBLE_BOOKING_DETAIL)
+            raise
         db.refresh(db_obj)
+        self._invalidate_density(db_obj.calendar_id, db_obj.recurrence_rule, db_obj.start_time)
+        reminders.event_saved(db_obj)
+        return db_obj
+
+    def _check_double_booking(
+        self, db: Session, calendar_id: int, *criteria: Any, detail: str = DOUBLE_BOOKING_DETAIL
+    ) -> None:
+        """
+        Raise 409 with `detail` if an event of the calendar matching `criteria`
+        overlaps another one while both forbid double booking. PostgreSQL
+        enforces this with `excl_event_no_double_booking`; other databases flush
+        the pending writes and run the same test as a query, before the commit.
+        """
+        if db.get_bind().dialect.name == "postgresql":
+            return
+        db.flush()
+        other = aliased(Event)
+        # Same test as the constraint: single events, half-open, empty spans never clash
+        clash = db.scalar(
+            select(Event.id)
+            .join(other, and_(
+                other.calendar_id == Event.calendar_id,
+                other.id != Event.id,
+                other.no_double_booking,
+                other.recurrence_rule.is_(None),
+                other.end_time > other.start_time,
+                other.start_time < Event.end_time,
+                Event.start_time < other.end_time,
+            ))
+            .where(
+                Event.calendar_id == calendar_id,
+                Event.no_double_booking,
+                Event.recurrence_rule.is_(None),
+                Event.end_time > Event.start_time,
+                *criteria,
+            )
+            .limit(1)
+        )
+        if clash is not None:
+            db.rollback()
+            raise HTTPException(status_code=409, detail=detail)
+
+    def _invalidate_density(
+        self, calendar_id: int, rule: Optional[str], *start_times: datetime
+    ) -> None:
+        # A series has occurrences in any bucket, so drop the whole calendar
+        if rule:
+            density_cache.invalidate(calendar_id)
+        else:
+            density_cache.invalidate(calendar_id, *start_times)
+
+    def update(
+        self,
+        db: Session,
+        *,
+        db_obj: Event,
+        obj_in: Union[EventUpdate, Dict[str, Any]]
+    ) -> Event:
+        """
+        Update an event, keeping `recurrence_end` in step with the series.
+        """
+        if isinstance(obj_in, dict):
+            update_data = dict(obj_in)
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+
+        if {"recurrence_rule", "start_time", "end_time"} & update_data.keys():
+            try:
+                recurrence.check_duration(
+                    update_data.get("start_time", db_obj.start_time),
+                    update_data.get("end_time", db_obj.end_time),
+                )
+                update_data["recurrence_end"] = recurrence.series_end(
+                    update_data.get("recurrence_rule", db_obj.recurrence_rule),
+                    update_data.get("start_time", db_obj.start_time),
+                    update_data.get("end_time", db_obj.end_time),
+                )
+            except ValueError as e:
+                # Duration, UNTIL and occurrence limits depend on stored values unknown to EventUpdate
+                raise HTTPException(status_code=422, detail=str(e))
+        old_rule, old_start = db_obj.recurrence_rule, db_obj.start_time
+        booking_fields = {"start_time", "end_time", "recurrence_rule"} & update_data.keys()
+        if db_obj.no_double_booking and booking_fields:
+            for field in booking_fields:
+                setattr(db_obj, field, update_data[field])
+            self._check_double_booking(db, db_obj.calendar_id, Event.id == db_obj.id)
+        db_obj = super().update(db, db_obj=db_obj, obj_in=update_data)
+        self._invalidate_density(
+            db_obj.calendar_id, old_rule or db_obj.recurrence_rule, old_start, db_obj.start_time
+        )
+        reminders.event_saved(db_obj)
         return db_obj
 
+    def remove(self, db: Session, *, id: int) -> Event:
+        """
+        Delete an event.
+        """
+        obj = super().remove(db, id=id)
+        self._invalidate_density(obj.calendar_id, obj.recurrence_rule, obj.start_time)
+        reminders.event_deleted(obj.id)
+        return obj
+
+    def bulk_create_for_calendar(
+        self,
+        db: Session,
+        *,
+        rows: Iterable[Dict[str, Any]],
+        calendar_id: int,
+        creator_id: int,
+        batch_size: int = 1000
+    ) -> int:
+        """
+        Insert many events into a calendar in one transaction.
+
+        `rows` is consumed lazily and written in batches of `batch_size` through
+        multi-row INSERTs, so the input never has to fit in memory. Nothing is
+        committed if any row (or the iterator itself) raises, and nothing is
+        inserted (409) if the calendar forbids double booking and an event
+        overlaps another one. Returns the number of inserted events.
+        """
+        # Core insert on the table skips ORM bulk bookkeeping; one executemany
+        # (multi-row VALUES on PostgreSQL) per batch
+        statement = insert(Event.__table__)
+        calendar = db.get(Calendar, calendar_id)
+        no_double_booking = bool(calendar and calendar.no_double_booking)
+        inserted = 0
+        batch: ListTyping[Dict[str, Any]] = []
+        try:
+            # Ids only grow, so the new events are the calendar's ids past this one
+            last_id = db.scalar(
+                select(func.coalesce(func.max(Event.id), 0)).where(Event.calendar_id == calendar_id)
+            )
+            for row in rows:
+                batch.append({
+                    **row,
+                    "calendar_id": calendar_id,
+                    "creator_id": creator_id,
+                    "no_double_booking": no_double_booking,
+                })
+                if len(batch) >= batch_size:
+                    db.execute(statement, batch)
+                    inserted += len(batch)
+                    batch = []
+            if batch:
+                db.execute(statement, batch)
+                inserted += len(batch)
+            if no_double_booking:
+                self._check_double_booking(db, calendar_id, Event.id > last_id)
+            changes.record_bulk(db, Event, calendar_id, Event.id > last_id)
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            if "exclusion constraint" in str(e).lower():
+                raise HTTPException(status_code=409, detail=DOUBLE_BOOKING_DETAIL)
+            raise
+        except Exception:
+            db.rollback()
+            raise
+        density_cache.invalidate(calendar_id)
+        reminders.calendar_changed(calendar_id)
+        return inserted
+
+    def stream_by_calendar(
+        self,
+        db: Session,
+        *,
+        calendar_id: int,
+        batch_size: int = 1000,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[Union[Event, EventArchive]]:
+        """
+        Iterate over every event of a calendar using a server-side cursor,
+        archived events first. Rows are fetched `batch_size` at a time, so
+        memory stays flat. Pass `fields` to get row tuples of those columns
+        instead of events.
+        """
+        models = [EventArchive, Event] if self.archive_horizon() is not None else [Event]
+        for model in models:
+            entities = [getattr(model, name) for name in fields] if fields else [model]
+            yield from (
+                db.query(*entities)
+                .filter(model.calendar_id == calendar_id)
+                .order_by(model.start_time, model.id)
+                .yield_per(batch_size)
+            )
+
+    def stamps_by_calendar(self, db: Session, *, calendar_id: int) -> ListTyping[CollectionStamp]:
+        """
+        The collection stamps of a calendar's events, and of its archived
+        events when archiving is enabled.
+        """
+        models = [Event, EventArchive] if self.archive_horizon() is not None else [Event]
+        return [
+            self.collection_stamp(db, model.calendar_id == calendar_id, model=model)
+            for model in models
+        ]
+
+    def archive_horizon(self) -> Optional[datetime]:
+        """
+        Events that ended before this instant may have been moved to
+        `events_archive`. None when archiving is disabled.
+        """
+        if settings.EVENT_ARCHIVE_AFTER_DAYS is None:
+            return None
+        return datetime.now(timezone.utc) - timedelta(days=settings.EVENT_ARCHIVE_AFTER_DAYS)
+
+    def _models_from(self, start_date: datetime) -> ListTyping[type]:
+        """The tables a query for events from `start_date` onwards has to read."""
+        horizon = self.archive_horizon()
+        if horizon is not None and recurrence.as_utc(start_date) < horizon:
+            return [Event, EventArchive]
+        return [Event]
+
+    def get_archived(self, db: Session, id: Any) -> Optional[EventArchive]:
+        """
+        Get an event that was moved to the archive.
+        """
+        return db.query(EventArchive).filter(EventArchive.id == id).first()
+
+    def get_if_accessible(
+        self, db: Session, *, id: int, user_id: int, include_archived: bool = False
+    ) -> Union[Event, EventArchive]:
+        """
+        Get an event together with whether `user_id` can access its calendar, in
+        one joined query. Raises 404 if the event does not exist and 403 if the
+        user cannot access it. With `include_archived`, an event missing from
+        `events` is looked up in the archive (a second query).
+        """
+        models = [Event, EventArchive] if include_archived else [Event]
+        for model in models:
+            row = db.execute(
+                select(model, calendar_crud.access_clause(user_id=user_id).label("allowed"))
+                .join(Calendar, Calendar.id == model.calendar_id)
+                .where(model.id == id)
+            ).first()
+            if row is not None:
+                break
+        else:
+            raise HTTPException(status_code=404, detail="Event not found")
+        if not row.allowed:
+            raise HTTPException(
+                status_code=403,
+                detail="Not enough permissions to access this calendar"
+            )
+        return row[0]
+
+    def archive_before(
+        self, db: Session, *, before: datetime, batch_size: int = 1000
+    ) -> int:
+        """
+        Move events that ended before `before` into `events_archive`: single
+        events by their end (or start) time, series by the end of their last
+        occurrence. Series that never end stay in `events`.
+
+        Rows are moved `batch_size` at a time, one transaction per batch, so the
+        job can be interrupted safely. Returns the number of archived events.
+        """
+        archived = or_(
+            and_(
+                Event.recurrence_rule.is_(None),
+                Event.start_time < before,
+                or_(Event.end_time.is_(None), Event.end_time < before),
+            ),
+            and_(
+                Event.recurrence_rule.isnot(None),
+                Event.recurrence_end < before,
+            ),
+        )
+        columns = [column.name for column in EventArchive.__table__.columns if column.name != "archived_at"]
+        moved = 0
+        while True:
+            ids = db.execute(
+                select(Event.id).where(archived).order_by(Event.start_time).limit(batch_size)
+            ).scalars().all()
+            if not ids:
+                return moved
+            try:
+                db.execute(
+                    insert(EventArchive.__table__).from_select(
+                        columns,
+                        select(*(Event.__table__.c[name] for name in columns)).where(Event.id.in_(ids)),
+                    )
+                )
+                db.execute(delete(Event.__table__).where(Event.id.in_(ids)))
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            moved += len(ids)
+
+    def _merge_occurrences(
+        self, streams: ListTyping[Iterable], *, skip: int, limit: int
+    ) -> ListTyping[Union[Event, EventOccurrence]]:
+        """
+        Merge start-ordered streams of rows and expanded occurrences,
+        consuming only as much of each stream as the requested page needs.
+        """
+        merged = heapq.merge(*streams, key=recurrence.start_key)
+        return list(islice(merged, skip, skip + limit))
+
+    def _load_only(self, query, model: type, fields: Optional[Iterable[str]]):
+        """
+        Restrict `query` to the columns of `model` named in `fields`, plus the
+        ones paging and merging need; None loads every column.
+        """
+        if fields is None:
+            return query
+        mapped = inspect(model).column_attrs
+        names = {"id", "start_time", *fields}
+        return query.options(load_only(*(getattr(model, name) for name in names if name in mapped)))
+
     def get_multi_by_calendar(
-        self, db: Session, *, calendar_id: int, skip: int = 0, limit: int = 100
-    ) -> ListTyping[Event]:
+        self,
+        db: Session,
+        *,
+        calendar_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        fields: Optional[Iterable[str]] = None,
+        include_archived: bool = False,
+    ) -> ListTyping[Union[Event, EventArchive]]:
         """
         Retrieve events associated with a specific calendar.
+        Pass `fields` to load only those attributes. With `include_archived`
+        (and archiving enabled), archived events are included too and the
+        results are ordered by start time.
         """
-        return (
-            db.query(self.model)
-            .filter(Event.calendar_id == calendar_id)
-            .offset(skip)
-            .limit(limit)
+        if not include_archived or self.archive_horizon() is None:
+            return (
+                self._load_only(db.query(self.model), self.model, fields)
+                .filter(Event.calendar_id == calendar_id)
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+        streams = [
+            self._load_only(db.query(model), model, fields)
+            .filter(model.calendar_id == calendar_id)
+            .order_by(model.start_time, model.id)
+            .limit(skip + limit)
             .all()
+            for model in (EventArchive, Event)
+        ]
+        return self._merge_occurrences(streams, skip=skip, limit=limit)
+
+    def overlaps(
+        self,
+        db: Session,
+        *,
+        start_date: datetime,
+        end_date: datetime,
+        inclusive: bool = True,
+        model: type = Event
+    ):
+        """
+        Build a filter matching events whose span intersects [start_date, end_date].
+        With `inclusive=False` the window is open, so events merely touching it
+        (ending at `start_date` or starting at `end_date`) do not match.
+        `model` is `Event` or `EventArchive`.
+
+        On PostgreSQL this is a `&&` range test served by the GiST index
+        `idx_event_calendar_period`. The archive and other databases get plain
+        comparisons plus a lower bound on `start_time` (window start minus
+        EVENT_MAX_DURATION_DAYS, the longest duration events may have) so the
+        (calendar_id, start_time) B-tree index can bound the scan.
+        """
+        if model is Event and db.get_bind().dialect.name == "postgresql":
+            bounds = "'[]'" if inclusive else "'()'"
+            window = func.tstzrange(start_date, end_date, literal_column(bounds))
+            return literal_column(EVENT_PERIOD_SQL).op("&&")(window)
+
+        earliest_start = start_date - timedelta(days=settings.EVENT_MAX_DURATION_DAYS)
+        if inclusive:
+            return and_(
+                model.start_time <= end_date,
+                model.start_time >= earliest_start,
+                or_(model.start_time >= start_date, model.end_time >= start_date),
+            )
+        return and_(
+            model.start_time < end_date,
+            model.start_time >= earliest_start,
+            or_(model.start_time > start_date, model.end_time > start_date),
         )
 
     def get_multi_by_date_range(
@@ -43,20 +445,125 @@ class CRUDEvent(CRUDBase[Event, EventCreate, EventUpdate]):
         start_date: datetime,
         end_date: datetime,
         skip: int = 0,
-        limit: int = 100
-    ) -> ListTyping[Event]:
+        limit: int = 100,
+        fields: Optional[Iterable[str]] = None,
+    ) -> ListTyping[Union[Event, EventOccurrence]]:
         """
-        Get events within a specific date range for a calendar.
+        Get events overlapping a specific date range for a calendar.
+        Multi-day events that started before `start_date` but are still running
+        are included, and recurring events contribute one entry per occurrence
+        in the range. Archived events are included when the range reaches back
+        past the archive horizon. Results are ordered by start time.
+        Pass `fields` to load only those attributes of single events; series
+        are loaded whole since their occurrences copy every column.
         """
-        return (
-            db.query(self.model)
-            .filter(Event.calendar_id == calendar_id)
-            .filter(Event.start_time >= start_date)
-            .filter(Event.start_time <= end_date)
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        streams: ListTyping[Iterable] = []
+        for model in self._models_from(start_date):
+            streams.append(
+                self._load_only(db.query(model), model, fields)
+                .filter(model.calendar_id == calendar_id)
+                .filter(model.recurrence_rule.is_(None))
+                .filter(self.overlaps(db, start_date=start_date, end_date=end_date, model=model))
+                .order_by(model.start_time, model.id)
+                .limit(skip + limit)
+                .all()
+            )
+            series = (
+                db.query(model)
+                .filter(model.calendar_id == calendar_id)
+                .filter(model.recurrence_rule.isnot(None))
+                .filter(model.start_time <= end_date)
+                .filter(or_(model.recurrence_end.is_(None), model.recurrence_end >= start_date))
+                .all()
+            )
+            streams.extend(
+                recurrence.expand(item, start=start_date, end=end_date) for item in series
+            )
+        return self._merge_occurrences(streams, skip=skip, limit=limit)
+
+    def get_density(
+        self,
+        db: Session,
+        *,
+        calendar_id: int,
+        start_date: datetime,
+        end_date: datetime,
+        granularity: str,
+        tz: str
+    ) -> ListTyping[Tuple[datetime, int]]:
+        """
+        Count events per day, week or month (in time zone `tz`) starting in
+        [start_date, end_date). Recurring events count once per occurrence.
+
+        Buckets already in `density_cache` are reused; the span between the first
+        and last missing bucket is counted with one aggregate query and cached.
+        Returns (local bucket start, count) for every bucket, empty ones included.
+        """
+        zone = ZoneInfo(tz)
+        buckets = list(density.iter_buckets(start_date, end_date, granularity, zone))
+        counts: Dict[datetime, int] = {}
+        missing = []
+        for local, utc_start, _ in buckets:
+            cached = density_cache.get(calendar_id, granularity, tz, utc_start)
+            if cached is None:
+                missing.append(utc_start)
+            else:
+                counts[local] = cached
+        if missing:
+            span = [bucket for bucket in buckets if missing[0] <= bucket[1] <= missing[-1]]
+            computed = self._count_by_bucket(
+                db, calendar_id=calendar_id, buckets=span, granularity=granularity, zone=zone
+            )
+            counts.update(computed)
+            density_cache.put_many(calendar_id, granularity, tz, {
+                (utc_start, utc_end): computed[local] for local, utc_start, utc_end in span
+            })
+        return [(local, counts[local]) for local, _, _ in buckets]
+
+    def _count_by_bucket(
+        self,
+        db: Session,
+        *,
+        calendar_id: int,
+        buckets: ListTyping[density.Bucket],
+        granularity: str,
+        zone: ZoneInfo
+    ) -> Dict[datetime, int]:
+        lower, upper = buckets[0][1], buckets[-1][2]
+        counts = {local: 0 for local, _, _ in buckets}
+        on_postgresql = db.get_bind().dialect.name == "postgresql"
+        for model in self._models_from(lower):
+            singles = and_(
+                model.calendar_id == calendar_id,
+                model.recurrence_rule.is_(None),
+                model.start_time >= lower,
+                model.start_time < upper,
+            )
+            if on_postgresql:
+                bucket = func.date_trunc(granularity, func.timezone(zone.key, model.start_time))
+                for local, count in db.query(bucket, func.count()).filter(singles).group_by(bucket):
+                    key = local.replace(tzinfo=zone)
+                    if key in counts:
+                        counts[key] += count
+            else:
+                starts = (start_time for start_time, in db.query(model.start_time).filter(singles))
+                density.add_to_buckets(counts, starts, granularity, zone)
+
+            series = (
+                db.query(model)
+                .filter(model.calendar_id == calendar_id)
+                .filter(model.recurrence_rule.isnot(None))
+                .filter(model.start_time < upper)
+                .filter(or_(model.recurrence_end.is_(None), model.recurrence_end >= lower))
+            )
+            for item in series:
+                starts = (
+                    occurrence.start_time
+                    for occurrence in recurrence.expand(item, start=lower, end=upper, include_ongoing=False)
+                    if occurrence.start_time < upper
+                )
+                density.add_to_buckets(counts, starts, granularity, zone)
+        return counts
 
     def get_upcoming_events(
         self, 
@@ -65,23 +572,191 @@ class CRUDEvent(CRUDBase[Event, EventCreate, EventUpdate]):
         calendar_id: int,
         from_time: datetime = None,
         skip: int = 0,
-        limit: int = 100
-    ) -> ListTyping[Event]:
+        limit: int = 100,
+        fields: Optional[Iterable[str]] = None,
+    ) -> ListTyping[Union[Event, EventOccurrence]]:
         """
         Get upcoming events for a calendar.
+        Recurring events contribute their next occurrences, merged in start order.
+        Pass `fields` to load only those attributes of single events.
         """
         if from_time is None:
             from_time = datetime.utcnow()
         
-        return (
-            db.query(self.model)
+        single_events = (
+            self._load_only(db.query(self.model), self.model, fields)
             .filter(Event.calendar_id == calendar_id)
+            .filter(Event.recurrence_rule.is_(None))
             .filter(Event.start_time >= from_time)
             .order_by(Event.start_time)
-            .offset(skip)
-            .limit(limit)
+            .limit(skip + limit)
             .all()
         )
+        series = (
+            db.query(self.model)
+            .filter(Event.calendar_id == calendar_id)
+            .filter(Event.recurrence_rule.isnot(None))
+            .filter(or_(Event.recurrence_end.is_(None), Event.recurrence_end >= from_time))
+            .all()
+        )
+        streams = [single_events] + [
+            recurrence.expand(item, start=from_time, include_ongoing=False) for item in series
+        ]
+        return self._merge_occurrences(streams, skip=skip, limit=limit)
+
+    def get_agenda(
+        self,
+        db: Session,
+        *,
+        calendar_ids: ListTyping[int],
+        from_time: datetime,
+        after: Optional[Tuple[datetime, int]] = None,
+        limit: int = 50
+    ) -> ListTyping[Union[Event, EventOccurrence]]:
+        """
+        Get a single time-ordered feed of upcoming events across several calendars.
+
+        Keyset paginated on (start_time, id): `after` is the key of the last entry
+        of the previous page. Single events come from one query over all
+        calendars; recurring series are expanded and merged in.
+        """
+        from_time = recurrence.as_utc(from_time)
+        query = (
+            db.query(self.model)
+            .filter(Event.calendar_id.in_(calendar_ids))
+            .filter(Event.recurrence_rule.is_(None))
+            .filter(Event.start_time >= from_time)
+        )
+        expand_from = from_time
+        if after is not None:
+            after_start, after_id = recurrence.as_utc(after[0]), after[1]
+            query = query.filter(
+                or_(
+                    Event.start_time > after_start,
+                    and_(Event.start_time == after_start, Event.id > after_id),
+                )
+            )
+            expand_from = max(from_time, after_start)
+        single_events = query.order_by(Event.start_time, Event.id).limit(limit).all()
+
+        series = (
+            db.query(self.model)
+            .filter(Event.calendar_id.in_(calendar_ids))
+            .filter(Event.recurrence_rule.isnot(None))
+            .filter(or_(Event.recurrence_end.is_(None), Event.recurrence_end >= expand_from))
+            .all()
+        )
+        streams = [single_events]
+        for item in series:
+            occurrences = recurrence.expand(item, start=expand_from, include_ongoing=False)
+            if after is not None:
+                occurrences = dropwhile(
+                    lambda o: (o.start_time, o.id) <= (after_start, after_id), occurrences
+                )
+            streams.append(occurrences)
+
+        merged = heapq.merge(
+            *streams, key=lambda e: (recurrence.start_key(e), e.id)
+        )
+        return list(islice(merged, limit))
+
+    def get_conflicts(
+        self,
+        db: Session,
+        *,
+        calendar_ids: ListTyping[int],
+        start_time: datetime,
+        end_time: Optional[datetime],
+        exclude_id: Optional[int] = None,
+        limit: int = 20
+    ) -> ListTyping[Union[Event, EventOccurrence]]:
+        """
+        Get events on the given calendars that overlap [start_time, end_time).
+        Back-to-back events and events without a duration never conflict.
+        `exclude_id` skips the event being updated. Archived events are
+        included when the window reaches back past the archive horizon.
+        """
+        if end_time is None or recurrence.as_utc(end_time) <= recurrence.as_utc(start_time):
+            return []
+        window_start, window_end = recurrence.as_utc(start_time), recurrence.as_utc(end_time)
+        streams: ListTyping[Iterable] = []
+        for model in self._models_from(start_time):
+            query = (
+                db.query(model)
+                .filter(model.calendar_id.in_(calendar_ids))
+                .filter(model.recurrence_rule.is_(None))
+                .filter(self.overlaps(db, start_date=start_time, end_date=end_time, inclusive=False, model=model))
+            )
+            if exclude_id is not None:
+                query = query.filter(model.id != exclude_id)
+            streams.append(query.order_by(model.start_time, model.id).limit(limit).all())
+
+            series_query = (
+                db.query(model)
+                .filter(model.calendar_id.in_(calendar_ids))
+                .filter(model.recurrence_rule.isnot(None))
+                .filter(model.end_time.isnot(None))
+                .filter(model.start_time < end_time)
+                .filter(or_(model.recurrence_end.is_(None), model.recurrence_end > start_time))
+            )
+            if exclude_id is not None:
+                series_query = series_query.filter(model.id != exclude_id)
+            streams.extend(
+                (
+                    occurrence
+                    for occurrence in recurrence.expand(item, start=start_time, end=end_time)
+                    if window_start < occurrence.end_time and occurrence.start_time < window_end
+                )
+                for item in series_query.all()
+            )
+        return self._merge_occurrences(streams, skip=0, limit=limit)
+
+    def get_busy_intervals(
+        self,
+        db: Session,
+        *,
+        user_ids: ListTyping[int],
+        start_date: datetime,
+        end_date: datetime
+    ) -> ListTyping[Interval]:
+        """
+        Get (start, end) pairs of every event overlapping the window on any calendar
+        the given users can access. Single events are read as two columns only;
+        recurring series are expanded within the window. Events without a positive
+        duration are left out, since they do not block time. Archived events are
+        included when the window reaches back past the archive horizon.
+        """
+        calendar_ids = calendar_crud.accessible_ids_query(user_ids=user_ids)
+        intervals: ListTyping[Interval] = []
+        for model in self._models_from(start_date):
+            rows = (
+                db.query(model.start_time, model.end_time)
+                .filter(model.calendar_id.in_(calendar_ids))
+                .filter(model.recurrence_rule.is_(None))
+                .filter(model.end_time.isnot(None))
+                .filter(self.overlaps(db, start_date=start_date, end_date=end_date, model=model))
+                .all()
+            )
+            intervals.extend(
+                (recurrence.as_utc(start_time), recurrence.as_utc(end_time))
+                for start_time, end_time in rows
+            )
+
+            series = (
+                db.query(model)
+                .filter(model.calendar_id.in_(calendar_ids))
+                .filter(model.recurrence_rule.isnot(None))
+                .filter(model.end_time.isnot(None))
+                .filter(model.start_time <= end_date)
+                .filter(or_(model.recurrence_end.is_(None), model.recurrence_end >= start_date))
+                .all()
+            )
+            for item in series:
+                intervals.extend(
+                    (occurrence.start_time, occurrence.end_time)
+                    for occurrence in recurrence.expand(item, start=start_date, end=end_date)
+                )
+        return intervals
 
 # Create an instance of the CRUDEvent class for use in the API.
 event = CRUDEvent(Event)
\ No newline at end of file
@@ -1,25 +1,128 @@
+from fastapi import HTTPException
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from typing import List as ListTyping
+from typing import Any, Iterator, List as ListTyping, Optional, Sequence, Tuple
 
+from app.core.conditional import CollectionStamp
 from app.crud.base import CRUDBase
+from app.crud.crud_calendar import calendar_crud
+from app.models.calendar import Calendar
 from app.models.list import List
+from app.models.list_item import ListItem
+from app.models.vote import Vote
 from app.schemas.list import ListCreate, ListUpdate
 
 class CRUDList(CRUDBase[List, ListCreate, ListUpdate]):
     def get_multi_by_calendar(
-        self, db: Session, *, calendar_id: int, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        *,
+        calendar_id: int,
+        after_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100,
+        columns: Optional[Sequence[Any]] = None,
     ) -> ListTyping[List]:
         """
-        Retrieve lists associated with a specific calendar.
+        Retrieve lists associated with a specific calendar, in id order.
+        Pass the last id of the previous page as `after_id` to page through
+        them with an index range scan instead of an offset, and `columns` to
+        get row tuples of just those columns instead of lists.
         """
-        return (
-            db.query(self.model)
+        query = db.query(*(columns or [self.model])).filter(List.calendar_id == calendar_id)
+        if after_id is not None:
+            query = query.filter(List.id > after_id)
+        return query.order_by(List.id).offset(skip).limit(limit).all()
+
+    def get_multi_accessible(
+        self,
+        db: Session,
+        *,
+        user_id: int,
+        after_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100,
+        columns: Optional[Sequence[Any]] = None,
+    ) -> ListTyping[List]:
+        """
+        Retrieve the lists of every calendar `user_id` owns or is a member of,
+        in id order, with keyset pagination on `after_id`. Only the user's
+        calendars' lists are read, so the cost does not grow with the table.
+        Pass `columns` to get row tuples of just those columns instead of lists.
+        """
+        query = (
+            db.query(*(columns or [self.model]))
+            .join(Calendar, Calendar.id == List.calendar_id)
+            .filter(calendar_crud.access_clause(user_id=user_id))
+        )
+        if after_id is not None:
+            query = query.filter(List.id > after_id)
+        return query.order_by(List.id).offset(skip).limit(limit).all()
+
+    def stream_by_calendar(
+        self,
+        db: Session,
+        *,
+        calendar_id: int,
+        columns: Optional[Sequence[Any]] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[List]:
+        """
+        Iterate over every list of a calendar in id order using a server-side
+        cursor, `batch_size` rows at a time. Pass `columns` to get row tuples
+        of just those columns instead of lists.
+        """
+        yield from (
+            db.query(*(columns or [self.model]))
             .filter(List.calendar_id == calendar_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
+            .order_by(List.id)
+            .yield_per(batch_size)
         )
 
+    def stamp_by_calendar(self, db: Session, *, calendar_id: int) -> CollectionStamp:
+        """The collection stamp of a calendar's lists."""
+        return self.collection_stamp(db, List.calendar_id == calendar_id)
+
+    def stamp_accessible(self, db: Session, *, user_id: int) -> CollectionStamp:
+        """The collection stamp of the lists of every calendar `user_id` can access."""
+        return self.collection_stamp(
+            db,
+            calendar_crud.access_clause(user_id=user_id),
+            joins=[(Calendar, Calendar.id == List.calendar_id)],
+        )
+
+    def get_multi_with_counts(
+        self, db: Session, *, calendar_id: int, limit: int = 100
+    ) -> ListTyping[Tuple[List, int, int, int]]:
+        """
+        Retrieve the first `limit` lists of a calendar in id order, each with its
+        item count, completed item count and total votes, in one query.
+        """
+        item_count = (
+            select(func.count(ListItem.id))
+            .where(ListItem.list_id == List.id)
+            .scalar_subquery()
+        )
+        completed_count = (
+            select(func.count(ListItem.id))
+            .where(ListItem.list_id == List.id, ListItem.is_completed.is_(True))
+            .scalar_subquery()
+        )
+        vote_count = (
+            select(func.count(Vote.id))
+            .join(ListItem, ListItem.id == Vote.list_item_id)
+            .where(ListItem.list_id == List.id)
+            .scalar_subquery()
+        )
+        return [
+            tuple(row) for row in db.execute(
+                select(List, item_count, completed_count, vote_count)
+                .where(List.calendar_id == calendar_id)
+                .order_by(List.id)
+                .limit(limit)
+            )
+        ]
+
     def get_by_calendar_and_type(
         self, db: Session, *, calendar_id: int, list_type: str
     ) -> ListTyping[List]:
@@ -33,5 +136,25 @@ class CRUDList(CRUDBase[List, ListCreate, ListUpdate]):
             .all()
         )
 
+    def get_if_accessible(self, db: Session, *, id: int, user_id: int) -> List:
+        """
+        Get a list together with whether `user_id` can access its calendar, in
+        one joined query. Raises 404 if the list does not exist and 403 if the
+        user cannot access it.
+        """
+        row = db.execute(
+            select(List, calendar_crud.access_clause(user_id=user_id).label("allowed"))
+            .join(Calendar, Calendar.id == List.calendar_id)
+            .where(List.id == id)
+        ).first()
+        if row is None:
+            raise HTTPException(status_code=404, detail="List not found")
+        if not row.allowed:
+            raise HTTPException(
+                status_code=403,
+                detail="Not enough permissions to access this list"
+            )
+        return row[0]
+
 # Create an instance of the CRUDList class for use in the API.
 list_crud = CRUDList(List)
@@ -1,8 +1,13 @@
+from fastapi import HTTPException
 from sqlalchemy.orm import Session, joinedload, selectinload
-from typing import List as ListTyping, Optional
-from sqlalchemy import func
+from typing import Any, Iterator, List as ListTyping, Optional, Sequence, Tuple
+from sqlalchemy import func, select
 
+from app.core.conditional import CollectionStamp
 from app.crud.base import CRUDBase
+from app.crud.crud_calendar import calendar_crud
+from app.models.calendar import Calendar
+from app.models.list import List
 from app.models.list_item import ListItem
 from app.models.vote import Vote
 from app.schemas.list_item import ListItemCreate, ListItemUpdate
@@ -22,20 +27,106 @@ class CRUDListItem(CRUDBase[ListItem, ListItemCreate, ListItemUpdate]):
         db.refresh(db_obj)
         return db_obj
 
+    def get_if_accessible(self, db: Session, *, id: int, user_id: int) -> ListItem:
+        """
+        Get a list item together with whether `user_id` can access the calendar
+        of its list, in one joined query. Raises 404 if the item does not exist
+        and 403 if the user cannot access it.
+        """
+        row = db.execute(
+            select(ListItem, calendar_crud.access_clause(user_id=user_id).label("allowed"))
+            .join(List, List.id == ListItem.list_id)
+            .join(Calendar, Calendar.id == List.calendar_id)
+            .where(ListItem.id == id)
+        ).first()
+        if row is None:
+            raise HTTPException(status_code=404, detail="List item not found")
+        if not row.allowed:
+            raise HTTPException(
+                status_code=403,
+                detail="Not enough permissions to access this list"
+            )
+        return row[0]
+
+    def get_top_by_lists(
+        self, db: Session, *, list_ids: ListTyping[int], per_list: int
+    ) -> ListTyping[Tuple[ListItem, int]]:
+        """
+        Get up to `per_list` items of each of `list_ids` with their vote counts,
+        most voted first (ties by id), grouped by list, in one query.
+        """
+        if not list_ids or per_list <= 0:
+            return []
+        vote_count = func.count(Vote.id)
+        ranked = (
+            select(
+                ListItem.id.label("item_id"),
+                vote_count.label("vote_count"),
+                func.row_number().over(
+                    partition_by=ListItem.list_id,
+                    order_by=(vote_count.desc(), ListItem.id),
+                ).label("rank"),
+            )
+            .outerjoin(Vote, Vote.list_item_id == ListItem.id)
+            .where(ListItem.list_id.in_(list_ids))
+            .group_by(ListItem.id, ListItem.list_id)
+            .subquery()
+        )
+        return [
+            tuple(row) for row in db.execute(
+                select(ListItem, ranked.c.vote_count)
+                .join(ranked, ranked.c.item_id == ListItem.id)
+                .where(ranked.c.rank <= per_list)
+                .order_by(ListItem.list_id, ranked.c.rank)
+            )
+        ]
+
     def get_multi_by_list(
-        self, db: Session, *, list_id: int, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        *,
+        list_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        columns: Optional[Sequence[Any]] = None,
     ) -> ListTyping[ListItem]:
         """
         Retrieve list items associated with a specific list.
+        Pass `columns` to get row tuples of just those columns instead of items.
         """
         return (
-            db.query(self.model)
+            db.query(*(columns or [self.model]))
             .filter(ListItem.list_id == list_id)
             .offset(skip)
             .limit(limit)
             .all()
         )
 
+    def stream_by_calendar(
+        self,
+        db: Session,
+        *,
+        calendar_id: int,
+        columns: Optional[Sequence[Any]] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[ListItem]:
+        """
+        Iterate over the items of every list of a calendar in id order using a
+        server-side cursor, `batch_size` rows at a time. Pass `columns` to get
+        row tuples of just those columns instead of items.
+        """
+        yield from (
+            db.query(*(columns or [self.model]))
+            .join(List, List.id == ListItem.list_id)
+            .filter(List.calendar_id == calendar_id)
+            .order_by(ListItem.id)
+            .yield_per(batch_size)
+        )
+
+    def stamp_by_list(self, db: Session, *, list_id: int) -> CollectionStamp:
+        """The collection stamp of a list's items."""
+        return self.collection_stamp(db, ListItem.list_id == list_id)
+
     def get_with_vote_count(
         self, db: Session, *, list_item_id: int
     ) -> Optional[tuple]:
@@ -51,13 +142,21 @@ class CRUDListItem(CRUDBase[ListItem, ListItemCreate, ListItemUpdate]):
         )
 
     def get_multi_with_vote_counts(
-        self, db: Session, *, list_id: int, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        *,
+        list_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        columns: Optional[Sequence[Any]] = None,
     ) -> ListTyping[tuple]:
         """
-        Get list items with their vote counts for a specific list.
+        Get list items with their vote counts for a specific list, as
+        `(item, vote_count)` rows. Pass `columns` to get rows of those columns
+        followed by `vote_count` instead of items.
         """
         return (
-            db.query(ListItem, func.count(Vote.id).label("vote_count"))
+            db.query(*(columns or [ListItem]), func.count(Vote.id).label("vote_count"))
             .outerjoin(Vote, ListItem.id == Vote.list_item_id)
             .filter(ListItem.list_id == list_id)
             .group_by(ListItem.id)
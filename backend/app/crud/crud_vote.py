@@ -1,7 +1,10 @@
 from sqlalchemy.orm import Session
-from typing import List as ListTyping, Optional
+from typing import Any, Iterator, List as ListTyping, Optional, Sequence
 
+from app.core.conditional import CollectionStamp
 from app.crud.base import CRUDBase
+from app.models.list import List
+from app.models.list_item import ListItem
 from app.models.vote import Vote
 from app.schemas.vote import VoteCreate
 
@@ -34,13 +37,20 @@ class CRUDVote(CRUDBase[Vote, VoteCreate, VoteCreate]):
         )
 
     def get_multi_by_item(
-        self, db: Session, *, list_item_id: int, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        *,
+        list_item_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        columns: Optional[Sequence[Any]] = None,
     ) -> ListTyping[Vote]:
         """
         Get all votes for a specific list item.
+        Pass `columns` to get row tuples of just those columns instead of votes.
         """
         return (
-            db.query(self.model)
+            db.query(*(columns or [self.model]))
             .filter(Vote.list_item_id == list_item_id)
             .offset(skip)
             .limit(limit)
@@ -48,19 +58,63 @@ class CRUDVote(CRUDBase[Vote, VoteCreate, VoteCreate]):
         )
 
     def get_multi_by_user(
-        self, db: Session, *, user_id: int, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        *,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        columns: Optional[Sequence[Any]] = None,
     ) -> ListTyping[Vote]:
         """
         Get all votes by a specific user.
+        Pass `columns` to get row tuples of just those columns instead of votes.
         """
         return (
-            db.query(self.model)
+            db.query(*(columns or [self.model]))
             .filter(Vote.user_id == user_id)
             .offset(skip)
             .limit(limit)
             .all()
         )
 
+    def stream_by_calendar(
+        self,
+        db: Session,
+        *,
+        calendar_id: int,
+        columns: Optional[Sequence[Any]] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Vote]:
+        """
+        Iterate over the votes on items of every list of a calendar in id order
+        using a server-side cursor, `batch_size` rows at a time. Pass `columns`
+        to get row tuples of just those columns instead of votes.
+        """
+        yield from (
+            db.query(*(columns or [self.model]))
+            .join(ListItem, ListItem.id == Vote.list_item_id)
+            .join(List, List.id == ListItem.list_id)
+            .filter(List.calendar_id == calendar_id)
+            .order_by(Vote.id)
+            .yield_per(batch_size)
+        )
+
+    def stamp_by_list(self, db: Session, *, list_id: int) -> CollectionStamp:
+        """The collection stamp of the votes on a list's items."""
+        return self.collection_stamp(
+            db, ListItem.list_id == list_id, joins=[(ListItem, ListItem.id == Vote.list_item_id)],
+            checksum=Vote.list_item_id,
+        )
+
+    def stamp_by_item(self, db: Session, *, list_item_id: int) -> CollectionStamp:
+        """The collection stamp of the votes on a list item."""
+        return self.collection_stamp(db, Vote.list_item_id == list_item_id, checksum=Vote.user_id)
+
+    def stamp_by_user(self, db: Session, *, user_id: int) -> CollectionStamp:
+        """The collection stamp of a user's votes."""
+        return self.collection_stamp(db, Vote.user_id == user_id, checksum=Vote.list_item_id)
+
     def remove_by_user_and_item(
         self, db: Session, *, user_id: int, list_item_id: int
     ) -> Optional[Vote]:
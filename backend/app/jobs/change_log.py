@@ -0,0 +1,42 @@
+"""
+Periodic maintenance of the `changes` log behind delta sync. Run it from cron
+(daily is plenty):
+
+    python -m app.jobs.change_log prune
+
+`prune` deletes the entries written more than SYNC_RETENTION_DAYS ago and
+raises the oldest sync cursor still accepted, so clients that have not synced
+since get 410 and reload their data in full. It is idempotent.
+"""
+import argparse
+import logging
+from datetime import datetime, timedelta, timezone
+
+from app.core import sync
+from app.core.config import settings
+from app.core.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+def prune_changes(days: int) -> None:
+    before = datetime.now(timezone.utc) - timedelta(days=days)
+    with SessionLocal() as db:
+        deleted = sync.prune(db, before=before)
+        floor = sync.floor_position(db)
+    logger.info("Deleted %d change log entries written before %s; sync floor is %d", deleted, before.isoformat(), floor)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    prune = subcommands.add_parser("prune", help="delete change log entries past the retention")
+    prune.add_argument("--days", type=int, default=settings.SYNC_RETENTION_DAYS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    prune_changes(args.days)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Periodic maintenance of the `events` table. Run it from cron (daily is plenty):
+
+    python -m app.jobs.event_maintenance archive
+
+`archive` moves events that ended more than EVENT_ARCHIVE_AFTER_DAYS ago to
+`events_archive`, so `events` and its indexes only hold recent and upcoming
+events. It is idempotent.
+"""
+import argparse
+import logging
+
+from app.core.database import SessionLocal
+from app.crud import event as event_crud
+
+logger = logging.getLogger(__name__)
+
+
+def archive_events(batch_size: int) -> None:
+    horizon = event_crud.archive_horizon()
+    if horizon is None:
+        raise SystemExit("EVENT_ARCHIVE_AFTER_DAYS is not set, archiving is disabled")
+    with SessionLocal() as db:
+        archived = event_crud.archive_before(db, before=horizon, batch_size=batch_size)
+    logger.info("Archived %d events ended before %s", archived, horizon.isoformat())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    archive = subcommands.add_parser("archive", help="move past events to events_archive")
+    archive.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    archive_events(args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,31 @@
-from fastapi import FastAPI
+import hmac
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
+from app.core import metrics, profiling, reminders, tracing
 from app.core.config import settings
+from app.core.rate_limiter import rate_limiter
+from app.core.serialization import ORJSONResponse
+from app.core.database import SessionLocal, engine
 from app.api.v1.api import api_router
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.REMINDERS_ENABLED:
+        reminders.start_scheduler(SessionLocal)
+    yield
+    reminders.stop_scheduler()
+    if tracing.tracer.processor is not None:
+        tracing.tracer.processor.shutdown()
+
+
 app = FastAPI(
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     title=settings.PROJECT_NAME,
     description="""
     ## DateTree - Collaborative Task and Event Management API
@@ -78,4 +99,36 @@ app.add_middleware(
 )
 
 # Include API router
-app.include_router(api_router, prefix=settings.API_PREFIX)
\ No newline at end of file
+app.include_router(api_router, prefix=settings.API_PREFIX)
+
+# Traces the latency metrics include; added first so it is inside them
+app.add_middleware(tracing.TracingMiddleware)
+
+
+@app.get("/debug/traces", include_in_schema=False)
+def read_traces(limit: int = Query(20, ge=1, le=500)):
+    """The most recent sampled traces held in memory, newest first (TRACING_DEBUG_ENDPOINT)."""
+    if not settings.TRACING_DEBUG_ENDPOINT:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return tracing.tracer.recent_traces(limit)
+
+if settings.PROFILING_ENABLED:
+    # Outside tracing, so profiles include the spans' own overhead
+    app.add_middleware(profiling.ProfilingMiddleware, routes=app.routes)
+
+if settings.METRICS_ENABLED:
+    # Outermost, so the latency covers every other middleware
+    app.add_middleware(metrics.MetricsMiddleware)
+    metrics.instrument(engine, rate_limiter)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def read_metrics(request: Request):
+        """Process metrics in the Prometheus text format (METRICS_ENDPOINT, METRICS_TOKEN)."""
+        if not settings.METRICS_ENDPOINT:
+            raise HTTPException(status_code=404, detail="Not Found")
+        if settings.METRICS_TOKEN and not hmac.compare_digest(
+            request.headers.get("authorization", "").encode(), f"Bearer {settings.METRICS_TOKEN}".encode()
+        ):
+            raise HTTPException(status_code=401, detail="Invalid metrics token")
+        # async: the threadpool gauge is read from the event loop
+        return PlainTextResponse(metrics.registry.expose(), media_type="text/plain; version=0.0.4")
\ No newline at end of file
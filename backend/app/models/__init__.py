@@ -8,7 +8,8 @@ from .calendar import Calendar, calendar_user_association
 from .list import List, ListType
 from .list_item import ListItem
 from .vote import Vote
-from .event import Event
+from .event import Event, EventArchive
+from .change import Change, ChangeFloor
 
 # You can also define a __all__ to control what `from .models import *` imports.
 __all__ = [
@@ -21,4 +22,7 @@ __all__ = [
     "ListItem",
     "Vote",
     "Event",
+    "EventArchive",
+    "Change",
+    "ChangeFloor",
 ]
\ No newline at end of file
@@ -1,5 +1,16 @@
+from sqlalchemy import Column, DateTime, Integer, func, literal_column, text
 from sqlalchemy.orm import declarative_base
 
 # The base class for all our models.
 # By placing this in its own file, we prevent circular import issues.
 Base = declarative_base()
+
+
+class Versioned:
+    """
+    Row version and last modification time, the validators behind the API's
+    ETag and Last-Modified headers (see app/core/conditional.py).
+    """
+    # Incremented by every UPDATE of the row, ORM or bulk
+    version = Column(Integer, nullable=False, default=1, server_default=text("1"), onupdate=literal_column("version + 1"))
+    updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
@@ -1,5 +1,6 @@
 import enum
 from sqlalchemy import (
+    Boolean,
     Column,
     Integer,
     String,
@@ -8,10 +9,12 @@ from sqlalchemy import (
     DateTime,
     Table,
     Enum,
+    Index,
+    false,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from .base import Base
+from .base import Base, Versioned
 
 # Defines the type of a calendar
 class CalendarType(enum.Enum):
@@ -24,9 +27,11 @@ calendar_user_association = Table(
     Base.metadata,
     Column("calendar_id", Integer, ForeignKey("calendars.id"), primary_key=True),
     Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
+    # The primary key only serves lookups by calendar; this one serves "calendars of a user"
+    Index("idx_calendar_user_user_id", "user_id"),
 )
 
-class Calendar(Base):
+class Calendar(Versioned, Base):
     """
     Represents a calendar, a container for lists and events.
     """
@@ -37,6 +42,8 @@ class Calendar(Base):
     description = Column(Text, nullable=True)
     calendar_type = Column(Enum(CalendarType), nullable=False, default=CalendarType.GENERAL)
     owner_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    # Reject overlapping single events at the database level (PostgreSQL only)
+    no_double_booking = Column(Boolean, nullable=False, default=False, server_default=false())
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     owner = relationship("User")
@@ -44,4 +51,7 @@ class Calendar(Base):
         "User", secondary=calendar_user_association, back_populates="calendars"
     )
     lists = relationship("List", back_populates="calendar", cascade="all, delete-orphan")
-    events = relationship("Event", back_populates="calendar", cascade="all, delete-orphan")
\ No newline at end of file
+    events = relationship("Event", back_populates="calendar", cascade="all, delete-orphan")
+    archived_events = relationship(
+        "EventArchive", back_populates="calendar", cascade="all, delete-orphan"
+    )
\ No newline at end of file
@@ -0,0 +1,44 @@
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String
+from sqlalchemy.sql import func
+from .base import Base
+
+class Change(Base):
+    """
+    One entry of the change log behind `GET /sync`: a calendar, list, list
+    item, vote or event was created, updated or deleted. Written by the CRUD
+    write paths (see app/core/changes.py); sync cursors are positions in it
+    (see app/core/sync.py).
+    """
+    __tablename__ = "changes"
+    __table_args__ = (
+        Index("ix_changes_txid", "txid"),
+        Index("ix_changes_created_at", "created_at"),
+        # Never reuse ids on SQLite, even after `prune` empties the table
+        {"sqlite_autoincrement": True},
+    )
+
+    # Monotonically increasing change sequence
+    id = Column(Integer, primary_key=True)
+    # "calendar", "list", "list_item", "vote" or "event"
+    entity = Column(String(16), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    # Calendar the entity belongs (or belonged) to; no foreign key, entries outlive it
+    calendar_id = Column(Integer, nullable=False)
+    # Set on entries only this user should see: they lost access to `calendar_id`
+    user_id = Column(Integer, nullable=True)
+    # Id of the writing transaction (PostgreSQL only), the entry's sync position there
+    txid = Column(BigInteger, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class ChangeFloor(Base):
+    """
+    The single row holding the oldest sync position the change log still
+    covers; `python -m app.jobs.change_log prune` raises it as it deletes
+    old entries, and older cursors get 410 from `GET /sync`.
+    """
+    __tablename__ = "change_floor"
+
+    id = Column(Integer, primary_key=True)
+    position = Column(BigInteger, nullable=False)
+    pruned_at = Column(DateTime(timezone=True), nullable=False)
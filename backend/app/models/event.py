@@ -1,8 +1,16 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
+from sqlalchemy import Boolean, Column, Integer, String, Text, DateTime, ForeignKey, Index, JSON, false, func, literal_column, text
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from sqlalchemy.orm import relationship
-from .base import Base
+from .base import Base, Versioned
 
-class Event(Base):
+# The closed time span an event occupies. Events without an end time (and events
+# whose end time precedes their start) collapse to the single instant `start_time`.
+# Range queries on PostgreSQL must use this exact expression to hit the GiST index.
+EVENT_PERIOD_SQL = "tstzrange(start_time, greatest(start_time, end_time), '[]')"
+# Half-open variant used for double booking: back-to-back events and instants don't clash.
+EVENT_BOOKED_PERIOD_SQL = "tstzrange(start_time, greatest(start_time, end_time), '[)')"
+
+class Event(Versioned, Base):
     """
     Represents a scheduled event on the calendar with a specific date and time.
     """
@@ -15,6 +23,14 @@ class Event(Base):
     end_time = Column(DateTime(timezone=True), nullable=True)
     calendar_id = Column(Integer, ForeignKey("calendars.id"), nullable=False, index=True)
     creator_id = Column(Integer, ForeignKey("users.id"), index=True)
+    # RFC 5545 RRULE (e.g. "FREQ=WEEKLY;BYDAY=MO"); NULL for single events
+    recurrence_rule = Column(String, nullable=True)
+    # Occurrence start times (ISO 8601 strings) removed from the series, like EXDATE
+    recurrence_exceptions = Column(JSON(none_as_null=True), nullable=True)
+    # End of the last occurrence, NULL when the series never ends; kept by CRUDEvent
+    recurrence_end = Column(DateTime(timezone=True), nullable=True)
+    # Copy of Calendar.no_double_booking, so the exclusion constraint can see it
+    no_double_booking = Column(Boolean, nullable=False, default=False, server_default=false())
 
     calendar = relationship("Calendar", back_populates="events")
     
@@ -25,4 +41,64 @@ class Event(Base):
         Index('idx_event_start_time', 'start_time'),
         # Index for creator's events
         Index('idx_event_creator', 'creator_id'),
-    )
\ No newline at end of file
+        # Partial index for recurring series, expanded in Python per query window
+        Index(
+            'idx_event_calendar_recurring',
+            'calendar_id',
+            postgresql_where=text('recurrence_rule IS NOT NULL'),
+            sqlite_where=text('recurrence_rule IS NOT NULL'),
+        ),
+        # GiST index for interval overlap queries (PostgreSQL only, needs btree_gist)
+        Index(
+            'idx_event_calendar_period',
+            'calendar_id',
+            text(EVENT_PERIOD_SQL),
+            postgresql_using='gist',
+        ).ddl_if(dialect='postgresql'),
+        # Database-enforced "no double booking" for opted-in calendars (PostgreSQL only)
+        ExcludeConstraint(
+            ('calendar_id', '='),
+            (literal_column(EVENT_BOOKED_PERIOD_SQL), '&&'),
+            name='excl_event_no_double_booking',
+            using='gist',
+            where=text('no_double_booking AND recurrence_rule IS NULL'),
+        ).ddl_if(dialect='postgresql'),
+    )
+
+
+class EventArchive(Versioned, Base):
+    """
+    A past event moved out of `events` by the archival job (see
+    CRUDEvent.archive_before). Same columns as `Event`, so archived rows can be
+    returned through the event schemas; they are read-only.
+
+    On PostgreSQL the migration gives the table a low TOAST threshold, so most
+    rows are stored compressed, and `start_time` is covered by a BRIN index.
+    """
+    __tablename__ = "events_archive"
+
+    # Keeps the id the event had in `events`
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    title = Column(String, nullable=False)
+    description = Column(Text, nullable=True)
+    start_time = Column(DateTime(timezone=True), nullable=False)
+    end_time = Column(DateTime(timezone=True), nullable=True)
+    calendar_id = Column(Integer, ForeignKey("calendars.id"), nullable=False)
+    creator_id = Column(Integer, ForeignKey("users.id"))
+    recurrence_rule = Column(String, nullable=True)
+    recurrence_exceptions = Column(JSON(none_as_null=True), nullable=True)
+    recurrence_end = Column(DateTime(timezone=True), nullable=True)
+    archived_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    calendar = relationship("Calendar", back_populates="archived_events")
+
+    __table_args__ = (
+        # Index for calendar events ordered by time
+        Index('idx_event_archive_calendar_time', 'calendar_id', 'start_time'),
+        # Compact index for time-ordered, append-only data (BRIN on PostgreSQL)
+        Index(
+            'idx_event_archive_start_time_brin',
+            'start_time',
+            postgresql_using='brin',
+        ),
+    )
@@ -1,15 +1,15 @@
 import enum
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from .base import Base
+from .base import Base, Versioned
 
 # Defines the possible types for a List.
 class ListType(enum.Enum):
     TODO = "TODO"
     PRIORITY = "PRIORITY"
 
-class List(Base):
+class List(Versioned, Base):
     """
     Represents a list within a calendar (e.g., a to-do list, a priority list).
     """
@@ -18,8 +18,13 @@ class List(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     list_type = Column(Enum(ListType), nullable=False, name="list_type_enum")
-    calendar_id = Column(Integer, ForeignKey("calendars.id"), nullable=False, index=True)
+    calendar_id = Column(Integer, ForeignKey("calendars.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     calendar = relationship("Calendar", back_populates="lists")
     items = relationship("ListItem", back_populates="list_obj", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # A calendar's lists in id order, for keyset pagination
+        Index('idx_list_calendar_id', 'calendar_id', 'id'),
+    )
@@ -1,9 +1,9 @@
 from sqlalchemy import Column, Integer, Text, Boolean, ForeignKey, DateTime
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from .base import Base
+from .base import Base, Versioned
 
-class ListItem(Base):
+class ListItem(Versioned, Base):
     """
     Represents a single item within a list.
     """
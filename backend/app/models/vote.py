@@ -1,8 +1,8 @@
 from sqlalchemy import Column, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
-from .base import Base
+from .base import Base, Versioned
 
-class Vote(Base):
+class Vote(Versioned, Base):
     """
     Represents a single vote cast by a user for a list item.
     """
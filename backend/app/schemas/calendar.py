@@ -3,12 +3,17 @@ from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
 from .user import User
+from .event import Event
+from .list import List as ListSchema
+from .list_item import ListItem
 from app.models.calendar import CalendarType
 
 # --- Base Properties ---
 class CalendarBase(BaseModel):
     name: str
     description: Optional[str] = None
+    # Reject overlapping single events (an exclusion constraint on PostgreSQL)
+    no_double_booking: bool = False
 
 # --- Create Schema ---
 class CalendarCreate(CalendarBase):
@@ -18,15 +23,54 @@ class CalendarCreate(CalendarBase):
 class CalendarUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
+    no_double_booking: Optional[bool] = None
 
-# --- Read Schema ---
-class Calendar(CalendarBase):
+# --- Read Schemas ---
+class CalendarSummary(CalendarBase):
+    """Calendar without its members, for listings."""
     id: int
     owner_id: int
     calendar_type: CalendarType
     created_at: datetime
     owner: User
-    members: List[User] = []
 
     class Config:
         from_attributes = True
+
+class Calendar(CalendarSummary):
+    members: List[User] = []
+
+
+# --- Free/Busy Schemas ---
+class TimeSlot(BaseModel):
+    start: datetime
+    end: datetime
+
+class FreeBusy(BaseModel):
+    start: datetime
+    end: datetime
+    # Merged busy blocks of all calendar members, clipped to the window
+    busy: List[TimeSlot] = []
+    # Earliest free slots of the requested duration
+    free: List[TimeSlot] = []
+
+
+# --- Overview Schemas ---
+class ListOverview(ListSchema):
+    item_count: int = 0
+    completed_count: int = 0
+    # Votes cast on all items of the list
+    vote_count: int = 0
+    # Most voted items first (ties by id), with their vote_count
+    top_items: List[ListItem] = []
+
+class CalendarOverview(BaseModel):
+    calendar: CalendarSummary
+    lists: List[ListOverview] = []
+    # True when the calendar has more lists than were returned
+    lists_truncated: bool = False
+    # Events and occurrences overlapping [start, end), ordered by start time
+    start: datetime
+    end: datetime
+    events: List[Event] = []
+    events_truncated: bool = False
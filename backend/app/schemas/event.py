@@ -1,7 +1,11 @@
-from pydantic import BaseModel
-from typing import Optional
+import enum
+
+from pydantic import BaseModel, field_serializer, field_validator, model_validator
+from typing import List, Optional
 from datetime import datetime
 
+from app.core.recurrence import check_duration, normalize_exceptions, parse_rule, series_end
+
 # --- Base Properties ---
 # Shared properties that are common to all schemas.
 class EventBase(BaseModel):
@@ -10,11 +14,24 @@ class EventBase(BaseModel):
     start_time: datetime
     end_time: Optional[datetime] = None
     calendar_id: int
+    # RFC 5545 RRULE, e.g. "FREQ=WEEKLY;BYDAY=MO;COUNT=10"
+    recurrence_rule: Optional[str] = None
+    # Occurrence start times to skip (EXDATE)
+    recurrence_exceptions: Optional[List[datetime]] = None
+
+    @field_serializer("recurrence_exceptions")
+    def serialize_exceptions(self, value: Optional[List[datetime]]) -> Optional[List[str]]:
+        return normalize_exceptions(value)
 
 # --- Create Schema ---
 # Properties to receive via API on creation.
 class EventCreate(EventBase):
-    pass  # No extra fields needed for creation
+    @model_validator(mode="after")
+    def check_times(self) -> "EventCreate":
+        check_duration(self.start_time, self.end_time)
+        if self.recurrence_rule:
+            series_end(self.recurrence_rule, self.start_time, self.end_time)
+        return self
 
 # --- Update Schema ---
 # Properties to receive via API on update. All fields are optional.
@@ -23,12 +40,69 @@ class EventUpdate(BaseModel):
     description: Optional[str] = None
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
+    recurrence_rule: Optional[str] = None
+    recurrence_exceptions: Optional[List[datetime]] = None
+
+    @field_validator("recurrence_rule")
+    @classmethod
+    def check_recurrence_rule(cls, value: Optional[str]) -> Optional[str]:
+        if value:
+            parse_rule(value, datetime(2000, 1, 1))
+        return value
+
+    @model_validator(mode="after")
+    def check_times(self) -> "EventUpdate":
+        # With only one of them set, CRUDEvent.update checks against the stored one
+        if self.start_time is not None:
+            check_duration(self.start_time, self.end_time)
+        return self
+
+    @field_serializer("recurrence_exceptions")
+    def serialize_exceptions(self, value: Optional[List[datetime]]) -> Optional[List[str]]:
+        return normalize_exceptions(value)
 
 # --- Read Schema ---
 # Properties to return to the client.
 class Event(EventBase):
     id: int
     creator_id: Optional[int] = None
+    # Set on expanded occurrences of a recurring event: start of this occurrence
+    recurrence_id: Optional[datetime] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# --- Conflict Detection ---
+class ConflictScope(str, enum.Enum):
+    # Only events in the event's own calendar
+    CALENDAR = "calendar"
+    # Events in every calendar the current user can access
+    USER = "user"
+
+# --- Density Schemas ---
+# Per-bucket event counts for heatmap views.
+class DensityGranularity(str, enum.Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+class DensityBucket(BaseModel):
+    # Local start of the day, ISO week (Monday) or month, with its UTC offset
+    start: datetime
+    count: int
+
+class Density(BaseModel):
+    granularity: DensityGranularity
+    tz: str
+    buckets: List[DensityBucket] = []
+
+# --- Agenda Schema ---
+# One page of the merged multi-calendar feed.
+class AgendaPage(BaseModel):
+    items: List[Event] = []
+    # Pass back as `cursor` to get the next page; None when there are no more events
+    next_cursor: Optional[str] = None
+
+# --- Import Schema ---
+class ImportResult(BaseModel):
+    imported: int
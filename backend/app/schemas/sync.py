@@ -0,0 +1,35 @@
+from typing import List
+
+from pydantic import BaseModel
+
+from .calendar import Calendar
+from .event import Event
+from .list import List as ListSchema
+from .list_item import ListItem
+from .vote import Vote
+
+
+# --- Read Schemas ---
+class SyncChanged(BaseModel):
+    """Current state of every entity created or updated since the cursor."""
+    calendars: List[Calendar] = []
+    lists: List[ListSchema] = []
+    list_items: List[ListItem] = []
+    votes: List[Vote] = []
+    events: List[Event] = []
+
+class SyncDeleted(BaseModel):
+    """Ids of the entities deleted, or no longer accessible, since the cursor."""
+    calendars: List[int] = []
+    lists: List[int] = []
+    list_items: List[int] = []
+    votes: List[int] = []
+    events: List[int] = []
+
+class SyncPage(BaseModel):
+    # Pass back as `since` to the next sync
+    cursor: str
+    # More changes are waiting: sync again right away with `cursor`
+    has_more: bool = False
+    changed: SyncChanged = SyncChanged()
+    deleted: SyncDeleted = SyncDeleted()
@@ -0,0 +1,178 @@
+"""
+Benchmark: event date-range queries, start-only filter vs. interval overlap.
+
+Loads a synthetic `events` table and, for random windows, compares
+1. the legacy predicate (`start_time BETWEEN start AND end`) and
+2. `CRUDEvent.get_multi_by_date_range` (interval overlap),
+reporting latency percentiles and how many overlapping events the legacy
+predicate misses.
+
+Usage (from backend/):
+    python -m benchmarks.bench_event_range --events 10000000
+    python -m benchmarks.bench_event_range --database-url postgresql+psycopg2://...
+
+The target database is dropped and recreated, never point it at real data.
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./blob/bench/event_range.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import create_engine, event as sa_event, func, insert, select  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app import crud  # noqa: E402
+from app.models import Base, Calendar, Event, User  # noqa: E402
+from app.models.calendar import CalendarType  # noqa: E402
+
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+SPAN_DAYS = 365 * 3
+
+
+def _random_event(rng: random.Random, calendar_id: int) -> dict:
+    start = EPOCH + timedelta(minutes=rng.randrange(SPAN_DAYS * 24 * 60))
+    roll = rng.random()
+    if roll < 0.15:
+        end = None  # reminders / point events
+    elif roll < 0.95:
+        end = start + timedelta(minutes=rng.choice((15, 30, 60, 90, 120, 240)))
+    else:
+        end = start + timedelta(days=rng.randint(1, 14))  # trips, conferences
+    return {
+        "title": "bench",
+        "start_time": start,
+        "end_time": end,
+        "calendar_id": calendar_id,
+        "creator_id": 1,
+    }
+
+
+def load(engine, *, events: int, calendars: int, batch: int, seed: int) -> None:
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    rng = random.Random(seed)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{
+            "id": 1, "username": "bench", "email": "bench@example.com",
+            "hashed_password": "x", "is_active": True,
+        }])
+        conn.execute(insert(Calendar), [
+            {"id": i, "name": f"cal {i}", "owner_id": 1, "calendar_type": CalendarType.GENERAL}
+            for i in range(1, calendars + 1)
+        ])
+    loaded = 0
+    started = time.perf_counter()
+    while loaded < events:
+        rows = [
+            _random_event(rng, rng.randint(1, calendars))
+            for _ in range(min(batch, events - loaded))
+        ]
+        with engine.begin() as conn:
+            conn.execute(insert(Event), rows)
+        loaded += len(rows)
+    print(f"loaded {loaded:,} events in {time.perf_counter() - started:.1f}s")
+    if engine.dialect.name != "sqlite":
+        with engine.begin() as conn:
+            conn.exec_driver_sql("ANALYZE events")
+
+
+def legacy_range(db, *, calendar_id, start_date, end_date, limit=100):
+    return (
+        db.query(Event)
+        .filter(Event.calendar_id == calendar_id)
+        .filter(Event.start_time >= start_date)
+        .filter(Event.start_time <= end_date)
+        .limit(limit)
+        .all()
+    )
+
+
+def _percentiles(samples):
+    samples = sorted(samples)
+    return (
+        statistics.median(samples) * 1000,
+        samples[int(len(samples) * 0.95) - 1] * 1000,
+    )
+
+
+def run(engine, *, calendars: int, queries: int, window_days: int, seed: int) -> None:
+    Session = sessionmaker(bind=engine)
+    rng = random.Random(seed + 1)
+    windows = []
+    for _ in range(queries):
+        start = EPOCH + timedelta(days=rng.randrange(SPAN_DAYS - window_days))
+        windows.append((rng.randint(1, calendars), start, start + timedelta(days=window_days)))
+
+    timings = {"legacy start_time filter": [], "overlap (CRUDEvent)": []}
+    missed = total = 0
+    with Session() as db:
+        for calendar_id, start, end in windows:
+            t0 = time.perf_counter()
+            legacy_range(db, calendar_id=calendar_id, start_date=start, end_date=end)
+            timings["legacy start_time filter"].append(time.perf_counter() - t0)
+
+            t0 = time.perf_counter()
+            crud.event.get_multi_by_date_range(
+                db, calendar_id=calendar_id, start_date=start, end_date=end
+            )
+            timings["overlap (CRUDEvent)"].append(time.perf_counter() - t0)
+
+            overlap_filter = crud.event.overlaps(db, start_date=start, end_date=end)
+            overlapping = db.execute(
+                select(func.count()).select_from(Event).where(
+                    Event.calendar_id == calendar_id, overlap_filter
+                )
+            ).scalar_one()
+            starting_inside = db.execute(
+                select(func.count()).select_from(Event).where(
+                    Event.calendar_id == calendar_id,
+                    Event.start_time >= start,
+                    Event.start_time <= end,
+                )
+            ).scalar_one()
+            total += overlapping
+            missed += overlapping - starting_inside
+            db.expunge_all()
+
+    print(f"{queries} windows of {window_days} day(s) on {engine.dialect.name}")
+    for name, samples in timings.items():
+        p50, p95 = _percentiles(samples)
+        print(f"  {name:<26} p50 {p50:8.3f} ms   p95 {p95:8.3f} ms")
+    share = (missed / total * 100) if total else 0.0
+    print(f"  overlapping events missed by legacy filter: {missed:,} of {total:,} ({share:.2f}%)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--database-url", default=os.environ["DATABASE_URL"])
+    parser.add_argument("--events", type=int, default=10_000_000)
+    parser.add_argument("--calendars", type=int, default=2_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--window-days", type=int, default=7)
+    parser.add_argument("--batch", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-load", action="store_true", help="reuse the existing table")
+    args = parser.parse_args()
+
+    if args.database_url.startswith("sqlite:///"):
+        os.makedirs(os.path.dirname(args.database_url[len("sqlite:///"):]) or ".", exist_ok=True)
+    engine = create_engine(args.database_url)
+    if engine.dialect.name == "postgresql":
+        @sa_event.listens_for(engine, "connect")
+        def _btree_gist(dbapi_connection, _):
+            with dbapi_connection.cursor() as cursor:
+                cursor.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+            dbapi_connection.commit()
+
+    if not args.skip_load:
+        load(engine, events=args.events, calendars=args.calendars, batch=args.batch, seed=args.seed)
+    run(engine, calendars=args.calendars, queries=args.queries, window_days=args.window_days, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark: NDJSON calendar export throughput and memory.
+
+Loads a calendar with the given number of list items (plus votes and events
+in proportion) and streams `export.stream_calendar` to nowhere, at each size
+in --sizes. Reports records per second and the peak Python heap
+(tracemalloc), which should stay roughly the same as the calendar grows.
+With --gzip the output also goes through `export.gzipped`.
+
+Usage (from backend/):
+    python -m benchmarks.bench_export --sizes 10000 100000
+    python -m benchmarks.bench_export --database-url postgresql+psycopg2://...
+
+The target database is dropped and recreated, never point it at real data.
+"""
+import argparse
+import os
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./blob/bench/export.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.core import export  # noqa: E402
+from app.models import Base, Calendar, Event, List, ListItem, User, Vote  # noqa: E402
+from app.models.calendar import CalendarType  # noqa: E402
+from app.models.list import ListType  # noqa: E402
+
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+ITEMS_PER_LIST = 100
+VOTERS = 5
+
+
+def load(engine, *, items: int, seed: int) -> int:
+    """Load one calendar; returns the number of records its export has."""
+    rng = random.Random(seed)
+    lists = max(1, items // ITEMS_PER_LIST)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": i, "username": f"u{i}", "email": f"u{i}@example.com",
+             "hashed_password": "x", "is_active": True}
+            for i in range(1, VOTERS + 1)
+        ])
+        conn.execute(insert(Calendar), [
+            {"id": 1, "name": "team", "owner_id": 1, "calendar_type": CalendarType.GENERAL}
+        ])
+        conn.execute(insert(List), [
+            {"id": i, "name": f"list {i}", "list_type_enum": ListType.PRIORITY, "calendar_id": 1}
+            for i in range(1, lists + 1)
+        ])
+        votes = 0
+        for offset in range(0, items, 10000):
+            batch = range(offset + 1, min(items, offset + 10000) + 1)
+            conn.execute(insert(ListItem), [
+                {"id": i, "content": f"item {i} " + "x" * 60, "is_completed": i % 3 == 0,
+                 "list_id": (i - 1) % lists + 1, "creator_id": 1}
+                for i in batch
+            ])
+            rows = [
+                {"user_id": user, "list_item_id": i}
+                for i in batch for user in range(1, rng.randrange(VOTERS) + 1)
+            ]
+            if rows:
+                conn.execute(insert(Vote), rows)
+            votes += len(rows)
+            conn.execute(insert(Event), [
+                {"title": f"event {i}", "description": "lorem ipsum " * 8,
+                 "start_time": EPOCH + timedelta(minutes=rng.randrange(3 * 365 * 24 * 60)),
+                 "calendar_id": 1, "creator_id": 1}
+                for i in batch[::2]
+            ])
+    return 1 + lists + items + votes + (items + 1) // 2
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--database-url", default=os.environ["DATABASE_URL"])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000], help="list items per run")
+    parser.add_argument("--batch-size", type=int, default=export.BATCH_SIZE)
+    parser.add_argument("--gzip", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.database_url.startswith("sqlite:///"):
+        os.makedirs(os.path.dirname(args.database_url[len("sqlite:///"):]) or ".", exist_ok=True)
+    engine = create_engine(args.database_url)
+
+    for size in args.sizes:
+        records = load(engine, items=size, seed=args.seed)
+        with Session(bind=engine) as db:
+            chunks = export.stream_calendar(db, 1, batch_size=args.batch_size)
+            if args.gzip:
+                chunks = export.gzipped(chunks)
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            written = sum(len(chunk) for chunk in chunks)
+            elapsed = time.perf_counter() - t0
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        print(
+            f"{size:>9} items  {records:>9} records  {written / 2**20:8.1f} MiB  "
+            f"{elapsed:6.2f} s  {records / elapsed:10.0f} records/s  peak heap {peak / 2**20:6.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark: free/busy for a shared calendar with many members.
+
+Compares the client-side approach (page full `Event` rows out of every member
+calendar with `get_multi_by_calendar`, then compute the union) against
+`CRUDEvent.get_busy_intervals` + `merge_intervals`, which reads only the two
+time columns of events overlapping the window.
+
+Usage (from backend/):
+    python -m benchmarks.bench_free_busy --members 500
+    python -m benchmarks.bench_free_busy --database-url postgresql+psycopg2://...
+
+The target database is dropped and recreated, never point it at real data.
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./blob/bench/free_busy.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app import crud  # noqa: E402
+from app.core.recurrence import as_utc  # noqa: E402
+from app.core.scheduling import find_free_slots, merge_intervals  # noqa: E402
+from app.models import Base, Calendar, Event, User, calendar_user_association  # noqa: E402
+from app.models.calendar import CalendarType  # noqa: E402
+
+EPOCH = datetime(2025, 1, 6, tzinfo=timezone.utc)
+SPAN_DAYS = 365
+SHARED_CALENDAR_ID = 1
+
+
+def load(engine, *, members: int, events_per_member: int, seed: int) -> None:
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    rng = random.Random(seed)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": i, "username": f"u{i}", "email": f"u{i}@example.com",
+             "hashed_password": "x", "is_active": True}
+            for i in range(1, members + 1)
+        ])
+        # Calendar 1 is the shared one, calendar i + 1 is member i's personal calendar
+        conn.execute(insert(Calendar), [
+            {"id": SHARED_CALENDAR_ID, "name": "team", "owner_id": 1,
+             "calendar_type": CalendarType.GENERAL}
+        ] + [
+            {"id": i + 1, "name": f"personal {i}", "owner_id": i,
+             "calendar_type": CalendarType.PERSONAL}
+            for i in range(1, members + 1)
+        ])
+        conn.execute(insert(calendar_user_association), [
+            {"calendar_id": SHARED_CALENDAR_ID, "user_id": i} for i in range(2, members + 1)
+        ])
+        for user_id in range(1, members + 1):
+            rows = []
+            for _ in range(events_per_member):
+                day = EPOCH + timedelta(days=rng.randrange(SPAN_DAYS))
+                start = day + timedelta(hours=rng.randint(7, 18), minutes=rng.choice((0, 30)))
+                rows.append({
+                    "title": "busy", "description": "x" * 200,
+                    "start_time": start,
+                    "end_time": start + timedelta(minutes=rng.choice((30, 60, 90))),
+                    "calendar_id": user_id + 1, "creator_id": user_id,
+                })
+            conn.execute(insert(Event), rows)
+    print(f"loaded {members} members x {events_per_member} events")
+
+
+def client_side(db, *, start, end, duration, slots):
+    """What the Flutter client does today, minus the HTTP round trips."""
+    member_ids = crud.calendar.get_member_ids(db, calendar_id=SHARED_CALENDAR_ID)
+    calendar_ids = [
+        calendar.id
+        for user_id in member_ids
+        for calendar in crud.calendar.get_multi_by_owner(db, owner_id=user_id)
+    ]
+    intervals = []
+    for calendar_id in calendar_ids:
+        skip = 0
+        while True:
+            page = crud.event.get_multi_by_calendar(db, calendar_id=calendar_id, skip=skip, limit=100)
+            intervals.extend(
+                (as_utc(e.start_time), as_utc(e.end_time)) for e in page if e.end_time is not None
+            )
+            if len(page) < 100:
+                break
+            skip += 100
+    busy = merge_intervals(intervals, window_start=start, window_end=end)
+    return busy, find_free_slots(busy, window_start=start, window_end=end, duration=duration, count=slots)
+
+
+def server_side(db, *, start, end, duration, slots):
+    member_ids = crud.calendar.get_member_ids(db, calendar_id=SHARED_CALENDAR_ID)
+    intervals = crud.event.get_busy_intervals(db, user_ids=member_ids, start_date=start, end_date=end)
+    busy = merge_intervals(intervals, window_start=start, window_end=end)
+    return busy, find_free_slots(busy, window_start=start, window_end=end, duration=duration, count=slots)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--database-url", default=os.environ["DATABASE_URL"])
+    parser.add_argument("--members", type=int, default=500)
+    parser.add_argument("--events-per-member", type=int, default=400)
+    parser.add_argument("--window-days", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-load", action="store_true", help="reuse the existing tables")
+    args = parser.parse_args()
+
+    if args.database_url.startswith("sqlite:///"):
+        os.makedirs(os.path.dirname(args.database_url[len("sqlite:///"):]) or ".", exist_ok=True)
+    engine = create_engine(args.database_url)
+    if not args.skip_load:
+        load(engine, members=args.members, events_per_member=args.events_per_member, seed=args.seed)
+
+    Session = sessionmaker(bind=engine)
+    start = EPOCH + timedelta(days=90)
+    end = start + timedelta(days=args.window_days)
+    params = dict(start=start, end=end, duration=timedelta(minutes=60), slots=10)
+    results = {}
+    for name, fn in (("client-side union", client_side), ("free-busy endpoint path", server_side)):
+        samples = []
+        for _ in range(args.repeat):
+            with Session() as db:
+                t0 = time.perf_counter()
+                results[name] = fn(db, **params)
+                samples.append(time.perf_counter() - t0)
+        print(f"  {name:<24} median {statistics.median(samples) * 1000:10.1f} ms")
+    same = results["client-side union"] == results["free-busy endpoint path"]
+    busy, free = results["free-busy endpoint path"]
+    print(f"  {len(busy)} busy blocks, {len(free)} free slots, results identical: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark: iCalendar import and export throughput.
+
+Writes a synthetic .ics file, imports it through `ical.parse_events` +
+`CRUDEvent.bulk_create_for_calendar`, then exports it again through
+`CRUDEvent.stream_by_calendar` + `ical.serialize_calendar`. Reports events per
+second; with --trace-memory it also reports the peak Python heap of each
+phase (tracemalloc slows everything down, so throughput is not comparable).
+
+Usage (from backend/):
+    python -m benchmarks.bench_ics --events 100000
+    python -m benchmarks.bench_ics --database-url postgresql+psycopg2://...
+
+The target database is dropped and recreated, never point it at real data.
+"""
+import argparse
+import os
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./blob/bench/ics.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app import crud  # noqa: E402
+from app.core import ical  # noqa: E402
+from app.models import Base, Calendar, User  # noqa: E402
+from app.models.calendar import CalendarType  # noqa: E402
+
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def write_ics(path: str, *, events: int, seed: int) -> None:
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//bench//EN\r\n")
+        for i in range(events):
+            start = EPOCH + timedelta(minutes=rng.randrange(3 * 365 * 24 * 60))
+            end = start + timedelta(minutes=rng.choice((30, 60, 90)))
+            f.write(
+                "BEGIN:VEVENT\r\n"
+                f"UID:bench-{i}@example.com\r\n"
+                f"DTSTART:{start:%Y%m%dT%H%M%SZ}\r\n"
+                f"DTEND:{end:%Y%m%dT%H%M%SZ}\r\n"
+                f"SUMMARY:Event {i}\r\n"
+                f"DESCRIPTION:{'lorem ipsum ' * 8}\r\n"
+                + ("RRULE:FREQ=WEEKLY;COUNT=10\r\n" if i % 50 == 0 else "")
+                + "END:VEVENT\r\n"
+            )
+        f.write("END:VCALENDAR\r\n")
+
+
+def measure(label: str, events: int, fn, *, trace_memory: bool):
+    if trace_memory:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - t0
+    line = f"  {label:<8} {elapsed:7.2f} s  {events / elapsed:10,.0f} events/s"
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        line += f"  peak heap {peak / 2**20:6.1f} MiB"
+    print(line)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--database-url", default=os.environ["DATABASE_URL"])
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--trace-memory", action="store_true")
+    args = parser.parse_args()
+
+    os.makedirs("blob/bench", exist_ok=True)
+    if args.database_url.startswith("sqlite:///"):
+        os.makedirs(os.path.dirname(args.database_url[len("sqlite:///"):]) or ".", exist_ok=True)
+    engine = create_engine(args.database_url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"id": 1, "username": "bench", "email": "bench@example.com",
+                                     "hashed_password": "x", "is_active": True}])
+        conn.execute(insert(Calendar), [{"id": 1, "name": "bench", "owner_id": 1,
+                                         "calendar_type": CalendarType.GENERAL}])
+
+    path = "blob/bench/events.ics"
+    write_ics(path, events=args.events, seed=args.seed)
+    print(f"{args.events:,} events, {os.path.getsize(path) / 2**20:.1f} MiB file, {engine.dialect.name}")
+
+    def do_import():
+        with Session(engine) as db, open(path, encoding="utf-8", newline="") as f:
+            return crud.event.bulk_create_for_calendar(
+                db, rows=ical.parse_events(f), calendar_id=1, creator_id=1
+            )
+
+    def do_export():
+        size = 0
+        with Session(engine) as db:
+            events = crud.event.stream_by_calendar(db, calendar_id=1)
+            for chunk in ical.chunked(ical.serialize_calendar(events, name="bench")):
+                size += len(chunk.encode())
+        return size
+
+    imported = measure("import", args.events, do_import, trace_memory=args.trace_memory)
+    assert imported == args.events, imported
+    exported = measure("export", args.events, do_export, trace_memory=args.trace_memory)
+    print(f"  exported {exported / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
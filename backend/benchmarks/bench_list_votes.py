@@ -0,0 +1,133 @@
+"""
+Benchmark: GET /list-items/list/{list_id}/with-votes for one page.
+
+Compares the previous implementation (load `(ListItem, vote_count)` entities,
+build a dict per row, let FastAPI validate the `List[dict]` response_model and
+render it with the stdlib `json` encoder) against the current one (select the
+schema's columns plus the vote count and serialize the rows in one pass with
+`serialize_many`). Both are timed end to end, query included.
+
+Usage (from backend/):
+    python -m benchmarks.bench_list_votes --items 1000 --votes 5000
+    python -m benchmarks.bench_list_votes --database-url postgresql+psycopg2://...
+
+The target database is dropped and recreated, never point it at real data.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./blob/bench/list_votes.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+
+from app import crud  # noqa: E402
+from app.core.serialization import schema_columns, serialize_many  # noqa: E402
+from app.models import Base, Calendar, List, ListItem, User, Vote  # noqa: E402
+from app.models.calendar import CalendarType  # noqa: E402
+from app.models.list import ListType  # noqa: E402
+from app.schemas import list_item as list_item_schemas  # noqa: E402
+
+
+def load(engine, *, items: int, votes: int, seed: int) -> None:
+    rng = random.Random(seed)
+    users = max(1, votes // items + 1)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": i, "username": f"u{i}", "email": f"u{i}@example.com",
+             "hashed_password": "x", "is_active": True}
+            for i in range(1, users + 1)
+        ])
+        conn.execute(insert(Calendar), [
+            {"id": 1, "name": "team", "owner_id": 1, "calendar_type": CalendarType.GENERAL}
+        ])
+        conn.execute(insert(List), [
+            {"id": 1, "name": "ideas", "list_type_enum": ListType.PRIORITY, "calendar_id": 1}
+        ])
+        conn.execute(insert(ListItem), [
+            {"id": i, "content": f"idea {i}", "is_completed": i % 4 == 0, "list_id": 1, "creator_id": 1}
+            for i in range(1, items + 1)
+        ])
+        # One vote per (user, item) at most
+        pairs = rng.sample(range(users * items), min(votes, users * items))
+        conn.execute(insert(Vote), [
+            {"user_id": pair // items + 1, "list_item_id": pair % items + 1} for pair in pairs
+        ])
+    print(f"loaded {items} items and {len(pairs)} votes")
+
+
+def timed(fn, repeat: int, number: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - t0) / number)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--database-url", default=os.environ["DATABASE_URL"])
+    parser.add_argument("--items", type=int, default=1000, help="items in the list, all on one page")
+    parser.add_argument("--votes", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-load", action="store_true", help="reuse the existing tables")
+    args = parser.parse_args()
+
+    if args.database_url.startswith("sqlite:///"):
+        os.makedirs(os.path.dirname(args.database_url[len("sqlite:///"):]) or ".", exist_ok=True)
+    engine = create_engine(args.database_url)
+    if not args.skip_load:
+        load(engine, items=args.items, votes=args.votes, seed=args.seed)
+
+    schema = list_item_schemas.ListItem
+    dict_adapter = TypeAdapter(list[dict])
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        def before():
+            db.expire_all()
+            rows = crud.list_item.get_multi_with_vote_counts(db, list_id=1, limit=args.items)
+            result = [
+                {
+                    "id": item.id,
+                    "content": item.content,
+                    "is_completed": item.is_completed,
+                    "list_id": item.list_id,
+                    "creator_id": item.creator_id,
+                    "created_at": item.created_at,
+                    "vote_count": vote_count or 0,
+                }
+                for item, vote_count in rows
+            ]
+            return JSONResponse(
+                dict_adapter.dump_python(dict_adapter.validate_python(result), mode="json")
+            ).body
+
+        def after():
+            rows = crud.list_item.get_multi_with_vote_counts(
+                db, list_id=1, limit=args.items, columns=schema_columns(schema, ListItem)
+            )
+            return serialize_many(schema, rows).body
+
+        def by_id(body):
+            return sorted(json.loads(body), key=lambda item: item["id"])
+
+        print(f"identical output: {by_id(before()) == by_id(after())}")
+        for label, fn in (("entities + dicts + List[dict]", before), ("column rows + serialize_many", after)):
+            print(f"  {label:<30} median {timed(fn, args.repeat, args.number) * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark: cost of profiling GET /list-items/list/{list_id}/with-votes.
+
+Loads one list (see bench_list_votes) and times the endpoint end to end
+through the ASGI app, with the response cache off, in three setups: without
+the profiling middleware (PROFILING_ENABLED=false), with it installed but the
+request not selected (no header, sample rate 0), and with every request
+profiled in "sample" mode (folded stacks written to a temporary directory).
+
+Usage (from backend/):
+    python -m benchmarks.bench_profiling --items 100 1000
+    python -m benchmarks.bench_profiling --interval-ms 1 --database-url postgresql+psycopg2://...
+
+The target database is dropped and recreated, never point it at real data.
+"""
+import argparse
+import os
+import tempfile
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./blob/bench/profiling.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.api.deps import get_db  # noqa: E402
+from app.core.profiling import ProfilingMiddleware  # noqa: E402
+from app.core.response_cache import response_cache  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.core.single_flight import single_flight  # noqa: E402
+from app.main import app  # noqa: E402
+from benchmarks.bench_list_votes import load, timed  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--database-url", default=os.environ["DATABASE_URL"])
+    parser.add_argument("--items", type=int, nargs="+", default=[100, 1000], help="items in the list, all on one page")
+    parser.add_argument("--interval-ms", type=float, default=2.0, help="sampling interval of the profiled runs")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.database_url.startswith("sqlite:///"):
+        os.makedirs(os.path.dirname(args.database_url[len("sqlite:///"):]) or ".", exist_ok=True)
+    engine = create_engine(args.database_url)
+    Session = sessionmaker(bind=engine)
+
+    def session():
+        with Session() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = session
+    response_cache.enabled = False
+    single_flight.enabled = False
+    headers = {"Authorization": f"Bearer {create_access_token(subject='u1@example.com')}"}
+
+    with tempfile.TemporaryDirectory() as directory:
+        def profiled(sample_rate):
+            return ProfilingMiddleware(
+                app, routes=app.routes, directory=directory, token="", sample_rate=sample_rate,
+                route_templates=[], interval=args.interval_ms / 1000, max_files=10,
+            )
+
+        clients = {
+            "absent": TestClient(app, headers=headers),
+            "idle": TestClient(profiled(0.0), headers=headers),
+            "profiled": TestClient(profiled(1.0), headers=headers),
+        }
+        for items in args.items:
+            load(engine, items=items, votes=items * 5, seed=args.seed)
+            url = f"/api/v1/list-items/list/1/with-votes?limit={items}"
+            timings = {}
+            for setup, client in clients.items():
+                def read():
+                    assert client.get(url).status_code == 200
+
+                read()
+                timings[setup] = timed(read, args.repeat, args.number)
+            print(
+                f"{items:>7} items  absent {timings['absent'] * 1e3:7.2f} ms  "
+                f"idle {timings['idle'] * 1e3:7.2f} ms ({(timings['idle'] / timings['absent'] - 1) * 100:+5.1f}%)  "
+                f"profiled {timings['profiled'] * 1e3:7.2f} ms ({(timings['profiled'] / timings['absent'] - 1) * 100:+5.1f}%)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: cached against uncached GET /list-items/list/{list_id}/with-votes.
+
+Loads one list (see bench_list_votes) and times the endpoint end to end
+through the ASGI app with the response cache disabled, then enabled with a
+warm entry, then enabled with a write (one vote toggled) between every read,
+which is the worst case: every read misses and re-renders.
+
+Usage (from backend/):
+    python -m benchmarks.bench_response_cache --items 1000 --votes 5000
+    python -m benchmarks.bench_response_cache --database-url postgresql+psycopg2://...
+
+The target database is dropped and recreated, never point it at real data.
+"""
+import argparse
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./blob/bench/response_cache.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app import crud  # noqa: E402
+from app.api.deps import get_db  # noqa: E402
+from app.core.response_cache import response_cache  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import ListItem  # noqa: E402
+from benchmarks.bench_list_votes import load, timed  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--database-url", default=os.environ["DATABASE_URL"])
+    parser.add_argument("--items", type=int, default=1000, help="items in the list, all on one page")
+    parser.add_argument("--votes", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.database_url.startswith("sqlite:///"):
+        os.makedirs(os.path.dirname(args.database_url[len("sqlite:///"):]) or ".", exist_ok=True)
+    engine = create_engine(args.database_url)
+    load(engine, items=args.items, votes=args.votes, seed=args.seed)
+    Session = sessionmaker(bind=engine)
+
+    def session():
+        with Session() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = session
+    client = TestClient(app, headers={"Authorization": f"Bearer {create_access_token(subject='u1@example.com')}"})
+    url = f"/api/v1/list-items/list/1/with-votes?limit={args.items}"
+
+    def read():
+        response = client.get(url)
+        assert response.status_code == 200
+        return response.content
+
+    def write_then_read():
+        with Session() as db:
+            item = db.get(ListItem, 1)
+            crud.list_item.update(db, db_obj=item, obj_in={"is_completed": not item.is_completed})
+        return read()
+
+    response_cache.enabled = False
+    uncached_body = read()
+    uncached = timed(read, args.repeat, args.number)
+    response_cache.enabled = True
+    response_cache.clear()
+    read()
+    print(f"identical output: {read() == uncached_body}")
+    cached = timed(read, args.repeat, args.number)
+    invalidated = timed(write_then_read, args.repeat, args.number)
+    stats = response_cache.stats()
+
+    print(f"  {'cache disabled':<24} median {uncached * 1e3:8.2f} ms")
+    print(f"  {'cache hit':<24} median {cached * 1e3:8.2f} ms  ({uncached / cached:5.1f}x)")
+    print(f"  {'write + read (miss)':<24} median {invalidated * 1e3:8.2f} ms")
+    print(f"  hit rate {stats['hit_rate']:.2f}, {stats['invalidations']} invalidations, {stats['bytes']} bytes cached")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Benchmark: serializing a page of rows for list endpoints.
+
+Compares, per schema (Event, ListItem, Vote, List), the path FastAPI takes for
+`response_model` endpoints (validate ORM objects through the Pydantic model
+with `from_attributes`, dump in JSON mode, render with the stdlib `json`
+encoder) against `RowSerializer` + `ORJSONResponse`, from ORM objects and from
+row tuples selected with `schema_columns`. Each path is timed with and without
+the query that loads the page.
+
+Usage (from backend/):
+    python -m benchmarks.bench_serialization --rows 100
+    python -m benchmarks.bench_serialization --database-url postgresql+psycopg2://...
+
+The target database is dropped and recreated, never point it at real data.
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./blob/bench/serialization.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import create_engine, insert, select  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+
+from app.core.serialization import ORJSONResponse, get_serializer, schema_columns  # noqa: E402
+from app.models import Base, Calendar, Event, List, ListItem, User, Vote  # noqa: E402
+from app.models.calendar import CalendarType  # noqa: E402
+from app.models.list import ListType  # noqa: E402
+from app.schemas import event as event_schemas  # noqa: E402
+from app.schemas import list as list_schemas  # noqa: E402
+from app.schemas import list_item as list_item_schemas  # noqa: E402
+from app.schemas import vote as vote_schemas  # noqa: E402
+
+EPOCH = datetime(2025, 1, 6, tzinfo=timezone.utc)
+CASES = (
+    ("Event", event_schemas.Event, Event),
+    ("ListItem", list_item_schemas.ListItem, ListItem),
+    ("Vote", vote_schemas.Vote, Vote),
+    ("List", list_schemas.List, List),
+)
+
+
+def load(engine, *, rows: int) -> None:
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": i, "username": f"u{i}", "email": f"u{i}@example.com",
+             "hashed_password": "x", "is_active": True}
+            for i in range(1, rows + 1)
+        ])
+        conn.execute(insert(Calendar), [
+            {"id": 1, "name": "team", "owner_id": 1, "calendar_type": CalendarType.GENERAL}
+        ])
+        conn.execute(insert(List), [
+            {"id": i, "name": f"list {i}", "list_type_enum": ListType.PRIORITY, "calendar_id": 1}
+            for i in range(1, rows + 1)
+        ])
+        conn.execute(insert(ListItem), [
+            {"id": i, "content": f"item {i}", "is_completed": i % 3 == 0, "list_id": 1, "creator_id": 1}
+            for i in range(1, rows + 1)
+        ])
+        conn.execute(insert(Vote), [
+            {"id": i, "user_id": i, "list_item_id": 1} for i in range(1, rows + 1)
+        ])
+        conn.execute(insert(Event), [
+            {"title": f"event {i}", "description": "x" * 200,
+             "start_time": EPOCH + timedelta(hours=i), "end_time": EPOCH + timedelta(hours=i, minutes=30),
+             "calendar_id": 1, "creator_id": 1}
+            for i in range(rows)
+        ])
+    print(f"loaded {rows} rows per table")
+
+
+def timed(fn, repeat: int, number: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - t0) / number)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--database-url", default=os.environ["DATABASE_URL"])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--skip-load", action="store_true", help="reuse the existing tables")
+    args = parser.parse_args()
+
+    if args.database_url.startswith("sqlite:///"):
+        os.makedirs(os.path.dirname(args.database_url[len("sqlite:///"):]) or ".", exist_ok=True)
+    engine = create_engine(args.database_url)
+    if not args.skip_load:
+        load(engine, rows=args.rows)
+
+    Session = sessionmaker(bind=engine)
+    for name, schema, model in CASES:
+        adapter = TypeAdapter(list[schema])
+        serializer = get_serializer(schema)
+        columns = schema_columns(schema, model)
+        with Session() as db:
+            def query_objects():
+                db.expire_all()
+                return db.query(model).limit(args.rows).all()
+
+            def query_rows():
+                return db.execute(select(*columns).limit(args.rows)).all()
+
+            objects, rows = query_objects(), query_rows()
+
+            def pydantic_path(items):
+                return JSONResponse(
+                    adapter.dump_python(adapter.validate_python(items, from_attributes=True), mode="json")
+                ).body
+
+            def fast_path(items):
+                return ORJSONResponse(serializer.many(items)).body
+
+            same = json.loads(pydantic_path(objects)) == json.loads(fast_path(objects)) == json.loads(fast_path(rows))
+            print(f"{name} ({len(objects)} rows, identical output: {same})")
+            for label, fn in (
+                ("pydantic + json", lambda: pydantic_path(objects)),
+                ("serializer + orjson", lambda: fast_path(objects)),
+                ("serializer + orjson, rows", lambda: fast_path(rows)),
+                ("query + pydantic + json", lambda: pydantic_path(query_objects())),
+                ("query rows + serializer + orjson", lambda: fast_path(query_rows())),
+            ):
+                print(f"  {label:<34} median {timed(fn, args.repeat, args.number) * 1e6:10.1f} us")
+
+
+if __name__ == "__main__":
+    main()
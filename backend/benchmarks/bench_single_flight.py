@@ -0,0 +1,103 @@
+"""
+Load test: concurrent identical GET /list-items/list/{list_id}/with-votes.
+
+Loads one list (see bench_list_votes) and has --clients threads poll the
+endpoint for --seconds through the ASGI app, with the response cache off so
+every request would reach the database (as right after each vote during a
+live vote). Runs once without and once with single-flight coalescing and
+reports requests/s, vote-count GROUP BY queries/s and queries per request;
+with coalescing the query rate should stay flat as --clients grows.
+
+Usage (from backend/):
+    python -m benchmarks.bench_single_flight --clients 10 50 100
+    python -m benchmarks.bench_single_flight --database-url postgresql+psycopg2://...
+
+The target database is dropped and recreated, never point it at real data.
+"""
+import argparse
+import os
+import threading
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./blob/bench/single_flight.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.api.deps import get_db  # noqa: E402
+from app.core.response_cache import response_cache  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.core.single_flight import single_flight  # noqa: E402
+from app.main import app  # noqa: E402
+from benchmarks.bench_list_votes import load  # noqa: E402
+
+
+def run(client: TestClient, url: str, clients: int, seconds: float, queries: list) -> tuple:
+    stop = time.perf_counter() + seconds
+    served = [0] * clients
+
+    def poll(index):
+        while time.perf_counter() < stop:
+            assert client.get(url).status_code == 200
+            served[index] += 1
+
+    queries.clear()
+    threads = [threading.Thread(target=poll, args=(index,)) for index in range(clients)]
+    t0 = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - t0
+    return sum(served) / elapsed, len(queries) / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--database-url", default=os.environ["DATABASE_URL"])
+    parser.add_argument("--items", type=int, default=1000, help="items in the list, all on one page")
+    parser.add_argument("--votes", type=int, default=5000)
+    parser.add_argument("--clients", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.database_url.startswith("sqlite:///"):
+        os.makedirs(os.path.dirname(args.database_url[len("sqlite:///"):]) or ".", exist_ok=True)
+    engine = create_engine(args.database_url, pool_size=40, max_overflow=0)
+    load(engine, items=args.items, votes=args.votes, seed=args.seed)
+    Session = sessionmaker(bind=engine)
+
+    def session():
+        with Session() as db:
+            yield db
+
+    queries = []
+    event.listen(
+        engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *rest: "GROUP BY" in statement and queries.append(1),
+    )
+    app.dependency_overrides[get_db] = session
+    response_cache.enabled = False
+    url = f"/api/v1/list-items/list/1/with-votes?limit={args.items}"
+    headers = {"Authorization": f"Bearer {create_access_token(subject='u1@example.com')}"}
+
+    with TestClient(app, headers=headers) as client:
+        client.get(url)
+        for clients in args.clients:
+            for enabled in (False, True):
+                single_flight.enabled = enabled
+                single_flight.clear()
+                rps, qps = run(client, url, clients, args.seconds, queries)
+                rate = single_flight.stats().get("list_items.with_votes_coalesced_rate", 0.0)
+                print(
+                    f"{clients:>5} clients  single-flight {'on ' if enabled else 'off'}  "
+                    f"{rps:8.1f} req/s  {qps:8.1f} GROUP BY/s  {qps / rps:5.2f} per request  "
+                    f"coalesced {rate:5.1%}"
+                )
+
+
+if __name__ == "__main__":
+    main()
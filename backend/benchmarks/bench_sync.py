@@ -0,0 +1,78 @@
+"""
+Benchmark: delta sync against a full download.
+
+Loads a calendar with the given number of list items (plus votes and events,
+see bench_export), edits --changes random items through the CRUD layer and
+times `sync.changes_since` from the cursor taken before the edits next to a
+full NDJSON export, which is what a client without delta sync has to fetch.
+The sync should stay flat as the calendar grows and scale with --changes.
+
+Usage (from backend/):
+    python -m benchmarks.bench_sync --sizes 10000 100000 --changes 10 100
+    python -m benchmarks.bench_sync --database-url postgresql+psycopg2://...
+
+The target database is dropped and recreated, never point it at real data.
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./blob/bench/sync.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app import crud  # noqa: E402
+from app.core import export, sync  # noqa: E402
+from app.models import ListItem  # noqa: E402
+from benchmarks.bench_export import load  # noqa: E402
+
+
+def median_ms(run, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--database-url", default=os.environ["DATABASE_URL"])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000], help="list items per run")
+    parser.add_argument("--changes", type=int, nargs="+", default=[10, 100, 1000], help="items edited before syncing")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.database_url.startswith("sqlite:///"):
+        os.makedirs(os.path.dirname(args.database_url[len("sqlite:///"):]) or ".", exist_ok=True)
+    engine = create_engine(args.database_url)
+    rng = random.Random(args.seed)
+
+    for size in args.sizes:
+        load(engine, items=size, seed=args.seed)
+        with Session(bind=engine) as db:
+            full = median_ms(lambda: sum(len(chunk) for chunk in export.stream_calendar(db, 1)), args.repeat)
+            calendar_ids = crud.calendar.get_accessible_ids(db, user_id=1)
+            for changes in args.changes:
+                since = sync.current_position(db)
+                for item_id in rng.sample(range(1, size + 1), min(changes, size)):
+                    item = db.get(ListItem, item_id)
+                    crud.list_item.update(db, db_obj=item, obj_in={"is_completed": not item.is_completed})
+                delta = median_ms(
+                    lambda: sync.changes_since(db, since=since, user_id=1, calendar_ids=calendar_ids, limit=5000),
+                    args.repeat,
+                )
+                print(
+                    f"{size:>9} items  {changes:>6} changes  sync {delta:9.1f} ms  "
+                    f"full export {full:9.1f} ms  ({full / delta:6.1f}x)"
+                )
+
+
+if __name__ == "__main__":
+    main()
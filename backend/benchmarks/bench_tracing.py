@@ -0,0 +1,79 @@
+"""
+Benchmark: cost of tracing GET /list-items/list/{list_id}/with-votes.
+
+Loads one list (see bench_list_votes) and times the endpoint end to end
+through the ASGI app, with the response cache off so every request runs the
+dependencies, CRUD calls and serialization that carry spans, at sample rates
+0 (the instrumented code only checks for a current span) and 1 (about 10
+spans per request, buffered in memory, not exported).
+
+Usage (from backend/):
+    python -m benchmarks.bench_tracing --items 100 1000
+    python -m benchmarks.bench_tracing --database-url postgresql+psycopg2://...
+
+The target database is dropped and recreated, never point it at real data.
+"""
+import argparse
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./blob/bench/tracing.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.api.deps import get_db  # noqa: E402
+from app.core.response_cache import response_cache  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.core.single_flight import single_flight  # noqa: E402
+from app.core.tracing import tracer  # noqa: E402
+from app.main import app  # noqa: E402
+from benchmarks.bench_list_votes import load, timed  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--database-url", default=os.environ["DATABASE_URL"])
+    parser.add_argument("--items", type=int, nargs="+", default=[100, 1000], help="items in the list, all on one page")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.database_url.startswith("sqlite:///"):
+        os.makedirs(os.path.dirname(args.database_url[len("sqlite:///"):]) or ".", exist_ok=True)
+    engine = create_engine(args.database_url)
+    Session = sessionmaker(bind=engine)
+
+    def session():
+        with Session() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = session
+    response_cache.enabled = False
+    single_flight.enabled = False
+    client = TestClient(app, headers={"Authorization": f"Bearer {create_access_token(subject='u1@example.com')}"})
+
+    for items in args.items:
+        load(engine, items=items, votes=items * 5, seed=args.seed)
+        url = f"/api/v1/list-items/list/1/with-votes?limit={items}"
+
+        def read():
+            assert client.get(url).status_code == 200
+
+        timings = {}
+        for rate in (0.0, 1.0):
+            tracer.sample_rate = rate
+            tracer.clear()
+            read()
+            timings[rate] = timed(read, args.repeat, args.number)
+        spans = len(tracer.buffer) / (args.repeat * args.number + 1)
+        print(
+            f"{items:>7} items  unsampled {timings[0.0] * 1e3:7.2f} ms  sampled {timings[1.0] * 1e3:7.2f} ms  "
+            f"({(timings[1.0] / timings[0.0] - 1) * 100:+5.1f}%, {spans:.0f} spans/request)"
+        )
+
+
+if __name__ == "__main__":
+    main()
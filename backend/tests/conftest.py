@@ -9,6 +9,11 @@ from app.main import app
 from app.models.base import Base
 from app.api.deps import get_db
 from app import crud, models
+from app.core.access import access_cache
+from app.core.density import density_cache
+from app.core.response_cache import response_cache
+from app.core.single_flight import single_flight
+from app.core.tracing import tracer
 from app.core.security import create_access_token
 from app.schemas.user import UserCreate
 from app.schemas.calendar import CalendarCreate
@@ -44,6 +49,12 @@ def setup_and_teardown_db():
     yield
     # Clean up after test
     Base.metadata.drop_all(bind=engine)
+    # Ids are reused by the next test's database
+    density_cache.clear()
+    access_cache.clear()
+    response_cache.clear()
+    single_flight.clear()
+    tracer.clear()
 
 @pytest.fixture
 def db_session() -> Generator:
@@ -0,0 +1,126 @@
+import random
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.api import deps
+from app.core.access import access_cache
+from app.schemas.calendar import CalendarCreate
+from app.schemas.list import ListCreate
+from app.schemas.user import UserCreate
+from tests.conftest import engine
+
+
+def _status(check, *args) -> int:
+    try:
+        check(*args)
+    except HTTPException as exc:
+        return exc.status_code
+    return 200
+
+
+def _expected_calendar_status(db: Session, calendar_id: int, user: models.User) -> int:
+    calendar = db.get(models.Calendar, calendar_id)
+    if calendar is None:
+        return 404
+    if calendar.owner_id == user.id or user in calendar.members:
+        return 200
+    return 403
+
+
+class TestAccessCache:
+    """Test the cached authorization checks against the database."""
+
+    def test_checks_match_database_through_changes(self, db_session: Session):
+        """Test that cached checks agree with fresh queries after every membership, calendar and list change."""
+        rng = random.Random(7)
+        users = [
+            crud.user.create(db_session, obj_in=UserCreate(email=f"user{index}@example.com", password="password"))
+            for index in range(4)
+        ]
+        calendars, lists = [], []
+        for index in range(4):
+            calendar = crud.calendar.create_with_owner(
+                db_session, obj_in=CalendarCreate(name=f"Calendar {index}"), owner_id=users[index].id
+            )
+            calendars.append(calendar)
+            lists.append(crud.list_crud.create(db_session, obj_in=ListCreate(name="Todo", list_type="TODO", calendar_id=calendar.id)))
+
+        def assert_consistent():
+            db_session.expire_all()
+            calendar_ids = [calendar.id for calendar in calendars] + [999]
+            for user in users:
+                for calendar_id in calendar_ids:
+                    expected = _expected_calendar_status(db_session, calendar_id, user)
+                    assert _status(deps.check_calendar_access, db_session, calendar_id, user) == expected
+                for list_obj in lists:
+                    calendar_status = _expected_calendar_status(db_session, list_obj.calendar_id, user)
+                    assert _status(deps.check_list_access, db_session, list_obj.id, user) == calendar_status
+
+        assert_consistent()
+        for _ in range(30):
+            action = rng.choice(["share", "unshare", "transfer", "new_calendar", "delete_calendar", "new_list", "delete_list"])
+            calendar = rng.choice(calendars)
+            user = rng.choice(users)
+            if action == "share" and user not in calendar.members:
+                calendar.members.append(user)
+                db_session.commit()
+            elif action == "unshare" and calendar.members:
+                calendar.members.remove(rng.choice(calendar.members))
+                db_session.commit()
+            elif action == "transfer":
+                crud.calendar.update(db_session, db_obj=calendar, obj_in={"owner_id": user.id})
+            elif action == "new_calendar":
+                calendars.append(crud.calendar.create_with_owner(
+                    db_session, obj_in=CalendarCreate(name="New"), owner_id=user.id
+                ))
+            elif action == "delete_calendar" and len(calendars) > 1:
+                calendars.remove(calendar)
+                lists[:] = [list_obj for list_obj in lists if list_obj.calendar_id != calendar.id]
+                crud.calendar.remove(db_session, id=calendar.id)
+            elif action == "new_list":
+                lists.append(crud.list_crud.create(db_session, obj_in=ListCreate(name="More", list_type="TODO", calendar_id=calendar.id)))
+            elif action == "delete_list" and len(lists) > 1:
+                list_obj = rng.choice(lists)
+                lists.remove(list_obj)
+                crud.list_crud.remove(db_session, id=list_obj.id)
+            assert_consistent()
+
+        stats = access_cache.stats()
+        assert stats["calendars_hits"] > stats["calendars_misses"]
+        assert stats["lists_hits"] > stats["lists_misses"]
+
+    def test_warm_checks_run_no_queries(self, db_session: Session, test_user: models.User, test_list: models.List):
+        """Test that repeated access checks are answered from memory."""
+        deps.check_list_access(db_session, test_list.id, test_user)
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            for _ in range(5):
+                deps.check_calendar_access(db_session, test_list.calendar_id, test_user)
+                deps.check_list_access(db_session, test_list.id, test_user)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        assert statements == []
+        assert access_cache.stats()["calendars_hit_rate"] > 0.8
+
+    def test_rolled_back_changes_keep_cache(self, db_session: Session, test_user: models.User, test_calendar: models.Calendar):
+        """Test that a rolled back membership change does not invalidate anything."""
+        other = crud.user.create(db_session, obj_in=UserCreate(email="other@example.com", password="password"))
+        deps.check_calendar_access(db_session, test_calendar.id, test_user)
+        cached = len(access_cache)
+
+        test_calendar.members.append(other)
+        db_session.flush()
+        db_session.rollback()
+
+        assert len(access_cache) == cached
+        with pytest.raises(HTTPException) as exc_info:
+            deps.check_calendar_access(db_session, test_calendar.id, other)
+        assert exc_info.value.status_code == 403
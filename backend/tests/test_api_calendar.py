@@ -74,6 +74,204 @@ class TestCalendarAPI:
         )
         assert response.status_code == 403
 
+    def _count_queries(self, request):
+        from sqlalchemy import event
+        from tests.conftest import engine
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            response = request()
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        assert response.status_code == 200
+        return response, len(statements)
+
+    def test_calendar_reads_load_people_eagerly(self, authenticated_client: TestClient, test_user: User, db_session: Session):
+        """Test that calendar reads use a fixed number of queries however many calendars and members there are."""
+        from app import crud
+        from app.schemas.user import UserCreate
+
+        members = [
+            crud.user.create(db_session, obj_in=UserCreate(email=f"member{index}@example.com", password="password"))
+            for index in range(3)
+        ]
+        calendars = []
+        for index in range(5):
+            calendar = calendar_crud.create_with_owner(
+                db=db_session, obj_in=CalendarCreate(name=f"Calendar {index}"), owner_id=test_user.id
+            )
+            calendar.members.extend(members)
+            calendars.append(calendar)
+        db_session.commit()
+        calendar_id = calendars[0].id
+
+        # User lookup + calendars joined to their owner; no members in the listing
+        response, queries = self._count_queries(lambda: authenticated_client.get("/api/v1/calendars/"))
+        assert queries == 2
+        assert {f"Calendar {index}" for index in range(5)} <= {item["name"] for item in response.json()}
+        assert all("members" not in item and item["owner"]["id"] == test_user.id for item in response.json())
+
+        # User lookup + calendar joined to its owner + members
+        response, queries = self._count_queries(lambda: authenticated_client.get(f"/api/v1/calendars/{calendar_id}"))
+        assert queries == 3
+        assert sorted(member["email"] for member in response.json()["members"]) == [
+            "member0@example.com", "member1@example.com", "member2@example.com"
+        ]
+
+    def test_calendar_etag_covers_members(self, authenticated_client: TestClient, test_calendar, db_session: Session):
+        """Test that the calendar ETag changes with its row, its owner and its members."""
+        from app import crud
+        from app.core.security import create_access_token
+        from app.schemas.user import UserCreate
+
+        calendar_id = test_calendar.id
+        etag = authenticated_client.get(f"/api/v1/calendars/{calendar_id}").headers["etag"]
+        cached = authenticated_client.get(f"/api/v1/calendars/{calendar_id}", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+
+        member = crud.user.create(db_session, obj_in=UserCreate(email="member@example.com", password="password"))
+        test_calendar.members.append(member)
+        db_session.commit()
+        response = authenticated_client.get(f"/api/v1/calendars/{calendar_id}", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+
+        authenticated_client.put(f"/api/v1/calendars/{calendar_id}", json={"name": "Renamed"})
+        response = authenticated_client.get(f"/api/v1/calendars/{calendar_id}", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["name"] == "Renamed"
+        etag = response.headers["etag"]
+
+        # The embedded owner changes without touching the calendar row
+        test_calendar.owner.email = "renamed-owner@example.com"
+        db_session.commit()
+        response = authenticated_client.get(f"/api/v1/calendars/{calendar_id}", headers={
+            "If-None-Match": etag,
+            "Authorization": f"Bearer {create_access_token(subject='renamed-owner@example.com')}",
+        })
+        assert response.status_code == 200
+        assert response.json()["owner"]["email"] == "renamed-owner@example.com"
+
+    def test_calendar_overview(self, authenticated_client: TestClient, test_calendar, test_user: User, db_session: Session):
+        """Test GET /api/v1/calendars/{calendar_id}/overview counts, top items, events and query count."""
+        from datetime import datetime, timedelta, timezone
+        from app import crud
+        from app.schemas.event import EventCreate
+        from app.schemas.list import ListCreate
+        from app.schemas.list_item import ListItemCreate
+        from app.schemas.vote import VoteCreate
+        from app.schemas.user import UserCreate
+
+        voters = [
+            crud.user.create(db_session, obj_in=UserCreate(email=f"voter{index}@example.com", password="password"))
+            for index in range(3)
+        ]
+        day = datetime(2025, 6, 2, tzinfo=timezone.utc)
+        calendar_id = test_calendar.id
+
+        def populate(lists: int):
+            for list_index in range(lists):
+                list_obj = crud.list_crud.create(
+                    db_session, obj_in=ListCreate(name=f"List {list_index}", list_type="PRIORITY", calendar_id=calendar_id)
+                )
+                for item_index in range(4):
+                    item = crud.list_item.create_with_user(
+                        db_session,
+                        obj_in=ListItemCreate(content=f"Item {item_index}", list_id=list_obj.id, is_completed=item_index == 0),
+                        creator_id=test_user.id
+                    )
+                    for voter in voters[:item_index]:
+                        crud.vote.create_with_user(db_session, obj_in=VoteCreate(list_item_id=item.id), user_id=voter.id)
+                crud.event.create_with_user(
+                    db_session,
+                    obj_in=EventCreate(title=f"Event {list_index}", start_time=day + timedelta(hours=list_index), calendar_id=calendar_id),
+                    creator_id=test_user.id
+                )
+
+        params = {"start": day.isoformat(), "end": (day + timedelta(days=1)).isoformat(), "items_per_list": 2, "list_limit": 3}
+        populate(2)
+        # Warm the access cache so both measurements see the same lookups
+        authenticated_client.get(f"/api/v1/calendars/{calendar_id}/overview", params=params)
+        response, small_queries = self._count_queries(
+            lambda: authenticated_client.get(f"/api/v1/calendars/{calendar_id}/overview", params=params)
+        )
+        data = response.json()
+        assert data["calendar"]["id"] == calendar_id
+        assert [item["name"] for item in data["lists"]] == ["List 0", "List 1"]
+        first = data["lists"][0]
+        assert (first["item_count"], first["completed_count"], first["vote_count"]) == (4, 1, 6)
+        assert [(item["content"], item["vote_count"]) for item in first["top_items"]] == [("Item 3", 3), ("Item 2", 2)]
+        assert [event["title"] for event in data["events"]] == ["Event 0", "Event 1"]
+        assert not data["lists_truncated"] and not data["events_truncated"]
+
+        populate(4)
+        response, large_queries = self._count_queries(
+            lambda: authenticated_client.get(f"/api/v1/calendars/{calendar_id}/overview", params=params)
+        )
+        data = response.json()
+        assert len(data["lists"]) == 3 and data["lists_truncated"]
+        # User, calendar, lists, top items, single and recurring events
+        assert large_queries == small_queries == 6
+
+        response = authenticated_client.get(
+            f"/api/v1/calendars/{calendar_id}/overview",
+            params={"start": day.isoformat(), "end": (day - timedelta(days=1)).isoformat()}
+        )
+        assert response.status_code == 400
+
+    def test_calendar_ndjson_export(self, authenticated_client: TestClient, test_calendar, test_user: User, db_session: Session):
+        """Test GET /api/v1/calendars/{calendar_id}/export.ndjson records, scoping, batching and gzip."""
+        import gzip
+        import json
+        from datetime import datetime, timezone
+        from app import crud
+        from app.core import export
+        from app.schemas.calendar import CalendarCreate
+        from app.schemas.event import EventCreate
+        from app.schemas.list import ListCreate
+        from app.schemas.list_item import ListItemCreate
+        from app.schemas.vote import VoteCreate
+
+        calendar_id = test_calendar.id
+        other = calendar_crud.create_with_owner(db_session, obj_in=CalendarCreate(name="Other"), owner_id=test_user.id)
+        for target in (calendar_id, other.id):
+            list_obj = crud.list_crud.create(db_session, obj_in=ListCreate(name="Ideas", list_type="PRIORITY", calendar_id=target))
+            for index in range(3):
+                item = crud.list_item.create_with_user(
+                    db_session, obj_in=ListItemCreate(content=f"Idea {index}", list_id=list_obj.id), creator_id=test_user.id
+                )
+                crud.vote.create_with_user(db_session, obj_in=VoteCreate(list_item_id=item.id), user_id=test_user.id)
+            crud.event.create_with_user(
+                db_session,
+                obj_in=EventCreate(
+                    title="Weekly", start_time=datetime(2025, 6, 2, 9, tzinfo=timezone.utc), calendar_id=target,
+                    recurrence_rule="FREQ=WEEKLY", recurrence_exceptions=[datetime(2025, 6, 9, 9, tzinfo=timezone.utc)]
+                ),
+                creator_id=test_user.id
+            )
+
+        response = authenticated_client.get(f"/api/v1/calendars/{calendar_id}/export.ndjson")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        records = [json.loads(line) for line in response.text.splitlines()]
+        assert [record["type"] for record in records] == ["calendar", "list", *["list_item"] * 3, *["vote"] * 3, "event"]
+        assert records[0]["data"]["id"] == calendar_id
+        list_id = records[1]["data"]["id"]
+        items = authenticated_client.get(f"/api/v1/list-items/list/{list_id}").json()
+        assert [record["data"] for record in records[2:5]] == items
+        assert records[-1]["data"] == authenticated_client.get(f"/api/v1/events/{records[-1]['data']['id']}").json()
+
+        compressed = authenticated_client.get(f"/api/v1/calendars/{calendar_id}/export.ndjson", params={"gzip": True})
+        assert compressed.headers["content-type"] == "application/gzip"
+        assert gzip.decompress(compressed.content) == response.content
+
+        # One chunk per batch of cursor rows
+        with Session(bind=db_session.get_bind()) as stream_db:
+            chunks = list(export.stream_calendar(stream_db, calendar_id, batch_size=2))
+        assert [chunk.count(b"\n") for chunk in chunks] == [1, 1, 2, 1, 2, 1, 1]
+
     def test_update_calendar_endpoint(self, authenticated_client: TestClient, test_calendar):
         """Test PUT /api/v1/calendars/{calendar_id} endpoint."""
         update_data = {"name": "Updated Calendar Name"}
@@ -98,3 +296,59 @@ class TestCalendarAPI:
         # Verify it's deleted
         get_response = authenticated_client.get(f"/api/v1/calendars/{test_calendar.id}")
         assert get_response.status_code == 404
+
+    def test_free_busy_endpoint(self, authenticated_client: TestClient, test_calendar, test_user: User, db_session: Session):
+        """Test GET /api/v1/calendars/{calendar_id}/free-busy merges busy time of all members."""
+        from datetime import datetime, timedelta, timezone
+        from app import crud
+        from app.schemas.user import UserCreate
+        from app.schemas.event import EventCreate
+
+        member = crud.user.create(db_session, obj_in=UserCreate(email="member@example.com", password="password"))
+        test_calendar.members.append(member)
+        db_session.commit()
+        member_personal = crud.calendar.get_multi_by_owner(db_session, owner_id=member.id)[0]
+
+        day = datetime(2025, 6, 2, tzinfo=timezone.utc)
+        busy_events = [
+            (test_calendar.id, test_user.id, day + timedelta(hours=9), day + timedelta(hours=10)),
+            (member_personal.id, member.id, day + timedelta(hours=9, minutes=30), day + timedelta(hours=11)),
+            (member_personal.id, member.id, day + timedelta(hours=12), day + timedelta(hours=13)),
+        ]
+        for calendar_id, creator_id, start_time, end_time in busy_events:
+            crud.event.create_with_user(
+                db_session,
+                obj_in=EventCreate(title="Busy", start_time=start_time, end_time=end_time, calendar_id=calendar_id),
+                creator_id=creator_id
+            )
+
+        response = authenticated_client.get(
+            f"/api/v1/calendars/{test_calendar.id}/free-busy",
+            params={
+                "start": (day + timedelta(hours=8)).isoformat(),
+                "end": (day + timedelta(hours=14)).isoformat(),
+                "duration_minutes": 60,
+                "slots": 3
+            }
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        busy = [(datetime.fromisoformat(b["start"]).hour, datetime.fromisoformat(b["end"]).hour) for b in data["busy"]]
+        free = [(datetime.fromisoformat(f["start"]).hour, datetime.fromisoformat(f["end"]).hour) for f in data["free"]]
+        assert busy == [(9, 11), (12, 13)]
+        assert free == [(8, 9), (11, 12), (13, 14)]
+
+    def test_free_busy_invalid_window(self, authenticated_client: TestClient, test_calendar):
+        """Test that a window ending before it starts, or longer than the maximum, is rejected."""
+        response = authenticated_client.get(
+            f"/api/v1/calendars/{test_calendar.id}/free-busy",
+            params={"start": "2025-06-02T10:00:00Z", "end": "2025-06-02T09:00:00Z"}
+        )
+        assert response.status_code == 400
+
+        response = authenticated_client.get(
+            f"/api/v1/calendars/{test_calendar.id}/free-busy",
+            params={"start": "2025-01-01T00:00:00Z", "end": "2035-01-01T00:00:00Z"}
+        )
+        assert response.status_code == 400
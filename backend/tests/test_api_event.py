@@ -4,6 +4,7 @@ from datetime import datetime, timedelta, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud, models
+from app.core.config import settings
 from app.schemas.event import EventCreate
 
 
@@ -174,6 +175,85 @@ class TestEventAPI:
         assert response.status_code == 404
         assert response.json()["detail"] == "Event not found"
 
+    def test_event_access_checked_in_fetch_query(self, authenticated_client: TestClient, test_user: models.User, db_session):
+        """Test that reading an event fetches it and checks access in a single query, and 403s on foreign events."""
+        from sqlalchemy import event as sa_event
+        from app.schemas.user import UserCreate
+        from app.schemas.calendar import CalendarCreate
+        from tests.conftest import engine
+
+        other_user = crud.user.create(db_session, obj_in=UserCreate(email="other@example.com", password="password"))
+        shared = crud.calendar.create_with_owner(db_session, obj_in=CalendarCreate(name="Shared"), owner_id=other_user.id)
+        shared.members.append(test_user)
+        db_session.commit()
+        private = crud.calendar.create_with_owner(db_session, obj_in=CalendarCreate(name="Private"), owner_id=other_user.id)
+        start_time = datetime.now(timezone.utc) + timedelta(days=1)
+        shared_event = crud.event.create_with_user(
+            db_session, obj_in=EventCreate(title="Shared", start_time=start_time, calendar_id=shared.id), creator_id=other_user.id
+        )
+        private_event = crud.event.create_with_user(
+            db_session, obj_in=EventCreate(title="Private", start_time=start_time, calendar_id=private.id), creator_id=other_user.id
+        )
+
+        shared_id, private_id = shared_event.id, private_event.id
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        sa_event.listen(engine, "before_cursor_execute", listener)
+        try:
+            response = authenticated_client.get(f"/api/v1/events/{shared_id}")
+        finally:
+            sa_event.remove(engine, "before_cursor_execute", listener)
+        assert response.status_code == 200
+        # One query loads the current user, one the event with its access flag
+        assert len(statements) == 2
+
+        assert authenticated_client.get(f"/api/v1/events/{private_id}").status_code == 403
+        assert authenticated_client.put(f"/api/v1/events/{private_id}", json={"title": "Mine"}).status_code == 403
+        assert authenticated_client.delete(f"/api/v1/events/{private_id}").status_code == 403
+        assert authenticated_client.delete(f"/api/v1/events/{shared_id}").status_code == 200
+
+    def test_sparse_fieldset(self, authenticated_client: TestClient, test_calendar: models.Calendar, test_user: models.User, db_session):
+        """Test that ?fields= trims both the response and the columns the event query reads."""
+        from sqlalchemy import event as sa_event
+        from tests.conftest import engine
+
+        start_time = datetime(2025, 3, 3, 9, 0, tzinfo=timezone.utc)
+        crud.event.create_with_user(
+            db_session,
+            obj_in=EventCreate(title="Standup", description="Long agenda", start_time=start_time, calendar_id=test_calendar.id),
+            creator_id=test_user.id
+        )
+        crud.event.create_with_user(
+            db_session,
+            obj_in=EventCreate(title="Daily", start_time=start_time, recurrence_rule="FREQ=DAILY;COUNT=2", calendar_id=test_calendar.id),
+            creator_id=test_user.id
+        )
+        calendar_id = test_calendar.id
+        full = authenticated_client.get(
+            f"/api/v1/events/calendar/{calendar_id}/date-range",
+            params={"start_date": "2025-03-01T00:00:00Z", "end_date": "2025-03-10T00:00:00Z"}
+        ).json()
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        sa_event.listen(engine, "before_cursor_execute", listener)
+        try:
+            response = authenticated_client.get(
+                f"/api/v1/events/calendar/{calendar_id}/date-range",
+                params={"start_date": "2025-03-01T00:00:00Z", "end_date": "2025-03-10T00:00:00Z", "fields": "id,title,start_time"}
+            )
+        finally:
+            sa_event.remove(engine, "before_cursor_execute", listener)
+
+        assert response.status_code == 200
+        assert response.json() == [{key: event[key] for key in ("title", "start_time", "id")} for event in full]
+        single_query = next(sql for sql in statements if "recurrence_rule IS NULL" in sql)
+        assert "description" not in single_query.split("FROM")[0]
+
+        response = authenticated_client.get(f"/api/v1/events/calendar/{calendar_id}", params={"fields": "id,location"})
+        assert response.status_code == 400
+
     def test_update_event(self, authenticated_client: TestClient, test_calendar: models.Calendar):
         """Test updating an event."""
         # Create event
@@ -255,6 +335,362 @@ class TestEventAPI:
         # Note: Currently no validation for end_time < start_time
         assert response.status_code == 200
 
+    def test_create_recurring_event(self, authenticated_client: TestClient, test_calendar: models.Calendar):
+        """Test creating a recurring event and reading its occurrences."""
+        start_time = datetime(2025, 3, 3, 9, tzinfo=timezone.utc)
+        event_data = {
+            "title": "Weekly Sync",
+            "start_time": start_time.isoformat(),
+            "calendar_id": test_calendar.id,
+            "recurrence_rule": "FREQ=WEEKLY;COUNT=3"
+        }
+
+        response = authenticated_client.post("/api/v1/events/", json=event_data)
+        assert response.status_code == 200
+        assert response.json()["recurrence_rule"] == "FREQ=WEEKLY;COUNT=3"
+
+        response = authenticated_client.get(
+            f"/api/v1/events/calendar/{test_calendar.id}/date-range",
+            params={
+                "start_date": start_time.isoformat(),
+                "end_date": (start_time + timedelta(weeks=10)).isoformat()
+            }
+        )
+        assert response.status_code == 200
+        occurrences = response.json()
+        assert len(occurrences) == 3
+        assert all(occurrence["recurrence_id"] is not None for occurrence in occurrences)
+
+    def test_create_event_invalid_recurrence_rule(self, authenticated_client: TestClient, test_calendar: models.Calendar):
+        """Test that an unparsable recurrence rule is rejected."""
+        event_data = {
+            "title": "Broken Series",
+            "start_time": datetime.now(timezone.utc).isoformat(),
+            "calendar_id": test_calendar.id,
+            "recurrence_rule": "FREQ=SOMETIMES"
+        }
+
+        response = authenticated_client.post("/api/v1/events/", json=event_data)
+        assert response.status_code == 422
+
+    def test_event_duration_limit(self, authenticated_client: TestClient, test_calendar: models.Calendar):
+        """Test that events longer than EVENT_MAX_DURATION_DAYS are rejected on create, update and import."""
+        start_time = datetime(2025, 1, 1, 9, tzinfo=timezone.utc)
+        too_long = start_time + timedelta(days=settings.EVENT_MAX_DURATION_DAYS, minutes=1)
+        response = authenticated_client.post("/api/v1/events/", json={
+            "title": "Too Long", "start_time": start_time.isoformat(), "end_time": too_long.isoformat(), "calendar_id": test_calendar.id
+        })
+        assert response.status_code == 422
+
+        response = authenticated_client.post("/api/v1/events/", json={
+            "title": "Trip", "start_time": start_time.isoformat(), "end_time": (start_time + timedelta(days=7)).isoformat(),
+            "calendar_id": test_calendar.id
+        })
+        assert response.status_code == 200
+        # Moving only one end is checked against the stored other one
+        response = authenticated_client.put(f"/api/v1/events/{response.json()['id']}", json={"end_time": too_long.isoformat()})
+        assert response.status_code == 422
+
+        body = f"BEGIN:VCALENDAR\r\nBEGIN:VEVENT\r\nDTSTART:20250101T090000Z\r\nDTEND:{too_long:%Y%m%dT%H%M%SZ}\r\nEND:VEVENT\r\nEND:VCALENDAR\r\n"
+        response = authenticated_client.post(
+            f"/api/v1/events/calendar/{test_calendar.id}/import.ics",
+            files={"file": ("long.ics", body.encode(), "text/calendar")}
+        )
+        assert response.status_code == 400
+
+    def test_recurrence_rule_limits(self, authenticated_client: TestClient, test_calendar: models.Calendar):
+        """Test that rules repeating more than daily or with too many occurrences are rejected."""
+        start_time = datetime(2025, 1, 1, 9, tzinfo=timezone.utc)
+        for rule in (
+            "FREQ=SECONDLY;COUNT=2000000",
+            "FREQ=HOURLY",
+            f"FREQ=DAILY;COUNT={settings.RECURRENCE_MAX_OCCURRENCES + 1}",
+            "FREQ=YEARLY;UNTIL=20990101T000000Z",
+            "FREQ=DAILY;BYHOUR=0,6,12,18;UNTIL=20340101T000000Z",
+            "FREQ=DAILY;BYHOUR=0,12",
+            "FREQ=WEEKLY;BYMINUTE=0,30",
+            "FREQ=MONTHLY;BYSECOND=0,1",
+        ):
+            response = authenticated_client.post("/api/v1/events/", json={
+                "title": "Too Often",
+                "start_time": start_time.isoformat(),
+                "calendar_id": test_calendar.id,
+                "recurrence_rule": rule,
+            })
+            assert response.status_code == 422, rule
+
+        response = authenticated_client.post("/api/v1/events/", json={
+            "title": "Daily",
+            "start_time": start_time.isoformat(),
+            "calendar_id": test_calendar.id,
+            "recurrence_rule": "FREQ=DAILY;UNTIL=20300101T000000Z",
+        })
+        assert response.status_code == 200
+        # The UNTIL limit counts from the start, which a later update can move
+        response = authenticated_client.put(
+            f"/api/v1/events/{response.json()['id']}",
+            json={"start_time": datetime(2015, 1, 1, 9, tzinfo=timezone.utc).isoformat()},
+        )
+        assert response.status_code == 422
+
+    def test_create_event_detect_conflicts(self, authenticated_client: TestClient, test_calendar: models.Calendar):
+        """Test that detect_conflicts rejects overlapping events but allows back-to-back ones."""
+        start_time = datetime(2025, 6, 2, 9, tzinfo=timezone.utc)
+        response = authenticated_client.post("/api/v1/events/", json={
+            "title": "Standup",
+            "start_time": start_time.isoformat(),
+            "end_time": (start_time + timedelta(hours=1)).isoformat(),
+            "calendar_id": test_calendar.id
+        })
+        assert response.status_code == 200
+        existing_id = response.json()["id"]
+
+        overlapping = {
+            "title": "Review",
+            "start_time": (start_time + timedelta(minutes=30)).isoformat(),
+            "end_time": (start_time + timedelta(hours=2)).isoformat(),
+            "calendar_id": test_calendar.id
+        }
+        response = authenticated_client.post(
+            "/api/v1/events/", json=overlapping, params={"detect_conflicts": True}
+        )
+        assert response.status_code == 409
+        conflicts = response.json()["detail"]["conflicts"]
+        assert [conflict["id"] for conflict in conflicts] == [existing_id]
+
+        back_to_back = dict(overlapping, start_time=(start_time + timedelta(hours=1)).isoformat())
+        response = authenticated_client.post(
+            "/api/v1/events/", json=back_to_back, params={"detect_conflicts": True}
+        )
+        assert response.status_code == 200
+
+        # Without the flag overlapping events are still accepted
+        response = authenticated_client.post("/api/v1/events/", json=overlapping)
+        assert response.status_code == 200
+
+    def test_update_event_detect_conflicts(self, authenticated_client: TestClient, test_calendar: models.Calendar):
+        """Test conflict detection on update, ignoring the event being updated."""
+        start_time = datetime(2025, 6, 2, 9, tzinfo=timezone.utc)
+        event_ids = []
+        for hours in (0, 2):
+            response = authenticated_client.post("/api/v1/events/", json={
+                "title": f"Slot {hours}",
+                "start_time": (start_time + timedelta(hours=hours)).isoformat(),
+                "end_time": (start_time + timedelta(hours=hours + 1)).isoformat(),
+                "calendar_id": test_calendar.id
+            })
+            event_ids.append(response.json()["id"])
+
+        response = authenticated_client.put(
+            f"/api/v1/events/{event_ids[0]}",
+            json={"end_time": (start_time + timedelta(minutes=90)).isoformat()},
+            params={"detect_conflicts": True}
+        )
+        assert response.status_code == 200
+
+        response = authenticated_client.put(
+            f"/api/v1/events/{event_ids[0]}",
+            json={"end_time": (start_time + timedelta(hours=3)).isoformat()},
+            params={"detect_conflicts": True}
+        )
+        assert response.status_code == 409
+        assert [c["id"] for c in response.json()["detail"]["conflicts"]] == [event_ids[1]]
+
+    def test_event_density(self, authenticated_client: TestClient, test_calendar: models.Calendar):
+        """Test per-day counts in the caller's time zone, and that writes refresh cached counts."""
+        # 2025-03-01 23:30 UTC is already March 2nd in Taipei (UTC+8)
+        for start_time in ("2025-03-01T23:30:00Z", "2025-03-02T03:00:00Z", "2025-03-03T12:00:00Z"):
+            authenticated_client.post("/api/v1/events/", json={
+                "title": "Event", "start_time": start_time, "calendar_id": test_calendar.id
+            })
+        authenticated_client.post("/api/v1/events/", json={
+            "title": "Series",
+            "start_time": "2025-03-01T01:00:00Z",
+            "calendar_id": test_calendar.id,
+            "recurrence_rule": "FREQ=DAILY;COUNT=2"
+        })
+        params = {
+            "start": "2025-03-01T00:00:00+08:00",
+            "end": "2025-03-04T00:00:00+08:00",
+            "granularity": "day",
+            "tz": "Asia/Taipei"
+        }
+        url = f"/api/v1/events/calendar/{test_calendar.id}/density"
+
+        response = authenticated_client.get(url, params=params)
+        assert response.status_code == 200
+        buckets = response.json()["buckets"]
+        assert [bucket["start"] for bucket in buckets] == [
+            "2025-03-01T00:00:00+08:00", "2025-03-02T00:00:00+08:00", "2025-03-03T00:00:00+08:00"
+        ]
+        assert [bucket["count"] for bucket in buckets] == [1, 3, 1]
+
+        authenticated_client.post("/api/v1/events/", json={
+            "title": "Late", "start_time": "2025-03-03T10:00:00Z", "calendar_id": test_calendar.id
+        })
+        response = authenticated_client.get(url, params=params)
+        assert [bucket["count"] for bucket in response.json()["buckets"]] == [1, 3, 2]
+
+        response = authenticated_client.get(url, params=dict(params, granularity="month"))
+        assert response.json()["buckets"] == [{"start": "2025-03-01T00:00:00+08:00", "count": 6}]
+
+    def test_event_density_invalid_time_zone(self, authenticated_client: TestClient, test_calendar: models.Calendar):
+        """Test that an unknown time zone is rejected."""
+        response = authenticated_client.get(
+            f"/api/v1/events/calendar/{test_calendar.id}/density",
+            params={"start": "2025-03-01T00:00:00Z", "end": "2025-04-01T00:00:00Z", "tz": "Mars/Olympus"}
+        )
+        assert response.status_code == 400
+
+    def test_agenda_across_calendars(self, authenticated_client: TestClient, test_calendar: models.Calendar, test_user: models.User, db_session):
+        """Test the merged agenda feed over owned and shared calendars with cursor pagination."""
+        from app.schemas.user import UserCreate
+        from app.schemas.calendar import CalendarCreate
+
+        other_user = crud.user.create(db_session, obj_in=UserCreate(email="other@example.com", password="password"))
+        shared = crud.calendar.create_with_owner(db_session, obj_in=CalendarCreate(name="Shared"), owner_id=other_user.id)
+        shared.members.append(test_user)
+        db_session.commit()
+        foreign = crud.calendar.get_multi_by_owner(db_session, owner_id=other_user.id)[0]
+
+        base_time = datetime.now(timezone.utc) + timedelta(days=1)
+        for i, calendar_id in enumerate([test_calendar.id, shared.id, foreign.id, test_calendar.id, shared.id]):
+            crud.event.create_with_user(
+                db_session,
+                obj_in=EventCreate(title=f"Event {i}", start_time=base_time + timedelta(hours=i), calendar_id=calendar_id),
+                creator_id=test_user.id
+            )
+
+        titles = []
+        cursor = None
+        for _ in range(3):
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = authenticated_client.get("/api/v1/events/agenda", params=params)
+            assert response.status_code == 200
+            page = response.json()
+            titles.extend(item["title"] for item in page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        # Event 2 lives in another user's personal calendar and must not show up
+        assert titles == ["Event 0", "Event 1", "Event 3", "Event 4"]
+        assert cursor is None
+
+    def test_agenda_invalid_cursor(self, authenticated_client: TestClient):
+        """Test that a malformed cursor is rejected."""
+        response = authenticated_client.get("/api/v1/events/agenda", params={"cursor": "not-a-cursor"})
+        assert response.status_code == 400
+
+    def test_ics_export_and_import_roundtrip(self, authenticated_client: TestClient, test_calendar: models.Calendar, test_user: models.User, db_session):
+        """Test exporting a calendar as ICS and importing it into another calendar."""
+        from app.schemas.calendar import CalendarCreate
+
+        start_time = datetime(2025, 5, 1, 9, tzinfo=timezone.utc)
+        crud.event.create_with_user(
+            db_session,
+            obj_in=EventCreate(
+                title="Planning; Q3, draft",
+                description="Line one\nLine two " + "x" * 100,
+                start_time=start_time,
+                end_time=start_time + timedelta(hours=1),
+                calendar_id=test_calendar.id,
+                recurrence_rule="FREQ=WEEKLY;COUNT=4",
+                recurrence_exceptions=[start_time + timedelta(weeks=1)]
+            ),
+            creator_id=test_user.id
+        )
+        crud.event.create_with_user(
+            db_session,
+            obj_in=EventCreate(title="Launch", start_time=start_time + timedelta(days=3), calendar_id=test_calendar.id),
+            creator_id=test_user.id
+        )
+
+        response = authenticated_client.get(f"/api/v1/events/calendar/{test_calendar.id}/export.ics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/calendar")
+        body = response.text
+        assert body.startswith("BEGIN:VCALENDAR\r\n")
+        assert body.count("BEGIN:VEVENT") == 2
+        assert all(len(line.encode()) <= 75 for line in body.split("\r\n"))
+
+        target = crud.calendar.create_with_owner(db_session, obj_in=CalendarCreate(name="Target"), owner_id=test_user.id)
+        response = authenticated_client.post(
+            f"/api/v1/events/calendar/{target.id}/import.ics",
+            files={"file": ("export.ics", body.encode(), "text/calendar")}
+        )
+        assert response.status_code == 200
+        assert response.json() == {"imported": 2}
+
+        imported = crud.event.get_multi_by_calendar(db_session, calendar_id=target.id)
+        series = next(event for event in imported if event.recurrence_rule)
+        assert series.title == "Planning; Q3, draft"
+        assert series.description.startswith("Line one\nLine two")
+        assert series.recurrence_exceptions == [(start_time + timedelta(weeks=1)).isoformat()]
+        assert series.recurrence_end is not None
+
+    def test_ics_import_invalid_file(self, authenticated_client: TestClient, test_calendar: models.Calendar):
+        """Test that a malformed ICS upload is rejected without importing anything."""
+        body = "BEGIN:VCALENDAR\r\nBEGIN:VEVENT\r\nSUMMARY:ok\r\nDTSTART:20250501T090000Z\r\nEND:VEVENT\r\nBEGIN:VEVENT\r\nDTSTART:not-a-date\r\nEND:VEVENT\r\nEND:VCALENDAR\r\n"
+        response = authenticated_client.post(
+            f"/api/v1/events/calendar/{test_calendar.id}/import.ics",
+            files={"file": ("broken.ics", body.encode(), "text/calendar")}
+        )
+        assert response.status_code == 400
+        assert "line 7" in response.json()["detail"]
+
+        response = authenticated_client.get(f"/api/v1/events/calendar/{test_calendar.id}")
+        assert response.json() == []
+
+    def test_ics_import_no_double_booking(self, authenticated_client: TestClient, test_calendar: models.Calendar, db_session):
+        """Test that importing into a calendar that forbids double booking rejects overlapping events."""
+        calendar_id = test_calendar.id
+        authenticated_client.put(f"/api/v1/calendars/{calendar_id}", json={"no_double_booking": True})
+
+        def ics(*spans):
+            events = "".join(
+                f"BEGIN:VEVENT\r\nSUMMARY:Booked\r\nDTSTART:{start}\r\nDTEND:{end}\r\nEND:VEVENT\r\n" for start, end in spans
+            )
+            return f"BEGIN:VCALENDAR\r\n{events}END:VCALENDAR\r\n".encode()
+
+        def upload(body):
+            return authenticated_client.post(
+                f"/api/v1/events/calendar/{calendar_id}/import.ics", files={"file": ("import.ics", body, "text/calendar")}
+            )
+
+        response = upload(ics(("20250501T090000Z", "20250501T100000Z"), ("20250501T093000Z", "20250501T110000Z")))
+        assert response.status_code == 409
+        assert authenticated_client.get(f"/api/v1/events/calendar/{calendar_id}").json() == []
+
+        # Back-to-back events do not clash
+        response = upload(ics(("20250501T090000Z", "20250501T100000Z"), ("20250501T100000Z", "20250501T110000Z")))
+        assert response.json() == {"imported": 2}
+        assert all(event.no_double_booking for event in crud.event.get_multi_by_calendar(db_session, calendar_id=calendar_id))
+
+        # Later imports and single events are checked against the imported ones
+        assert upload(ics(("20250501T103000Z", "20250501T120000Z"))).status_code == 409
+        response = authenticated_client.post("/api/v1/events/", json={
+            "title": "Clash", "start_time": "2025-05-01T09:30:00Z", "end_time": "2025-05-01T09:45:00Z", "calendar_id": calendar_id
+        })
+        assert response.status_code == 409
+        assert len(authenticated_client.get(f"/api/v1/events/calendar/{calendar_id}").json()) == 2
+
+    def test_enable_no_double_booking_with_overlaps(self, authenticated_client: TestClient, test_calendar: models.Calendar, db_session):
+        """Test that forbidding double booking fails while the calendar holds overlapping events."""
+        calendar_id = test_calendar.id
+        for start, end in (("09:00", "10:00"), ("09:30", "11:00")):
+            authenticated_client.post("/api/v1/events/", json={
+                "title": "Booked", "start_time": f"2025-05-01T{start}:00Z", "end_time": f"2025-05-01T{end}:00Z", "calendar_id": calendar_id
+            })
+
+        response = authenticated_client.put(f"/api/v1/calendars/{calendar_id}", json={"no_double_booking": True})
+        assert response.status_code == 409
+        assert response.json()["detail"] == "Calendar already contains overlapping events"
+        assert authenticated_client.get(f"/api/v1/calendars/{calendar_id}").json()["no_double_booking"] is False
+        assert not any(event.no_double_booking for event in crud.event.get_multi_by_calendar(db_session, calendar_id=calendar_id))
+
     def test_pagination_events(self, authenticated_client: TestClient, test_calendar: models.Calendar):
         """Test pagination of events."""
         # Create many events
@@ -285,4 +721,35 @@ class TestEventAPI:
         }
         
         response = client.post("/api/v1/events/", json=event_data)
-        assert response.status_code == 401
\ No newline at end of file
+        assert response.status_code == 401
+
+    def test_conditional_get(self, authenticated_client: TestClient, test_calendar: models.Calendar, db_session):
+        """Test that event versions move with ORM and bulk updates, and the ETags with them."""
+        start_time = datetime.now(timezone.utc) + timedelta(days=1)
+        event_id = authenticated_client.post("/api/v1/events/", json={
+            "title": "Versioned", "start_time": start_time.isoformat(), "calendar_id": test_calendar.id
+        }).json()["id"]
+        calendar_id = test_calendar.id
+        event_obj = db_session.get(models.Event, event_id)
+        assert event_obj.version == 1
+
+        response = authenticated_client.get(f"/api/v1/events/{event_id}")
+        etag = response.headers["etag"]
+        collection_etag = authenticated_client.get(f"/api/v1/events/calendar/{calendar_id}").headers["etag"]
+        assert authenticated_client.get(
+            f"/api/v1/events/{event_id}", headers={"If-None-Match": etag}
+        ).status_code == 304
+        assert authenticated_client.get(
+            f"/api/v1/events/calendar/{calendar_id}", headers={"If-None-Match": collection_etag}
+        ).status_code == 304
+
+        # Toggling no_double_booking rewrites the events with one bulk UPDATE
+        authenticated_client.put(f"/api/v1/calendars/{calendar_id}", json={"no_double_booking": True})
+        db_session.expire_all()
+        assert db_session.get(models.Event, event_id).version == 2
+        assert authenticated_client.get(
+            f"/api/v1/events/{event_id}", headers={"If-None-Match": etag}
+        ).status_code == 200
+        assert authenticated_client.get(
+            f"/api/v1/events/calendar/{calendar_id}", headers={"If-None-Match": collection_etag}
+        ).status_code == 200
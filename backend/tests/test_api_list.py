@@ -31,7 +31,7 @@ class TestListAPI:
         list_data = {
             "name": "Test List for Get",
             "list_type": "PRIORITY",
-            "calendar_id": 2
+            "calendar_id": 1
         }
         authenticated_client.post("/api/v1/lists/", json=list_data)
         
@@ -195,6 +195,51 @@ class TestListAPI:
         
         assert response.status_code == 422  # Validation error
 
+    def test_conditional_get(self, authenticated_client: TestClient):
+        """Test ETag/Last-Modified on list reads and 304 answers to If-None-Match."""
+        from sqlalchemy import event
+        from tests.conftest import engine
+
+        list_id = authenticated_client.post(
+            "/api/v1/lists/", json={"name": "Versioned", "calendar_id": 1}
+        ).json()["id"]
+        response = authenticated_client.get(f"/api/v1/lists/{list_id}")
+        etag = response.headers["etag"]
+        assert response.headers["last-modified"].endswith("GMT")
+
+        cached = authenticated_client.get(f"/api/v1/lists/{list_id}", headers={"If-None-Match": f"W/{etag}"})
+        assert cached.status_code == 304
+        assert cached.headers["etag"] == etag
+        assert cached.content == b""
+
+        collection = authenticated_client.get("/api/v1/lists/calendar/1")
+        collection_etag = collection.headers["etag"]
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            cached = authenticated_client.get("/api/v1/lists/calendar/1", headers={"If-None-Match": collection_etag})
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        assert cached.status_code == 304
+        # Only the aggregate stamp is read, not the lists themselves
+        assert not any("lists.name" in statement for statement in statements)
+        assert authenticated_client.get("/api/v1/lists/calendar/1?limit=1").headers["etag"] != collection_etag
+
+        authenticated_client.put(f"/api/v1/lists/{list_id}", json={"name": "Renamed"})
+        response = authenticated_client.get(f"/api/v1/lists/{list_id}", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        updated = authenticated_client.get("/api/v1/lists/calendar/1", headers={"If-None-Match": collection_etag})
+        assert updated.status_code == 200
+
+        etags = {updated.headers["etag"]}
+        authenticated_client.post("/api/v1/lists/", json={"name": "Another", "calendar_id": 1})
+        etags.add(authenticated_client.get("/api/v1/lists/calendar/1").headers["etag"])
+        authenticated_client.delete(f"/api/v1/lists/{list_id}")
+        etags.add(authenticated_client.get("/api/v1/lists/calendar/1").headers["etag"])
+        assert len(etags) == 3
+
 
 class TestListAPIUnauthorized:
     """Test API endpoints without authentication."""
@@ -230,3 +275,44 @@ class TestListAPIUnauthorized:
         """Test DELETE /api/v1/lists/{list_id} without authentication."""
         response = client.delete("/api/v1/lists/1")
         assert response.status_code == 401
+
+    def test_lists_scoped_to_accessible_calendars(self, authenticated_client: TestClient, test_user, db_session):
+        """Test that list reads only see lists of owned or shared calendars, paged by after_id."""
+        from app import crud
+        from app.schemas.calendar import CalendarCreate
+        from app.schemas.list import ListCreate
+        from app.schemas.user import UserCreate
+
+        other_user = crud.user.create(db_session, obj_in=UserCreate(email="other@example.com", password="password"))
+        shared = crud.calendar.create_with_owner(db_session, obj_in=CalendarCreate(name="Shared"), owner_id=other_user.id)
+        shared.members.append(test_user)
+        db_session.commit()
+        private = crud.calendar.create_with_owner(db_session, obj_in=CalendarCreate(name="Private"), owner_id=other_user.id)
+        own = crud.calendar.get_multi_by_owner(db_session, owner_id=test_user.id)[0]
+        visible = []
+        for index in range(3):
+            for calendar, keep in ((own, True), (shared, True), (private, False)):
+                list_obj = crud.list_crud.create(
+                    db_session, obj_in=ListCreate(name=f"{calendar.name} {index}", calendar_id=calendar.id)
+                )
+                if keep:
+                    visible.append(list_obj.id)
+        hidden_id, private_id = list_obj.id, private.id
+
+        ids, after_id = [], None
+        while True:
+            params = {"limit": 4} if after_id is None else {"limit": 4, "after_id": after_id}
+            page = authenticated_client.get("/api/v1/lists/", params=params).json()
+            if not page:
+                break
+            ids.extend(item["id"] for item in page)
+            after_id = page[-1]["id"]
+        assert ids == visible
+
+        by_calendar = authenticated_client.get(f"/api/v1/lists/calendar/{shared.id}", params={"after_id": visible[1]})
+        assert [item["id"] for item in by_calendar.json()] == [visible[3], visible[5]]
+
+        assert authenticated_client.get(f"/api/v1/lists/calendar/{private_id}").status_code == 403
+        assert authenticated_client.get(f"/api/v1/lists/{hidden_id}").status_code == 403
+        assert authenticated_client.put(f"/api/v1/lists/{hidden_id}", json={"name": "Mine"}).status_code == 403
+        assert authenticated_client.delete(f"/api/v1/lists/{hidden_id}").status_code == 403
@@ -70,6 +70,50 @@ class TestListItemAPI:
         assert items[0]["vote_count"] == 1
         assert items[0]["content"] == "Popular task"
 
+    def test_list_items_with_votes_match_item_schema(self, authenticated_client: TestClient, test_list: models.List):
+        """Test that with-votes returns each item as the ListItem schema, with its own vote count."""
+        ids = [
+            authenticated_client.post("/api/v1/list-items/", json={"content": f"Option {i}", "list_id": test_list.id}).json()["id"]
+            for i in range(3)
+        ]
+        authenticated_client.post("/api/v1/votes/", json={"list_item_id": ids[2]})
+
+        response = authenticated_client.get(f"/api/v1/list-items/list/{test_list.id}/with-votes")
+
+        assert response.status_code == 200
+        by_id = {item["id"]: item for item in response.json()}
+        for item_id, vote_count in zip(ids, (0, 0, 1)):
+            plain = authenticated_client.get(f"/api/v1/list-items/{item_id}").json()
+            assert by_id[item_id] == {**plain, "vote_count": vote_count}
+
+        schema = authenticated_client.get("/openapi.json").json()["paths"]["/api/v1/list-items/list/{list_id}/with-votes"]
+        items = schema["get"]["responses"]["200"]["content"]["application/json"]["schema"]["items"]
+        assert items == {"$ref": "#/components/schemas/ListItem"}
+
+    def test_sparse_fieldset(self, authenticated_client: TestClient, test_list: models.List):
+        """Test that ?fields= selects only those columns and returns only those keys."""
+        from sqlalchemy import event as sa_event
+        from tests.conftest import engine
+
+        authenticated_client.post("/api/v1/list-items/", json={"content": "Pack", "list_id": test_list.id})
+        list_id = test_list.id
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        sa_event.listen(engine, "before_cursor_execute", listener)
+        try:
+            response = authenticated_client.get(f"/api/v1/list-items/list/{list_id}", params={"fields": "id, is_completed"})
+        finally:
+            sa_event.remove(engine, "before_cursor_execute", listener)
+
+        assert response.status_code == 200
+        assert list(response.json()[0]) == ["is_completed", "id"]
+        assert "content" not in statements[-1].split("FROM")[0]
+
+        response = authenticated_client.get(f"/api/v1/list-items/list/{list_id}/with-votes", params={"fields": "id,vote_count"})
+        assert response.json()[0]["vote_count"] == 0 and set(response.json()[0]) == {"id", "vote_count"}
+        assert authenticated_client.get(f"/api/v1/list-items/list/{list_id}", params={"fields": "title"}).status_code == 400
+
     def test_get_single_list_item(self, authenticated_client: TestClient, test_list: models.List):
         """Test retrieving a single list item by ID."""
         # Create item
@@ -94,6 +138,38 @@ class TestListItemAPI:
         assert response.status_code == 404
         assert response.json()["detail"] == "List item not found"
 
+    def test_list_item_access_checked_in_fetch_query(self, authenticated_client: TestClient, db_session):
+        """Test that reading an item fetches it and checks access in a single query, and 403s on foreign items."""
+        from sqlalchemy import event
+        from app.schemas.calendar import CalendarCreate
+        from app.schemas.list import ListCreate
+        from app.schemas.user import UserCreate
+        from tests.conftest import engine
+
+        other_user = crud.user.create(db_session, obj_in=UserCreate(email="other@example.com", password="password"))
+        private = crud.calendar.create_with_owner(db_session, obj_in=CalendarCreate(name="Private"), owner_id=other_user.id)
+        private_list = crud.list_crud.create(db_session, obj_in=ListCreate(name="Private", list_type="TODO", calendar_id=private.id))
+        item = crud.list_item.create_with_user(
+            db_session, obj_in=ListItemCreate(content="Secret", list_id=private_list.id), creator_id=other_user.id
+        )
+
+        item_id = item.id
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            response = authenticated_client.get(f"/api/v1/list-items/{item_id}")
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        assert response.status_code == 403
+        assert response.json()["detail"] == "Not enough permissions to access this list"
+        # One query loads the current user, one the item with its access flag
+        assert len(statements) == 2
+
+        assert authenticated_client.put(f"/api/v1/list-items/{item_id}", json={"content": "Mine"}).status_code == 403
+        assert authenticated_client.delete(f"/api/v1/list-items/{item_id}").status_code == 403
+
     def test_update_list_item(self, authenticated_client: TestClient, test_list: models.List):
         """Test updating a list item."""
         # Create item
@@ -0,0 +1,160 @@
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.core import sync
+from app.core.security import create_access_token
+from app.schemas.calendar import CalendarCreate
+from app.schemas.user import UserCreate
+
+
+class TestSyncAPI:
+    """Test the delta sync endpoint."""
+
+    def _sync(self, client: TestClient, since: str, **params) -> dict:
+        response = client.get("/api/v1/sync", params={"since": since, **params})
+        assert response.status_code == 200
+        return response.json()
+
+    def test_sync_returns_changes_and_tombstones(self, authenticated_client: TestClient, test_calendar: models.Calendar):
+        """Test that a sync sends what changed since the cursor, once, in its current state."""
+        calendar_id = test_calendar.id
+        cursor = authenticated_client.get("/api/v1/sync").json()["cursor"]
+        assert self._sync(authenticated_client, cursor)["changed"]["lists"] == []
+
+        list_id = authenticated_client.post("/api/v1/lists/", json={"name": "Groceries", "calendar_id": calendar_id}).json()["id"]
+        item_id = authenticated_client.post("/api/v1/list-items/", json={"content": "Milk", "list_id": list_id}).json()["id"]
+        vote_id = authenticated_client.post("/api/v1/votes/", json={"list_item_id": item_id}).json()["id"]
+        event_id = authenticated_client.post("/api/v1/events/", json={
+            "title": "Shopping", "start_time": datetime.now(timezone.utc).isoformat(), "calendar_id": calendar_id
+        }).json()["id"]
+        authenticated_client.put(f"/api/v1/list-items/{item_id}", json={"content": "Oat milk"})
+        authenticated_client.put(f"/api/v1/list-items/{item_id}", json={"is_completed": True})
+
+        page = self._sync(authenticated_client, cursor)
+        assert page["has_more"] is False
+        assert [item["id"] for item in page["changed"]["lists"]] == [list_id]
+        assert [(item["id"], item["content"], item["is_completed"]) for item in page["changed"]["list_items"]] == [
+            (item_id, "Oat milk", True)
+        ]
+        assert [vote["id"] for vote in page["changed"]["votes"]] == [vote_id]
+        assert [event["id"] for event in page["changed"]["events"]] == [event_id]
+        assert all(ids == [] for ids in page["deleted"].values())
+
+        cursor = page["cursor"]
+        assert self._sync(authenticated_client, cursor)["changed"]["list_items"] == []
+
+        # Deleting the list takes its items and votes with it
+        authenticated_client.delete(f"/api/v1/lists/{list_id}")
+        authenticated_client.delete(f"/api/v1/events/{event_id}")
+        page = self._sync(authenticated_client, cursor)
+        assert page["deleted"] == {
+            "calendars": [], "lists": [list_id], "list_items": [item_id], "votes": [vote_id], "events": [event_id]
+        }
+        assert all(rows == [] for rows in page["changed"].values())
+
+    def test_sync_pages_with_limit(self, authenticated_client: TestClient, test_calendar: models.Calendar):
+        """Test that `limit` splits the changes into pages chained by their cursors."""
+        cursor = authenticated_client.get("/api/v1/sync").json()["cursor"]
+        created = [
+            authenticated_client.post("/api/v1/lists/", json={"name": f"List {index}", "calendar_id": test_calendar.id}).json()["id"]
+            for index in range(5)
+        ]
+        # Touching the first one again moves it to the end
+        authenticated_client.put(f"/api/v1/lists/{created[0]}", json={"name": "Renamed"})
+
+        seen = []
+        while True:
+            page = self._sync(authenticated_client, cursor, limit=2)
+            seen.extend(item["id"] for item in page["changed"]["lists"])
+            cursor = page["cursor"]
+            if not page["has_more"]:
+                break
+        assert seen == created[1:] + created[:1]
+
+    def test_sync_follows_access(self, authenticated_client: TestClient, test_user: models.User, db_session: Session):
+        """Test that users only see their calendars, and hear about gaining and losing one."""
+        other = crud.user.create(db_session, obj_in=UserCreate(email="other@example.com", password="password"))
+        other_client_headers = {"Authorization": f"Bearer {create_access_token(subject=other.email)}"}
+        shared = crud.calendar.create_with_owner(db_session, obj_in=CalendarCreate(name="Shared"), owner_id=other.id)
+        private = crud.calendar.create_with_owner(db_session, obj_in=CalendarCreate(name="Private"), owner_id=other.id)
+        shared_id, private_id = shared.id, private.id
+        cursor = authenticated_client.get("/api/v1/sync").json()["cursor"]
+
+        authenticated_client.post("/api/v1/lists/", json={"name": "Theirs", "calendar_id": private_id}, headers=other_client_headers)
+        shared.members.append(test_user)
+        db_session.commit()
+        page = self._sync(authenticated_client, cursor)
+        assert [calendar["id"] for calendar in page["changed"]["calendars"]] == [shared_id]
+        assert page["changed"]["calendars"][0]["members"][0]["id"] == test_user.id
+        assert page["changed"]["lists"] == []
+        cursor = page["cursor"]
+
+        shared.members.remove(test_user)
+        db_session.commit()
+        page = self._sync(authenticated_client, cursor)
+        assert page["deleted"]["calendars"] == [shared_id]
+
+    def test_sync_sees_bulk_writes(self, authenticated_client: TestClient, test_calendar: models.Calendar, test_user: models.User, db_session: Session):
+        """Test that events written with bulk statements are logged too."""
+        calendar_id = test_calendar.id
+        start = datetime(2025, 5, 1, 9, tzinfo=timezone.utc)
+        cursor = authenticated_client.get("/api/v1/sync").json()["cursor"]
+        crud.event.bulk_create_for_calendar(
+            db_session,
+            rows=[{"title": f"Imported {index}", "start_time": start + timedelta(days=index)} for index in range(3)],
+            calendar_id=calendar_id,
+            creator_id=test_user.id,
+        )
+        page = self._sync(authenticated_client, cursor)
+        assert [event["title"] for event in page["changed"]["events"]] == [f"Imported {index}" for index in range(3)]
+        imported = [event["id"] for event in page["changed"]["events"]]
+
+        # Toggling no_double_booking rewrites every event of the calendar
+        cursor = page["cursor"]
+        authenticated_client.put(f"/api/v1/calendars/{calendar_id}", json={"no_double_booking": True})
+        page = self._sync(authenticated_client, cursor)
+        assert [event["id"] for event in page["changed"]["events"]] == imported
+        assert [calendar["no_double_booking"] for calendar in page["changed"]["calendars"]] == [True]
+
+    def test_pruned_history(self, authenticated_client: TestClient, test_calendar: models.Calendar, db_session: Session):
+        """Test that pruning deletes old entries and cursors from before them get 410."""
+        old_cursor = authenticated_client.get("/api/v1/sync").json()["cursor"]
+        old_id = authenticated_client.post("/api/v1/lists/", json={"name": "Old", "calendar_id": test_calendar.id}).json()["id"]
+        db_session.execute(update(models.Change).values(created_at=datetime.now(timezone.utc) - timedelta(days=60)))
+        db_session.commit()
+        cursor = authenticated_client.get("/api/v1/sync").json()["cursor"]
+        new_id = authenticated_client.post("/api/v1/lists/", json={"name": "New", "calendar_id": test_calendar.id}).json()["id"]
+
+        assert sync.prune(db_session, before=datetime.now(timezone.utc) - timedelta(days=30)) > 0
+        assert db_session.scalars(select(models.Change.entity_id).where(models.Change.entity == "list")).all() == [new_id]
+        response = authenticated_client.get("/api/v1/sync", params={"since": old_cursor})
+        assert response.status_code == 410
+        assert [item["id"] for item in self._sync(authenticated_client, cursor)["changed"]["lists"]] == [new_id]
+        # Pruning again without older entries keeps the floor
+        sync.prune(db_session, before=datetime.now(timezone.utc) - timedelta(days=30))
+        assert authenticated_client.get("/api/v1/sync", params={"since": cursor}).status_code == 200
+
+    def test_sync_after_pruning_everything(self, authenticated_client: TestClient, test_calendar: models.Calendar, db_session: Session):
+        """Test that positions keep growing after pruning empties the change log."""
+        authenticated_client.post("/api/v1/lists/", json={"name": "Old", "calendar_id": test_calendar.id})
+        cursor = authenticated_client.get("/api/v1/sync").json()["cursor"]
+        sync.prune(db_session, before=datetime.now(timezone.utc) + timedelta(days=1))
+        assert db_session.scalar(select(func.count(models.Change.id))) == 0
+
+        new_id = authenticated_client.post("/api/v1/lists/", json={"name": "New", "calendar_id": test_calendar.id}).json()["id"]
+        assert [item["id"] for item in self._sync(authenticated_client, cursor)["changed"]["lists"]] == [new_id]
+        # A new client starts at or above the floor
+        new_cursor = authenticated_client.get("/api/v1/sync").json()["cursor"]
+        assert self._sync(authenticated_client, new_cursor)["changed"]["lists"] == []
+
+    def test_invalid_cursor(self, authenticated_client: TestClient):
+        """Test that a malformed cursor is rejected."""
+        assert authenticated_client.get("/api/v1/sync", params={"since": "nope"}).status_code == 400
+
+    def test_sync_unauthorized(self, client: TestClient):
+        """Test that sync requires authentication."""
+        assert client.get("/api/v1/sync").status_code == 401
@@ -1,8 +1,10 @@
 import pytest
+from collections import defaultdict
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
 from app import crud, models
+from app.core.rate_limiter import rate_limiter
 from app.schemas.list_item import ListItemCreate
 
 
@@ -186,4 +188,28 @@ class TestVoteAPI:
         
         # Try to remove again
         response = authenticated_client.delete(f"/api/v1/votes/item/{test_list_item.id}")
-        assert response.status_code == 404
\ No newline at end of file
+        assert response.status_code == 404
+
+    def test_conditional_get(self, authenticated_client: TestClient, test_list: models.List, monkeypatch):
+        """Test that vote list ETags change when a vote is removed and another cast in its place."""
+        # Earlier tests in this class use up the vote rate limit
+        monkeypatch.setattr(rate_limiter, "_requests", defaultdict(list))
+        item_ids = [
+            authenticated_client.post(
+                "/api/v1/list-items/", json={"content": f"Option {i}", "list_id": test_list.id}
+            ).json()["id"]
+            for i in range(2)
+        ]
+        authenticated_client.post("/api/v1/votes/", json={"list_item_id": item_ids[0]})
+        urls = ["/api/v1/votes/user/my-votes", f"/api/v1/list-items/list/{test_list.id}/with-votes"]
+        etags = [authenticated_client.get(url).headers["etag"] for url in urls]
+        for url, etag in zip(urls, etags):
+            assert authenticated_client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+        # Same count, and on SQLite the same id, within the same second
+        authenticated_client.delete(f"/api/v1/votes/item/{item_ids[0]}")
+        authenticated_client.post("/api/v1/votes/", json={"list_item_id": item_ids[1]})
+        for url, etag in zip(urls, etags):
+            response = authenticated_client.get(url, headers={"If-None-Match": etag})
+            assert response.status_code == 200
+            assert response.headers["etag"] != etag
@@ -1,8 +1,10 @@
 import pytest
+import time
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta, timezone
 
 from app import crud, models
+from app.core.config import settings
 from app.schemas.event import EventCreate, EventUpdate
 
 
@@ -127,6 +129,36 @@ class TestCRUDEvent:
         assert events[0].title == "Day 3 Event"
         assert events[2].title == "Day 5 Event"
 
+    def test_get_multi_by_date_range_overlap(self, db_session: Session, test_calendar: models.Calendar, test_user: models.User):
+        """Test that events spanning into the range are returned, not only those starting in it."""
+        base_time = datetime(2025, 3, 10, tzinfo=timezone.utc)
+        events_in = [
+            ("Started Before", base_time - timedelta(days=3), base_time + timedelta(days=1)),
+            ("Inside", base_time + timedelta(days=1), base_time + timedelta(days=1, hours=2)),
+            ("Ended Before", base_time - timedelta(days=3), base_time - timedelta(days=1)),
+            ("After", base_time + timedelta(days=5), None),
+        ]
+        for title, start_time, end_time in events_in:
+            crud.event.create_with_user(
+                db_session,
+                obj_in=EventCreate(
+                    title=title,
+                    start_time=start_time,
+                    end_time=end_time,
+                    calendar_id=test_calendar.id
+                ),
+                creator_id=test_user.id
+            )
+
+        events = crud.event.get_multi_by_date_range(
+            db_session,
+            calendar_id=test_calendar.id,
+            start_date=base_time,
+            end_date=base_time + timedelta(days=2)
+        )
+
+        assert [event.title for event in events] == ["Started Before", "Inside"]
+
     def test_get_upcoming_events(self, db_session: Session, test_calendar: models.Calendar, test_user: models.User):
         """Test retrieving upcoming events."""
         now = datetime.now(timezone.utc)
@@ -189,6 +221,180 @@ class TestCRUDEvent:
         
         assert len(events) == 3  # Events 3, 4, 5
 
+    def test_recurring_event_expanded_in_date_range(self, db_session: Session, test_calendar: models.Calendar, test_user: models.User):
+        """Test that a weekly series is expanded only inside the window and merged by start time."""
+        base_time = datetime(2025, 3, 3, 9, tzinfo=timezone.utc)  # a Monday
+        crud.event.create_with_user(
+            db_session,
+            obj_in=EventCreate(
+                title="Weekly Sync",
+                start_time=base_time,
+                end_time=base_time + timedelta(hours=1),
+                calendar_id=test_calendar.id,
+                recurrence_rule="FREQ=WEEKLY;BYDAY=MO",
+                recurrence_exceptions=[base_time + timedelta(weeks=2)]
+            ),
+            creator_id=test_user.id
+        )
+        crud.event.create_with_user(
+            db_session,
+            obj_in=EventCreate(
+                title="One-off",
+                start_time=base_time + timedelta(weeks=1, days=1),
+                calendar_id=test_calendar.id
+            ),
+            creator_id=test_user.id
+        )
+
+        events = crud.event.get_multi_by_date_range(
+            db_session,
+            calendar_id=test_calendar.id,
+            start_date=base_time + timedelta(weeks=1),
+            end_date=base_time + timedelta(weeks=4)
+        )
+
+        assert [event.title for event in events] == ["Weekly Sync", "One-off", "Weekly Sync", "Weekly Sync"]
+        assert [event.recurrence_id for event in events if event.title == "Weekly Sync"] == [
+            base_time + timedelta(weeks=1),
+            base_time + timedelta(weeks=3),
+            base_time + timedelta(weeks=4),
+        ]
+
+    def test_old_recurring_series_expands_near_window(self, db_session: Session, test_calendar: models.Calendar, test_user: models.User):
+        """Test that expanding an old open-ended series does not walk its earlier occurrences."""
+        series_start = datetime(1000, 1, 31, 9, tzinfo=timezone.utc)
+        for title, rule in (("Daily", "FREQ=DAILY;INTERVAL=2"), ("Last Friday", "FREQ=MONTHLY;BYDAY=FR;BYSETPOS=-1")):
+            crud.event.create_with_user(
+                db_session,
+                obj_in=EventCreate(
+                    title=title,
+                    start_time=series_start,
+                    end_time=series_start + timedelta(hours=1),
+                    calendar_id=test_calendar.id,
+                    recurrence_rule=rule
+                ),
+                creator_id=test_user.id
+            )
+        window_start = datetime(2025, 5, 28, tzinfo=timezone.utc)
+
+        started = time.perf_counter()
+        events = crud.event.get_multi_by_date_range(
+            db_session,
+            calendar_id=test_calendar.id,
+            start_date=window_start,
+            end_date=window_start + timedelta(days=7)
+        )
+        elapsed = time.perf_counter() - started
+
+        # Walking the ~190,000 earlier occurrences takes several times longer
+        assert elapsed < 0.2
+        assert [(event.title, event.start_time) for event in events] == [
+            ("Daily", datetime(2025, 5, 29, 9, tzinfo=timezone.utc)),
+            ("Last Friday", datetime(2025, 5, 30, 9, tzinfo=timezone.utc)),
+            ("Daily", datetime(2025, 5, 31, 9, tzinfo=timezone.utc)),
+            ("Daily", datetime(2025, 6, 2, 9, tzinfo=timezone.utc)),
+        ]
+
+    def test_recurring_event_upcoming(self, db_session: Session, test_calendar: models.Calendar, test_user: models.User):
+        """Test that upcoming events include the next occurrences of a bounded series."""
+        now = datetime.now(timezone.utc)
+        series = crud.event.create_with_user(
+            db_session,
+            obj_in=EventCreate(
+                title="Daily Standup",
+                start_time=now - timedelta(days=2, minutes=5),
+                calendar_id=test_calendar.id,
+                recurrence_rule="FREQ=DAILY;COUNT=5"
+            ),
+            creator_id=test_user.id
+        )
+
+        assert series.recurrence_end is not None
+        events = crud.event.get_upcoming_events(db_session, calendar_id=test_calendar.id, limit=10)
+
+        assert len(events) == 2
+        assert events[0].start_time < events[1].start_time
+
+    def test_archive_before(self, db_session: Session, test_calendar: models.Calendar, test_user: models.User, monkeypatch):
+        """Test that past events move to the archive and stay readable through CRUDEvent."""
+        monkeypatch.setattr(settings, "EVENT_ARCHIVE_AFTER_DAYS", 30)
+        now = datetime.now(timezone.utc)
+        old_event = crud.event.create_with_user(
+            db_session,
+            obj_in=EventCreate(
+                title="Old Meeting",
+                start_time=now - timedelta(days=90),
+                end_time=now - timedelta(days=90) + timedelta(hours=1),
+                calendar_id=test_calendar.id
+            ),
+            creator_id=test_user.id
+        )
+        old_series = crud.event.create_with_user(
+            db_session,
+            obj_in=EventCreate(
+                title="Old Series",
+                start_time=now - timedelta(days=100),
+                end_time=now - timedelta(days=100) + timedelta(hours=1),
+                calendar_id=test_calendar.id,
+                recurrence_rule="FREQ=WEEKLY;COUNT=3"
+            ),
+            creator_id=test_user.id
+        )
+        recent_event = crud.event.create_with_user(
+            db_session,
+            obj_in=EventCreate(
+                title="Recent Meeting",
+                start_time=now - timedelta(days=1),
+                calendar_id=test_calendar.id
+            ),
+            creator_id=test_user.id
+        )
+        old_id, series_id, recent_id = old_event.id, old_series.id, recent_event.id
+        old_start = old_event.start_time
+
+        archived = crud.event.archive_before(db_session, before=crud.event.archive_horizon(), batch_size=1)
+
+        assert archived == 2
+        assert crud.event.get(db_session, id=old_id) is None
+        assert crud.event.get_archived(db_session, id=old_id).title == "Old Meeting"
+        assert crud.event.get(db_session, id=recent_id) is not None
+
+        events = crud.event.get_multi_by_date_range(
+            db_session,
+            calendar_id=test_calendar.id,
+            start_date=now - timedelta(days=120),
+            end_date=now
+        )
+        assert [event.id for event in events] == [series_id, series_id, old_id, series_id, recent_id]
+
+        # Windows after the horizon never read the archive
+        events = crud.event.get_multi_by_date_range(
+            db_session,
+            calendar_id=test_calendar.id,
+            start_date=now - timedelta(days=7),
+            end_date=now
+        )
+        assert [event.id for event in events] == [recent_id]
+
+        # Listing a calendar reads the archive on request only
+        events = crud.event.get_multi_by_calendar(db_session, calendar_id=test_calendar.id)
+        assert [event.id for event in events] == [recent_id]
+        events = crud.event.get_multi_by_calendar(db_session, calendar_id=test_calendar.id, include_archived=True)
+        assert [event.id for event in events] == [series_id, old_id, recent_id]
+
+        # Conflicts and busy time in the past still see archived events
+        conflicts = crud.event.get_conflicts(
+            db_session,
+            calendar_ids=[test_calendar.id],
+            start_time=old_start + timedelta(minutes=30),
+            end_time=old_start + timedelta(hours=2),
+        )
+        assert [event.id for event in conflicts] == [old_id]
+        busy = crud.event.get_busy_intervals(
+            db_session, user_ids=[test_user.id], start_date=now - timedelta(days=120), end_date=now - timedelta(days=60)
+        )
+        assert len(busy) == 4
+
     def test_update_event(self, db_session: Session, test_calendar: models.Calendar, test_user: models.User):
         """Test updating an event."""
         # Create event
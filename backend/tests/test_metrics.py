@@ -0,0 +1,131 @@
+import re
+import threading
+
+import pytest
+from fastapi import HTTPException, Request
+from fastapi.testclient import TestClient
+
+from app import models
+from app.core.config import settings
+from app.core.metrics import Registry
+from app.core.rate_limiter import create_rate_limit_dependency
+from app.core.security import get_password_hash
+
+
+def _value(text: str, name: str, **labels: str) -> float:
+    """Value of the sample `name` with exactly `labels` in an exposition, 0 if absent."""
+    rendered = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    pattern = "^" + re.escape(f"{name}{{{rendered}}}" if labels else name) + r" (\S+)$"
+    match = re.search(pattern, text, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+class TestRegistry:
+    """Test recording and exposition of metrics."""
+
+    def test_counts_from_many_threads_add_up(self):
+        """Test that per-thread shards sum to the totals recorded across threads."""
+        registry = Registry()
+        counter = registry.counter("jobs_total", "Jobs.", ("kind",))
+        histogram = registry.histogram("job_seconds", "Job time.", ("kind",), buckets=(0.1, 1.0))
+
+        def work():
+            for index in range(1000):
+                counter.inc("a")
+                histogram.observe(0.05 if index % 2 else 0.5, "a")
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        text = registry.expose()
+        assert "# TYPE jobs_total counter" in text and "# TYPE job_seconds histogram" in text
+        assert _value(text, "jobs_total", kind="a") == 8000
+        assert _value(text, "job_seconds_bucket", kind="a", le="0.1") == 4000
+        assert _value(text, "job_seconds_bucket", kind="a", le="1") == 8000
+        assert _value(text, "job_seconds_bucket", kind="a", le="+Inf") == 8000
+        assert _value(text, "job_seconds_count", kind="a") == 8000
+        assert _value(text, "job_seconds_sum", kind="a") == pytest.approx(4000 * 0.55)
+
+    def test_gauges_and_escaping(self):
+        """Test in-flight gauges, scrape-time gauges and label escaping."""
+        registry = Registry()
+        gauge = registry.gauge("in_flight", "Work in flight.")
+        registry.gauge_callback("queue", "Queued.", lambda: [({"name": 'a "b"\\'}, 3)])
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+        text = registry.expose()
+        assert _value(text, "in_flight") == 1
+        assert 'queue{name="a \\"b\\"\\\\"} 3' in text
+        with pytest.raises(ValueError):
+            registry.counter("queue", "Again.")
+
+
+class TestMetricsAPI:
+    """Test the /metrics endpoint and what feeds it."""
+
+    @pytest.fixture(autouse=True)
+    def serve_metrics(self, monkeypatch):
+        """Turn on the endpoint, which is off by default."""
+        monkeypatch.setattr(settings, "METRICS_ENDPOINT", True)
+
+    def test_endpoint_off_or_token(self, client: TestClient, monkeypatch):
+        """Test that /metrics is hidden unless enabled, and needs the token when one is set."""
+        monkeypatch.setattr(settings, "METRICS_ENDPOINT", False)
+        assert client.get("/metrics").status_code == 404
+
+        monkeypatch.setattr(settings, "METRICS_ENDPOINT", True)
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+        assert client.get("/metrics").status_code == 401
+        assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+        assert client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).status_code == 200
+
+    def test_requests_by_route_template(self, authenticated_client: TestClient, test_calendar: models.Calendar):
+        """Test that requests are counted under their route template with their status."""
+        before = authenticated_client.get("/metrics").text
+        authenticated_client.get(f"/api/v1/events/calendar/{test_calendar.id}")
+        authenticated_client.get("/api/v1/events/calendar/999999")
+        authenticated_client.get("/no-such-path")
+        response = authenticated_client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+
+        text = response.text
+        route = "/api/v1/events/calendar/{calendar_id}"
+
+        def delta(name, **labels):
+            return _value(text, name, **labels) - _value(before, name, **labels)
+
+        assert delta("http_requests_total", method="GET", route=route, status="200") == 1
+        assert delta("http_requests_total", method="GET", route=route, status="404") == 1
+        assert delta("http_requests_total", method="GET", route="unmatched", status="404") == 1
+        assert delta("http_request_duration_seconds_count", method="GET", route=route) == 2
+        # Ids in paths never become label values
+        assert not re.search(r'route="[^"]*/\d+', text)
+        # Scrape-time gauges
+        assert 'access_cache{stat="calendars_hit_rate"}' in text
+        assert 'response_cache{stat="hits"}' in text
+        assert 'threadpool_threads{state="limit"}' in text
+        assert "rate_limit_tracked_keys" in text
+
+    def test_rate_limit_rejections_and_hashing(self, client: TestClient):
+        """Test that rejections are counted per policy and bcrypt calls are timed."""
+        before = client.get("/metrics").text
+        limit = create_rate_limit_dependency(max_requests=1, window_seconds=60, policy="test")
+        request = Request({"type": "http", "headers": [], "client": ("metrics-test", 0)})
+        limit(request)
+        for _ in range(2):
+            with pytest.raises(HTTPException):
+                limit(request)
+        get_password_hash("password")
+
+        text = client.get("/metrics").text
+        assert _value(text, "rate_limit_rejections_total", policy="test") - _value(before, "rate_limit_rejections_total", policy="test") == 2
+        assert (
+            _value(text, "password_hashing_duration_seconds_count", operation="hash")
+            - _value(before, "password_hashing_duration_seconds_count", operation="hash")
+        ) == 1
+        assert _value(text, "password_hashing_in_flight") == 0
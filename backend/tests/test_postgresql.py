@@ -0,0 +1,187 @@
+"""
+Tests of the PostgreSQL-only paths, run against the migrated schema when
+TEST_POSTGRES_URL points at a scratch database, e.g.
+
+    TEST_POSTGRES_URL=postgresql+psycopg2://postgres@localhost/app_test pytest tests/test_postgresql.py
+
+The database's public schema is dropped and recreated, never point it at real data.
+"""
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from fastapi import HTTPException
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, models
+from app.core import sync
+from app.core.config import settings
+from app.models.base import Base
+from app.schemas.calendar import CalendarCreate
+from app.schemas.event import EventCreate
+from app.schemas.user import UserCreate
+
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
+pytestmark = pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL is not set")
+
+
+@pytest.fixture(scope="module")
+def pg_engine():
+    engine = create_engine(POSTGRES_URL)
+    with engine.begin() as connection:
+        connection.execute(text("DROP SCHEMA public CASCADE"))
+        connection.execute(text("CREATE SCHEMA public"))
+    url = settings.DATABASE_URL
+    # alembic/env.py takes the URL from the settings
+    settings.DATABASE_URL = POSTGRES_URL
+    try:
+        command.upgrade(Config(os.path.join(os.path.dirname(__file__), "..", "alembic.ini")), "head")
+    finally:
+        settings.DATABASE_URL = url
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def pg_session(pg_engine):
+    Session = sessionmaker(bind=pg_engine)
+    sessions = []
+
+    def open_session():
+        session = Session()
+        sessions.append(session)
+        return session
+
+    yield open_session
+    for session in sessions:
+        session.rollback()
+        session.close()
+    with pg_engine.begin() as connection:
+        tables = connection.scalars(text("SELECT tablename FROM pg_tables WHERE schemaname = 'public' AND tablename <> 'alembic_version'"))
+        connection.execute(text(f"TRUNCATE {', '.join(tables)} RESTART IDENTITY CASCADE"))
+
+
+@pytest.fixture
+def pg_calendar(pg_session):
+    db = pg_session()
+    user = crud.user.create(db, obj_in=UserCreate(email="pg@example.com", password="password"))
+    calendar = crud.calendar.create_with_owner(db, obj_in=CalendarCreate(name="PG"), owner_id=user.id)
+    return user.id, calendar.id
+
+
+class TestSchemaOnPostgreSQL:
+    """Test the migrated schema on PostgreSQL."""
+
+    def test_migrations_match_models(self, pg_engine):
+        """Test that `alembic check` finds nothing to migrate."""
+        with pg_engine.connect() as connection:
+            assert compare_metadata(MigrationContext.configure(connection), Base.metadata) == []
+
+
+class TestEventsOnPostgreSQL:
+    """Test event constraints and archiving on PostgreSQL."""
+
+    def _create(self, db, calendar_id, user_id, start, hours, title="Booked"):
+        return crud.event.create_with_user(
+            db,
+            obj_in=EventCreate(title=title, start_time=start, end_time=start + timedelta(hours=hours), calendar_id=calendar_id),
+            creator_id=user_id,
+        )
+
+    def test_no_double_booking_across_months(self, pg_session, pg_calendar):
+        """Test that the database rejects an overlap spanning a month boundary."""
+        user_id, calendar_id = pg_calendar
+        db = pg_session()
+        crud.calendar.update(db, db_obj=db.get(models.Calendar, calendar_id), obj_in={"no_double_booking": True})
+        self._create(db, calendar_id, user_id, datetime(2025, 1, 31, 23, tzinfo=timezone.utc), 3)
+
+        with pytest.raises(HTTPException) as error:
+            self._create(db, calendar_id, user_id, datetime(2025, 2, 1, 1, tzinfo=timezone.utc), 1)
+        assert error.value.status_code == 409
+        self._create(db, calendar_id, user_id, datetime(2025, 2, 1, 2, tzinfo=timezone.utc), 1)
+
+    def test_bulk_import_no_double_booking(self, pg_session, pg_calendar):
+        """Test that a bulk import overlapping itself in such a calendar is rejected whole."""
+        user_id, calendar_id = pg_calendar
+        db = pg_session()
+        crud.calendar.update(db, db_obj=db.get(models.Calendar, calendar_id), obj_in={"no_double_booking": True})
+        start = datetime(2025, 5, 1, 9, tzinfo=timezone.utc)
+        rows = [
+            {"title": "First", "start_time": start, "end_time": start + timedelta(hours=1)},
+            {"title": "Second", "start_time": start + timedelta(minutes=30), "end_time": start + timedelta(hours=2)},
+        ]
+
+        with pytest.raises(HTTPException) as error:
+            crud.event.bulk_create_for_calendar(db, rows=rows, calendar_id=calendar_id, creator_id=user_id)
+        assert error.value.status_code == 409
+        assert crud.event.get_multi_by_calendar(db, calendar_id=calendar_id) == []
+
+    def test_archived_events_stay_readable(self, pg_session, pg_calendar, monkeypatch):
+        """Test that archived events are moved and read back through CRUDEvent."""
+        monkeypatch.setattr(settings, "EVENT_ARCHIVE_AFTER_DAYS", 30)
+        user_id, calendar_id = pg_calendar
+        db = pg_session()
+        old_start = datetime.now(timezone.utc) - timedelta(days=90)
+        old_id = self._create(db, calendar_id, user_id, old_start, 1, title="Old").id
+        recent_id = self._create(db, calendar_id, user_id, datetime.now(timezone.utc), 1, title="Recent").id
+
+        assert crud.event.archive_before(db, before=crud.event.archive_horizon()) == 1
+        events = crud.event.get_multi_by_calendar(db, calendar_id=calendar_id, include_archived=True)
+        assert [event.id for event in events] == [old_id, recent_id]
+        conflicts = crud.event.get_conflicts(
+            db, calendar_ids=[calendar_id], start_time=old_start, end_time=old_start + timedelta(minutes=30)
+        )
+        assert [event.id for event in conflicts] == [old_id]
+
+
+class TestChangeLogOnPostgreSQL:
+    """Test change log positions on PostgreSQL."""
+
+    def test_writers_do_not_wait_and_late_commits_are_not_skipped(self, pg_session, pg_calendar):
+        """Test that a sync leaves out commits newer than a running writer until it ends."""
+        user_id, calendar_id = pg_calendar
+        slow, fast, reader = pg_session(), pg_session(), pg_session()
+        cursor = sync.current_position(reader)
+
+        slow.add(models.List(name="Slow", list_type=models.ListType.TODO, calendar_id=calendar_id))
+        slow.flush()
+        # Would block on a global writer lock
+        fast.add(models.List(name="Fast", list_type=models.ListType.TODO, calendar_id=calendar_id))
+        fast.commit()
+
+        page = sync.changes_since(reader, since=cursor, user_id=user_id, calendar_ids=[calendar_id], limit=100)
+        assert page["changed"]["lists"] == []
+        slow.commit()
+        page = sync.changes_since(reader, since=page["cursor"][0], user_id=user_id, calendar_ids=[calendar_id], limit=100)
+        assert sorted(item["name"] for item in page["changed"]["lists"]) == ["Fast", "Slow"]
+
+    def test_pages_share_their_upper_bound(self, pg_session, pg_calendar):
+        """Test that paging a sync returns every change once even when ids and positions disagree."""
+        user_id, calendar_id = pg_calendar
+        first, second, reader = pg_session(), pg_session(), pg_session()
+        cursor = sync.current_position(reader)
+        # `first` takes the lower transaction id and the higher entry ids
+        first.execute(text("SELECT txid_current()"))
+        second.add_all([models.List(name=f"Second {index}", list_type=models.ListType.TODO, calendar_id=calendar_id) for index in range(2)])
+        second.flush()
+        first.add_all([models.List(name=f"First {index}", list_type=models.ListType.TODO, calendar_id=calendar_id) for index in range(2)])
+        first.commit()
+        second.commit()
+
+        seen, since, upper, after = [], cursor, None, 0
+        while True:
+            page = sync.changes_since(
+                reader, since=since, upper=upper, after=after, user_id=user_id, calendar_ids=[calendar_id], limit=1,
+            )
+            seen.extend(item["name"] for item in page["changed"]["lists"])
+            since, upper, after = page["cursor"]
+            upper = upper or None
+            if not page["has_more"]:
+                break
+        assert sorted(seen) == ["First 0", "First 1", "Second 0", "Second 1"]
@@ -0,0 +1,95 @@
+import os
+import pstats
+import time
+
+from fastapi.testclient import TestClient
+
+from app import crud, models
+from app.core.profiling import ProfilingMiddleware, prune
+from app.main import app
+
+WITH_VOTES = "/api/v1/list-items/list/{list_id}/with-votes"
+EVENTS = "/api/v1/events/calendar/{calendar_id}"
+
+
+def _profiled_client(auth_headers: dict, directory, **options) -> TestClient:
+    options = {"token": "secret", "sample_rate": 0.0, "route_templates": [], "max_files": 10, **options}
+    client = TestClient(ProfilingMiddleware(app, routes=app.routes, directory=str(directory), interval=0.001, **options))
+    client.headers.update(auth_headers)
+    return client
+
+
+def _slow_votes(monkeypatch):
+    """Make the with-votes query slow enough to be sampled many times."""
+    query = crud.list_item.get_multi_with_vote_counts
+
+    def slow_vote_query(*args, **kwargs):
+        time.sleep(0.05)
+        return query(*args, **kwargs)
+
+    monkeypatch.setattr(crud.list_item, "get_multi_with_vote_counts", slow_vote_query)
+
+
+class TestProfiling:
+    """Test on-demand request profiling."""
+
+    def test_disabled_by_default(self):
+        """Test that the middleware is not installed unless PROFILING_ENABLED."""
+        assert ProfilingMiddleware not in [middleware.cls for middleware in app.user_middleware]
+
+    def test_debug_header_profiles_worker_threads(self, auth_headers, test_list: models.List, tmp_path, monkeypatch):
+        """Test that an authorized request gets a folded-stack profile named after its route."""
+        _slow_votes(monkeypatch)
+        client = _profiled_client(auth_headers, tmp_path)
+        response = client.get(f"/api/v1/list-items/list/{test_list.id}/with-votes", headers={"X-Profile-Token": "secret"})
+        assert response.status_code == 200
+
+        name = response.headers["x-profile"]
+        assert name.endswith("-GET-api_v1_list_items_list_list_id_with_votes-200.folded")
+        assert os.listdir(tmp_path) == [name]
+        header, *stacks = (tmp_path / name).read_text().splitlines()
+        assert header.startswith(f"# GET /api/v1/list-items/list/{test_list.id}/with-votes")
+        # The sync endpoint ran in a worker thread, which was sampled
+        slow = [line for line in stacks if "read_list_items_with_votes" in line and "slow_vote_query" in line]
+        assert sum(int(line.rsplit(" ", 1)[1]) for line in slow) >= 5
+
+    def test_unauthorized_requests_are_not_profiled(self, auth_headers, test_list: models.List, tmp_path):
+        """Test that a missing or wrong token profiles nothing, and no token configured disables the header."""
+        url = f"/api/v1/list-items/list/{test_list.id}/with-votes"
+        client = _profiled_client(auth_headers, tmp_path)
+        for headers in ({}, {"X-Profile-Token": "wrong"}):
+            response = client.get(url, headers=headers)
+            assert response.status_code == 200 and "x-profile" not in response.headers
+        response = _profiled_client(auth_headers, tmp_path, token="").get(url, headers={"X-Profile-Token": ""})
+        assert "x-profile" not in response.headers
+        assert os.listdir(tmp_path) == []
+
+    def test_sampling_rule(self, auth_headers, test_list: models.List, test_calendar: models.Calendar, tmp_path):
+        """Test that sampled requests are profiled only on the configured route templates, without a header."""
+        client = _profiled_client(auth_headers, tmp_path, sample_rate=1.0, route_templates=[EVENTS])
+        client.get(f"/api/v1/list-items/list/{test_list.id}/with-votes")
+        response = client.get(f"/api/v1/events/calendar/{test_calendar.id}")
+        assert "x-profile" not in response.headers
+        (name,) = os.listdir(tmp_path)
+        assert "-GET-api_v1_events_calendar_calendar_id-200." in name
+
+    def test_cprofile_mode(self, auth_headers, test_list: models.List, tmp_path):
+        """Test that the deterministic mode writes loadable pstats."""
+        client = _profiled_client(auth_headers, tmp_path, mode="cprofile")
+        response = client.get("/no-such-path", headers={"X-Profile-Token": "secret"})
+        name = response.headers["x-profile"]
+        assert name.endswith("-GET-unmatched-404.pstats")
+        stats = pstats.Stats(str(tmp_path / name))
+        assert stats.total_calls > 0
+
+    def test_directory_is_bounded(self, auth_headers, test_calendar: models.Calendar, tmp_path):
+        """Test that only the newest profiles are kept."""
+        (tmp_path / "notes.txt").write_text("kept")
+        client = _profiled_client(auth_headers, tmp_path, max_files=2)
+        names = [
+            client.get(f"/api/v1/events/calendar/{test_calendar.id}", headers={"X-Profile-Token": "secret"}).headers["x-profile"]
+            for _ in range(3)
+        ]
+        assert sorted(os.listdir(tmp_path)) == sorted([*names[1:], "notes.txt"])
+        prune(str(tmp_path), 0)
+        assert os.listdir(tmp_path) == ["notes.txt"]
@@ -0,0 +1,139 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.core import reminders
+from app.core.reminders import QueueSink, ReminderScheduler
+from app.schemas.event import EventCreate, EventUpdate
+from tests.conftest import TestingSessionLocal
+
+
+class FakeClock:
+    def __init__(self, now: datetime):
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock(datetime(2025, 6, 2, 8, tzinfo=timezone.utc))
+
+
+@pytest.fixture
+def scheduler(clock: FakeClock):
+    """A scheduler registered as the process-wide one, driven by hand."""
+    scheduler = ReminderScheduler(
+        sink=QueueSink(),
+        session_factory=TestingSessionLocal,
+        lead=timedelta(minutes=10),
+        horizon=timedelta(hours=2),
+        clock=clock,
+    )
+    reminders._scheduler = scheduler
+    yield scheduler
+    reminders._scheduler = None
+
+
+def _delivered(scheduler: ReminderScheduler):
+    sink = scheduler.sink
+    items = []
+    while not sink.queue.empty():
+        items.append(sink.queue.get_nowait())
+    return items
+
+
+class TestReminderScheduler:
+    """Test the reminder heap, its incremental updates and delivery."""
+
+    def _create(self, db_session: Session, calendar: models.Calendar, user: models.User, title: str, start_time: datetime, **kwargs):
+        return crud.event.create_with_user(
+            db_session,
+            obj_in=EventCreate(title=title, start_time=start_time, calendar_id=calendar.id, **kwargs),
+            creator_id=user.id
+        )
+
+    def test_loads_horizon_and_fires_due_reminders(self, db_session: Session, test_calendar: models.Calendar, test_user: models.User, scheduler: ReminderScheduler, clock: FakeClock):
+        """Test that only events inside the horizon are loaded and reminders fire at start minus lead."""
+        self._create(db_session, test_calendar, test_user, "Soon", clock.now + timedelta(minutes=30))
+        self._create(db_session, test_calendar, test_user, "Daily", clock.now + timedelta(hours=1), recurrence_rule="FREQ=DAILY;COUNT=3")
+        self._create(db_session, test_calendar, test_user, "Later", clock.now + timedelta(hours=5))
+
+        assert scheduler.run_pending() == 0
+        assert len(scheduler) == 2  # "Soon" and the first "Daily" occurrence
+
+        clock.now += timedelta(minutes=20)
+        assert scheduler.run_pending() == 1
+        assert [reminder.title for reminder in _delivered(scheduler)] == ["Soon"]
+
+        clock.now += timedelta(hours=1)
+        scheduler.run_pending()
+        assert [reminder.title for reminder in _delivered(scheduler)] == ["Daily"]
+        assert len(scheduler) == 0
+
+        # Running short of loaded time loads the next slice, picking up "Later"
+        clock.now = datetime(2025, 6, 2, 11, tzinfo=timezone.utc)
+        scheduler.run_pending()
+        assert len(scheduler) == 1
+
+        clock.now = datetime(2025, 6, 2, 12, 50, tzinfo=timezone.utc)
+        scheduler.run_pending()
+        assert [reminder.title for reminder in _delivered(scheduler)] == ["Later"]
+
+    def test_incremental_updates(self, db_session: Session, test_calendar: models.Calendar, test_user: models.User, scheduler: ReminderScheduler, clock: FakeClock):
+        """Test that creating, moving and deleting events updates the heap without reloading."""
+        scheduler.run_pending()
+        moved = self._create(db_session, test_calendar, test_user, "Moved", clock.now + timedelta(minutes=30))
+        deleted = self._create(db_session, test_calendar, test_user, "Deleted", clock.now + timedelta(minutes=40))
+        self._create(db_session, test_calendar, test_user, "Imminent", clock.now + timedelta(minutes=5))
+        assert len(scheduler) == 3
+
+        crud.event.update(db_session, db_obj=moved, obj_in=EventUpdate(start_time=clock.now + timedelta(minutes=90)))
+        crud.event.remove(db_session, id=deleted.id)
+        assert len(scheduler) == 2
+
+        clock.now += timedelta(minutes=1)
+        scheduler.run_pending()
+        assert [reminder.title for reminder in _delivered(scheduler)] == ["Imminent"]
+
+        clock.now += timedelta(minutes=80)
+        scheduler.run_pending()
+        reminders_sent = _delivered(scheduler)
+        assert [reminder.title for reminder in reminders_sent] == ["Moved"]
+        assert reminders_sent[0].fire_at == reminders_sent[0].start_time - timedelta(minutes=10)
+
+    def test_reload_picks_up_other_processes(self, db_session: Session, test_calendar: models.Calendar, test_user: models.User, scheduler: ReminderScheduler, clock: FakeClock, monkeypatch):
+        """Test that each slice reloads the window, so writes without the hooks are picked up and nothing fires twice."""
+        scheduler.run_pending()
+        moved = self._create(db_session, test_calendar, test_user, "Moved", clock.now + timedelta(hours=2))
+        deleted = self._create(db_session, test_calendar, test_user, "Deleted", clock.now + timedelta(hours=2, minutes=5))
+
+        # Another worker: the hooks do not reach this scheduler
+        monkeypatch.setattr(reminders, "_scheduler", None)
+        self._create(db_session, test_calendar, test_user, "Elsewhere", clock.now + timedelta(minutes=100))
+        crud.event.update(db_session, db_obj=moved, obj_in=EventUpdate(start_time=clock.now + timedelta(hours=2, minutes=30)))
+        crud.event.remove(db_session, id=deleted.id)
+        assert len(scheduler) == 2
+
+        clock.now += timedelta(minutes=75)
+        scheduler.run_pending()
+        assert len(scheduler) == 2  # "Elsewhere" and "Moved" at its new time
+
+        clock.now += timedelta(minutes=20)
+        scheduler.run_pending()
+        assert [reminder.title for reminder in _delivered(scheduler)] == ["Elsewhere"]
+
+        clock.now += timedelta(minutes=45)
+        scheduler.run_pending()
+        assert [reminder.title for reminder in _delivered(scheduler)] == ["Moved"]
+        # Reloading does not send reminders for events that have not started yet again
+        scheduler.load_until(clock.now + timedelta(hours=3))
+        assert len(scheduler) == 0
+
+    def test_stream_requires_scheduler(self, authenticated_client: TestClient):
+        """Test that the reminder stream is unavailable when this process runs no scheduler."""
+        response = authenticated_client.get("/api/v1/events/reminders/stream")
+        assert response.status_code == 503
@@ -0,0 +1,129 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.core.response_cache import CachedResponse, LRUBackend, response_cache
+from app.core.security import create_access_token
+from app.schemas.calendar import CalendarCreate
+from app.schemas.user import UserCreate
+from app.schemas.vote import VoteCreate
+from tests.conftest import engine
+
+
+def _response(body: bytes) -> CachedResponse:
+    return CachedResponse(body, "application/json", {})
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestLRUBackend:
+    """Test the in-process response cache backend."""
+
+    def test_evicts_least_recently_used_past_bounds(self):
+        """Test that entries past the count or byte bound are evicted, oldest use first."""
+        backend = LRUBackend(max_entries=2, max_bytes=10)
+        backend.set("a", _response(b"aaa"), (), 60)
+        backend.set("b", _response(b"bbb"), (), 60)
+        assert backend.get("a") is not None
+        backend.set("c", _response(b"ccc"), (), 60)
+        assert backend.get("b") is None
+        assert backend.get("a") is not None and backend.get("c") is not None
+
+        backend.set("d", _response(b"dddddddd"), (), 60)
+        assert backend.stats() == {"entries": 1, "bytes": 8, "evictions": 3}
+        # Larger than the whole cache: never stored
+        backend.set("e", _response(b"e" * 11), (), 60)
+        assert backend.get("e") is None and backend.get("d") is not None
+
+    def test_expiry_and_tags(self):
+        """Test that entries expire after their TTL and are dropped with any of their tags."""
+        clock = _Clock()
+        backend = LRUBackend(max_entries=10, max_bytes=1000, clock=clock)
+        backend.set("a", _response(b"a"), ("calendar:1", "user:1"), 5)
+        backend.set("b", _response(b"b"), ("calendar:1",), 60)
+        backend.set("c", _response(b"c"), ("calendar:2",), 60)
+
+        clock.now = 5
+        assert backend.get("a") is None
+        backend.invalidate(["calendar:1"])
+        assert backend.get("b") is None
+        assert backend.get("c") is not None
+        assert backend.stats()["entries"] == 1
+
+
+class TestResponseCacheAPI:
+    """Test cached list GETs through the API."""
+
+    @pytest.fixture(autouse=True)
+    def enable_cache(self, monkeypatch):
+        """Turn on the response cache, which is off by default."""
+        monkeypatch.setattr(response_cache, "enabled", True)
+
+    def _count_queries(self, run) -> int:
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            run()
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        return len(statements)
+
+    def test_repeated_gets_hit_until_a_write(self, authenticated_client: TestClient, test_calendar: models.Calendar, test_list: models.List, test_user: models.User, db_session: Session):
+        """Test that repeated GETs are served from the cache and writes drop the entries they affect."""
+        calendar_id, list_id = test_calendar.id, test_list.id
+        urls = ["/api/v1/calendars/", f"/api/v1/events/calendar/{calendar_id}", f"/api/v1/list-items/list/{list_id}/with-votes"]
+        first = [authenticated_client.get(url) for url in urls]
+
+        def read_again():
+            for url, response in zip(urls, first):
+                again = authenticated_client.get(url)
+                assert again.status_code == 200
+                assert again.content == response.content
+                assert again.headers.get("etag") == response.headers.get("etag")
+
+        # Only the user lookup and the access checks' misses, never the rows
+        assert self._count_queries(read_again) <= len(urls)
+        assert response_cache.stats()["hits"] == len(urls)
+
+        # Conditional requests get a 304 straight from the cached ETag
+        etag = first[1].headers["etag"]
+        assert authenticated_client.get(urls[1], headers={"If-None-Match": etag}).status_code == 304
+
+        item_id = authenticated_client.post("/api/v1/list-items/", json={"content": "Milk", "list_id": list_id}).json()["id"]
+        assert [item["id"] for item in authenticated_client.get(urls[2]).json()] == [item_id]
+        # Writes outside the API invalidate too
+        crud.vote.create_with_user(db_session, obj_in=VoteCreate(list_item_id=item_id), user_id=test_user.id)
+        assert authenticated_client.get(urls[2]).json()[0]["vote_count"] == 1
+
+        authenticated_client.post("/api/v1/events/", json={
+            "title": "Dinner", "start_time": "2025-06-01T18:00:00Z", "calendar_id": calendar_id
+        })
+        assert [item["title"] for item in authenticated_client.get(urls[1]).json()] == ["Dinner"]
+
+        authenticated_client.put(f"/api/v1/calendars/{calendar_id}", json={"name": "Renamed"})
+        assert "Renamed" in [calendar["name"] for calendar in authenticated_client.get(urls[0]).json()]
+        assert response_cache.stats()["invalidations"] >= 4
+
+    def test_entries_are_scoped(self, authenticated_client: TestClient, test_calendar: models.Calendar, db_session: Session):
+        """Test that a cached response is never served past the access check or to another user."""
+        other = crud.user.create(db_session, obj_in=UserCreate(email="other@example.com", password="password"))
+        crud.calendar.create_with_owner(db_session, obj_in=CalendarCreate(name="Theirs"), owner_id=other.id)
+        other_headers = {"Authorization": f"Bearer {create_access_token(subject=other.email)}"}
+
+        mine = authenticated_client.get("/api/v1/calendars/").json()
+        theirs = authenticated_client.get("/api/v1/calendars/", headers=other_headers).json()
+        assert "Theirs" in [calendar["name"] for calendar in theirs]
+        assert {calendar["id"] for calendar in mine}.isdisjoint(calendar["id"] for calendar in theirs)
+
+        url = f"/api/v1/events/calendar/{test_calendar.id}"
+        assert authenticated_client.get(url).status_code == 200
+        assert authenticated_client.get(url, headers=other_headers).status_code == 403
@@ -0,0 +1,89 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.core import recurrence
+from app.core.serialization import ORJSONResponse, fields_schema, get_serializer, parse_fields, schema_columns
+from app.schemas import event as event_schemas
+from app.schemas import list as list_schemas
+from app.schemas import list_item as list_item_schemas
+from app.schemas import vote as vote_schemas
+from app.schemas.event import EventCreate
+from app.schemas.list import ListCreate
+from app.schemas.list_item import ListItemCreate
+from app.schemas.vote import VoteCreate
+
+
+def _pydantic_json(schema, objects) -> list:
+    adapter = TypeAdapter(list[schema])
+    return json.loads(adapter.dump_json(adapter.validate_python(objects, from_attributes=True)))
+
+
+def _fast_json(schema, objects) -> list:
+    return json.loads(ORJSONResponse(get_serializer(schema).many(objects)).body)
+
+
+class TestRowSerializer:
+    """Test that the fast serialization path matches Pydantic's output."""
+
+    def test_matches_pydantic_for_objects_and_rows(self, db_session: Session, test_calendar: models.Calendar, test_list: models.List, test_user: models.User):
+        """Test events (with occurrences and exceptions), items, votes and lists from ORM objects and row tuples."""
+        start = datetime(2025, 6, 2, 9, 30, 15, 120000, tzinfo=timezone.utc)
+        crud.event.create_with_user(
+            db_session,
+            obj_in=EventCreate(title="Single", description="Notes", start_time=start, end_time=start + timedelta(hours=1), calendar_id=test_calendar.id),
+            creator_id=test_user.id
+        )
+        series = crud.event.create_with_user(
+            db_session,
+            obj_in=EventCreate(
+                title="Daily", start_time=start, calendar_id=test_calendar.id,
+                recurrence_rule="FREQ=DAILY;COUNT=3", recurrence_exceptions=[start + timedelta(days=1)]
+            ),
+            creator_id=test_user.id
+        )
+        item = crud.list_item.create_with_user(
+            db_session, obj_in=ListItemCreate(content="Item", list_id=test_list.id), creator_id=test_user.id
+        )
+        crud.vote.create_with_user(db_session, obj_in=VoteCreate(list_item_id=item.id), user_id=test_user.id)
+        # Non-default value in a column whose name differs from its attribute (list_type_enum)
+        crud.list_crud.create(
+            db_session, obj_in=ListCreate(name="Ranked", list_type=models.ListType.PRIORITY, calendar_id=test_calendar.id)
+        )
+
+        events = db_session.query(models.Event).all()
+        occurrences = list(recurrence.expand(series, start=start, end=start + timedelta(days=5)))
+        assert _fast_json(event_schemas.Event, events + occurrences) == _pydantic_json(event_schemas.Event, events + occurrences)
+
+        for schema, model in (
+            (event_schemas.Event, models.Event),
+            (list_item_schemas.ListItem, models.ListItem),
+            (vote_schemas.Vote, models.Vote),
+            (list_schemas.List, models.List),
+        ):
+            objects = db_session.query(model).all()
+            rows = db_session.execute(select(*schema_columns(schema, model))).all()
+            expected = _pydantic_json(schema, objects)
+            assert _fast_json(schema, objects) == expected
+            assert _fast_json(schema, rows) == expected
+
+    def test_fields_schema_matches_pydantic(self, db_session: Session, test_list: models.List, test_user: models.User):
+        """Test that a trimmed schema serializes rows like Pydantic and keeps schema order."""
+        crud.list_item.create_with_user(db_session, obj_in=ListItemCreate(content="Item", list_id=test_list.id), creator_id=test_user.id)
+        schema = list_item_schemas.ListItem
+
+        fields = parse_fields(schema, "created_at,id")
+        assert fields == ("id", "created_at")
+        assert parse_fields(schema, None) is None
+        assert fields_schema(schema, None) is schema
+        trimmed = fields_schema(schema, fields)
+        assert fields_schema(schema, fields) is trimmed
+        assert list(trimmed.model_fields) == ["id", "created_at"]
+
+        rows = db_session.execute(select(*schema_columns(trimmed, models.ListItem))).all()
+        assert len(rows[0]) == 2
+        assert _fast_json(trimmed, rows) == _pydantic_json(trimmed, db_session.query(models.ListItem).all())
@@ -0,0 +1,129 @@
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app import models
+from app.core.single_flight import SingleFlight, single_flight
+from tests.conftest import engine
+
+
+def _wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def _run_concurrently(count: int, target) -> list:
+    results = [None] * count
+
+    def run(index):
+        try:
+            results[index] = target()
+        except Exception as exc:
+            results[index] = exc
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    return results
+
+
+class TestSingleFlight:
+    """Test coalescing of identical concurrent calls."""
+
+    def test_followers_share_the_leaders_result(self):
+        """Test that calls arriving while one runs wait for it instead of running again."""
+        flight = SingleFlight()
+        release = threading.Event()
+        runs = []
+
+        def fn():
+            runs.append(1)
+            release.wait(5)
+            return object()
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.do("route", "key", fn)))
+        leader.start()
+        _wait_for(lambda: flight.stats()["in_flight"] == 1)
+        followers = [threading.Thread(target=lambda: results.append(flight.do("route", "key", fn))) for _ in range(4)]
+        for follower in followers:
+            follower.start()
+        _wait_for(lambda: flight.stats()["waiting"] == 4)
+        # Other keys and routes are not held up
+        assert flight.do("route", "other", lambda: "other") == "other"
+        assert flight.do("other", "key", lambda: "other") == "other"
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(5)
+
+        assert len(runs) == 1
+        assert len(results) == 5 and all(result is results[0] for result in results)
+        stats = flight.stats()
+        assert stats["route_calls"] == 6 and stats["route_coalesced"] == 4
+        assert stats["in_flight"] == 0 and stats["waiting"] == 0
+
+        # Finished calls are not reused
+        assert flight.do("route", "key", lambda: "again") == "again"
+
+    def test_followers_get_the_leaders_error(self):
+        """Test that an exception of the shared call is raised in every waiting caller."""
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def fn():
+            release.wait(5)
+            raise ValueError("boom")
+
+        def call():
+            return flight.do("route", "key", fn)
+
+        threads_done = []
+        worker = threading.Thread(target=lambda: threads_done.append(_run_concurrently(3, call)))
+        worker.start()
+        _wait_for(lambda: flight.stats().get("route_calls") == 3)
+        release.set()
+        worker.join(10)
+        assert [type(result) for result in threads_done[0]] == [ValueError] * 3
+
+    def test_disabled(self):
+        """Test that a disabled instance runs every call."""
+        flight = SingleFlight(enabled=False)
+        assert flight.do("route", "key", lambda: 1) == 1
+        assert flight.stats() == {"in_flight": 0, "waiting": 0}
+
+
+class TestSingleFlightAPI:
+    """Test coalesced list reads through the API."""
+
+    def test_concurrent_reads_run_one_query(self, authenticated_client: TestClient, test_list: models.List):
+        """Test that identical concurrent with-votes reads share one GROUP BY and get the same payload."""
+        requests = 8
+        grouped = []
+
+        def hold_first_query(conn, cursor, statement, *args):
+            if "GROUP BY" in statement:
+                grouped.append(statement)
+                # Keep the leader's query open until every other request waits on it
+                _wait_for(lambda: single_flight.stats()["waiting"] == requests - 1)
+
+        event.listen(engine, "before_cursor_execute", hold_first_query)
+        try:
+            responses = _run_concurrently(
+                requests, lambda: authenticated_client.get(f"/api/v1/list-items/list/{test_list.id}/with-votes")
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", hold_first_query)
+
+        assert len(grouped) == 1
+        assert all(response.status_code == 200 for response in responses)
+        assert len({(response.content, response.headers["etag"]) for response in responses}) == 1
+        stats = single_flight.stats()
+        assert stats["list_items.with_votes_coalesced"] == requests - 1
+        assert stats["list_items.with_votes_coalesced_rate"] == pytest.approx((requests - 1) / requests)
@@ -0,0 +1,140 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import models
+from app.core import tracing
+from app.core.config import settings
+from app.core.tracing import BatchProcessor, FileExporter, Span, parse_traceparent, tracer
+
+
+@pytest.fixture
+def sample_all(monkeypatch):
+    monkeypatch.setattr(tracer, "sample_rate", 1.0)
+
+
+class TestTracing:
+    """Test request tracing."""
+
+    def test_request_spans(self, authenticated_client: TestClient, test_list: models.List, sample_all, monkeypatch):
+        """Test that a traced request has one root with dependency, CRUD and serialization children."""
+        monkeypatch.setattr(settings, "TRACING_DEBUG_ENDPOINT", True)
+        authenticated_client.get(f"/api/v1/list-items/list/{test_list.id}/with-votes")
+
+        trace = authenticated_client.get("/debug/traces", params={"limit": 1}).json()[0]
+        root, *children = trace["spans"]
+        assert root["name"] == "GET /api/v1/list-items/list/{list_id}/with-votes"
+        assert root["parent_span_id"] is None
+        assert root["attributes"]["http.status_code"] == 200
+        assert {span["trace_id"] for span in children} == {trace["trace_id"]}
+        names = [span["name"] for span in children]
+        for expected in (
+            "deps.get_current_user", "deps.get_current_active_user", "deps.check_list_access",
+            "CRUDUser.get_by_email", "CRUDListItem.get_multi_with_vote_counts", "serialize.rows", "serialize.render",
+        ):
+            assert expected in names
+        # CRUD spans nest under the dependency or endpoint that called them
+        by_id = {span["span_id"]: span for span in trace["spans"]}
+        lookup = next(span for span in children if span["name"] == "CRUDUser.get_by_email")
+        assert by_id[lookup["parent_span_id"]]["name"] == "deps.get_current_user"
+        assert lookup["attributes"]["model"] == "User"
+        assert all(span["duration_ms"] >= 0 for span in trace["spans"])
+
+    def test_sampling(self, authenticated_client: TestClient, test_calendar: models.Calendar, monkeypatch, tmp_path):
+        """Test that unsampled requests record nothing and an incoming sampled traceparent is continued only when tracing is on."""
+        monkeypatch.setattr(tracer, "sample_rate", 0.0)
+        url = f"/api/v1/events/calendar/{test_calendar.id}"
+        authenticated_client.get(url)
+        assert list(tracer.buffer) == []
+
+        trace_id, parent_id = "4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7"
+        # Tracing is off: a client cannot force it on
+        authenticated_client.get(url, headers={"traceparent": f"00-{trace_id}-{parent_id}-01"})
+        assert list(tracer.buffer) == []
+
+        # With an exporter, upstream sampling decisions are followed even at rate 0
+        processor = BatchProcessor(FileExporter(str(tmp_path / "spans.jsonl")), interval=0.01)
+        monkeypatch.setattr(tracer, "processor", processor)
+        authenticated_client.get(url, headers={"traceparent": f"00-{trace_id}-{parent_id}-01"})
+        authenticated_client.get(url, headers={"traceparent": f"00-{trace_id}-{parent_id}-00"})
+        processor.shutdown()
+        spans = list(tracer.buffer)
+        assert spans and {f"{span.trace_id:032x}" for span in spans} == {trace_id}
+        root = spans[-1]
+        assert root.name == "GET /api/v1/events/calendar/{calendar_id}"
+        assert f"{root.parent_id:016x}" == parent_id
+
+    def test_debug_endpoint_is_off_by_default(self, client: TestClient):
+        """Test that the span buffer is not served unless enabled."""
+        assert client.get("/debug/traces").status_code == 404
+
+    def test_parse_traceparent(self):
+        """Test that only well-formed W3C trace contexts are accepted."""
+        assert parse_traceparent("00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01").sampled is True
+        for header in (None, "", "garbage", "00-" + "0" * 32 + "-00f067aa0ba902b7-01", "00-xyz-00f067aa0ba902b7-01"):
+            assert parse_traceparent(header) is None
+
+    def test_buffer_is_bounded(self):
+        """Test that the span buffer keeps only the newest spans."""
+        bounded = tracing.Tracer(sample_rate=1.0, buffer_size=3)
+        for index in range(5):
+            bounded.end(Span(f"span {index}", trace_id=index + 1, parent_id=None))
+        assert [trace["spans"][0]["name"] for trace in bounded.recent_traces(10)] == ["span 4", "span 3", "span 2"]
+        assert len(bounded.recent_traces(2)) == 2
+
+
+class TestExport:
+    """Test exporting spans as OTLP/JSON."""
+
+    def test_file_export(self, tmp_path):
+        """Test that batches are appended to the file as OTLP/JSON export requests."""
+        path = tmp_path / "spans.jsonl"
+        processor = BatchProcessor(FileExporter(str(path), service_name="test"), interval=0.01)
+        root = Span("GET /x", trace_id=0xABC, parent_id=None, kind=tracing.KIND_SERVER)
+        child = Span("CRUDUser.get", trace_id=0xABC, parent_id=root.span_id)
+        child.attributes.update({"model": "User", "rows": 3, "cached": False})
+        child.error = "HTTPException: 404: Not found"
+        for span in (child, root):
+            span.end_ns = span.start_ns + 1000
+            processor.submit(span)
+        processor.shutdown()
+
+        lines = path.read_text().splitlines()
+        spans = [
+            span
+            for line in lines
+            for resource in json.loads(line)["resourceSpans"]
+            for scope in resource["scopeSpans"]
+            for span in scope["spans"]
+        ]
+        resource = json.loads(lines[0])["resourceSpans"][0]["resource"]
+        assert resource["attributes"] == [{"key": "service.name", "value": {"stringValue": "test"}}]
+        exported_child, exported_root = spans
+        assert exported_root["traceId"] == f"{0xABC:032x}" and exported_root["parentSpanId"] == ""
+        assert exported_root["kind"] == tracing.KIND_SERVER and exported_root["status"] == {"code": tracing.STATUS_OK}
+        assert exported_child["parentSpanId"] == exported_root["spanId"]
+        assert int(exported_child["endTimeUnixNano"]) - int(exported_child["startTimeUnixNano"]) == 1000
+        assert exported_child["attributes"] == [
+            {"key": "model", "value": {"stringValue": "User"}},
+            {"key": "rows", "value": {"intValue": "3"}},
+            {"key": "cached", "value": {"boolValue": False}},
+        ]
+        assert exported_child["status"]["code"] == tracing.STATUS_ERROR
+
+    def test_full_queue_drops(self):
+        """Test that spans past the queue bound are dropped and counted instead of blocking."""
+        exported = []
+
+        class Collect(tracing.SpanExporter):
+            def export(self, spans):
+                exported.extend(spans)
+
+        processor = BatchProcessor(Collect(), max_queue=2)
+        # Not started, so nothing drains the queue
+        processor._thread = object()
+        for index in range(4):
+            processor.submit(Span("span", trace_id=1, parent_id=None))
+        assert processor.dropped == 2
+        processor.flush()
+        assert len(exported) == 2